@@ -8,27 +8,21 @@ import warnings
 from dataclasses import asdict, dataclass
 from io import TextIOWrapper
 from pathlib import Path
-from typing import TextIO, TypeVar
+from typing import Final, TextIO, TypeVar
 
 import uvicorn
 from pydantic import TypeAdapter
+from starlette.types import ASGIApp
 
-from voicevox_engine.app.application import generate_app
-from voicevox_engine.cancellable_engine import CancellableEngine
-from voicevox_engine.core.core_initializer import initialize_cores
-from voicevox_engine.engine_manifest import load_manifest
-from voicevox_engine.library.library_manager import LibraryManager
-from voicevox_engine.preset.preset_manager import PresetManager
+from voicevox_engine.app.lazy_application import LazyApplication
 from voicevox_engine.setting.model import CorsPolicyMode
 from voicevox_engine.setting.setting_manager import USER_SETTING_PATH, SettingHandler
-from voicevox_engine.tts_pipeline.song_engine import make_song_engines_from_cores
-from voicevox_engine.tts_pipeline.tts_engine import make_tts_engines_from_cores
-from voicevox_engine.user_dict.user_dict_manager import UserDictionary
 from voicevox_engine.utility.path_utility import (
     engine_manifest_path,
     engine_root,
     get_save_dir,
 )
+from voicevox_engine.utility.startup_profiler import StartupProfiler
 
 
 def decide_boolean_from_env(env_name: str) -> bool:
@@ -145,7 +139,15 @@ class _CLIArgs:
     enable_mock: bool
     enable_cancellable_synthesis: bool
     init_processes: int
+    spare_processes: int
+    max_processes: int | None
+    process_scale_up_waiters: int
+    process_idle_timeout: float | None
+    process_acquire_timeout: float | None
     load_all_models: bool
+    core_instances: int
+    model_memory_budget_mb: int | None
+    model_memory_per_style_mb: int
     cpu_num_threads: int | None
     output_log_utf8: bool
     cors_policy_mode: CorsPolicyMode | None
@@ -153,6 +155,18 @@ class _CLIArgs:
     setting_file: Path
     preset_file: Path | None
     disable_mutable_api: bool
+    wave_cache_size_mb: int | None
+    wave_cache_disk_size_mb: int | None
+    synthesis_workers: int | None
+    synthesis_queue_size: int | None
+    synthesis_timeout: float | None
+    output_file_threshold_mb: int | None
+    resource_cache_size_mb: int
+    lazy_start: bool
+    warmup_styles: str | None
+    startup_profile: bool
+    enable_server_timing: bool
+    slow_request_threshold_ms: float | None
 
 
 _cli_args_adapter = TypeAdapter(_CLIArgs)
@@ -204,7 +218,10 @@ def read_cli_arguments(envs: Envs) -> _CLIArgs:
     parser.add_argument(
         "--enable_cancellable_synthesis",
         action="store_true",
-        help="音声合成を途中でキャンセルできるようになります。",
+        help=(
+            "音声合成を途中でキャンセルできるようになります。"
+            "/frame_synthesis、/synthesis_morphing、/multi_synthesis もキャンセル可能なプロセスで実行します。"
+        ),
     )
     parser.add_argument(
         "--init_processes",
@@ -212,11 +229,82 @@ def read_cli_arguments(envs: Envs) -> _CLIArgs:
         default=2,
         help="cancellable_synthesis機能の初期化時に生成するプロセス数です。",
     )
+    parser.add_argument(
+        "--spare_processes",
+        type=int,
+        default=0,
+        help=(
+            "cancellable_synthesis機能で、キャンセルなどで終了したプロセスを直ちに置き換えるため、"
+            "初期化済みの状態で待機させておく予備のプロセス数です。"
+        ),
+    )
+    parser.add_argument(
+        "--max_processes",
+        type=int,
+        default=None,
+        help=(
+            "cancellable_synthesis機能のプロセス数の上限です。--init_processes より大きい値を指定すると、"
+            "空きプロセスを待つ要求の数に応じてプロセスを追加します。指定しない場合、--init_processes と同じ数になります。"
+        ),
+    )
+    parser.add_argument(
+        "--process_scale_up_waiters",
+        type=int,
+        default=0,
+        help=(
+            "--max_processes 指定時に、空きプロセスを待つ要求の数が、起動中のプロセス数にこの値を加えた数を超えると、"
+            "プロセスを追加します。"
+        ),
+    )
+    parser.add_argument(
+        "--process_idle_timeout",
+        type=float,
+        default=None,
+        help=(
+            "cancellable_synthesis機能で、この秒数を超えて待機したプロセスを --init_processes の数まで終了します。"
+            "指定しない場合、プロセスを終了しません。"
+        ),
+    )
+    parser.add_argument(
+        "--process_acquire_timeout",
+        type=float,
+        default=None,
+        help=(
+            "cancellable_synthesis機能で、空きプロセスを待つ期限（秒）です。"
+            "期限内に空きプロセスを確保できなかった要求には 503 を返します。指定しない場合、期限を設けません。"
+        ),
+    )
     parser.add_argument(
         "--load_all_models",
         action="store_true",
         help="起動時に全ての音声合成モデルを読み込みます。",
     )
+    parser.add_argument(
+        "--core_instances",
+        type=int,
+        default=1,
+        help=(
+            "コアのバージョンごとに読み込むインスタンス数です。推論は最も空いているインスタンスで並列に実行されます。"
+            "2以上の場合、2つ目以降のインスタンスはサブプロセスへ読み込まれ、--cpu_num_threads はインスタンス間で等分されます。"
+        ),
+    )
+
+    parser.add_argument(
+        "--model_memory_budget_mb",
+        type=int,
+        default=None,
+        help=(
+            "コアのバージョンごとに、読み込んだ音声合成モデルがトーク・ソング合わせて占めるメモリの上限（MB）です。"
+            "上限を超える場合、最近使われていないスタイルのモデルをコアの初期化し直しによって解放します。"
+            "指定しない場合、モデルは解放されません。"
+        ),
+    )
+    parser.add_argument(
+        "--model_memory_per_style_mb",
+        type=int,
+        default=200,
+        help="--model_memory_budget_mb 指定時に用いる、スタイル 1 つ分のモデルが占めるメモリの見積もり（MB）です。",
+    )
 
     # 引数へcpu_num_threadsの指定がなければ、環境変数をロールします。
     # 環境変数にもない場合は、Noneのままとします。
@@ -289,6 +377,124 @@ def read_cli_arguments(envs: Envs) -> _CLIArgs:
         ),
     )
 
+    parser.add_argument(
+        "--wave_cache_size_mb",
+        type=int,
+        default=None,
+        help=(
+            "合成済み音声をメモリにキャッシュする容量の上限（MB）です。0の場合はキャッシュしません。"
+            "このオプションは--setting_fileで指定される設定ファイルよりも優先されます。"
+        ),
+    )
+
+    parser.add_argument(
+        "--wave_cache_disk_size_mb",
+        type=int,
+        default=None,
+        help=(
+            "合成済み音声をユーザーディレクトリにキャッシュする容量の上限（MB）です。0の場合はキャッシュしません。"
+            "このオプションは--setting_fileで指定される設定ファイルよりも優先されます。"
+        ),
+    )
+
+    parser.add_argument(
+        "--synthesis_workers",
+        type=int,
+        default=None,
+        help=(
+            "音声合成を同時に実行する最大数です。コアが同時に処理できる数に合わせて指定します。"
+            "指定した場合に限り、音声合成を専用のスケジューラーで実行し、"
+            "--synthesis_queue_size と --synthesis_timeout が有効になります。"
+        ),
+    )
+
+    parser.add_argument(
+        "--synthesis_queue_size",
+        type=int,
+        default=None,
+        help=(
+            "実行待ちの音声合成の最大数です。上限を超えた要求には 503 と Retry-After ヘッダーを即座に返します。"
+            "指定しない場合、実行待ちの数を制限しません。"
+        ),
+    )
+
+    parser.add_argument(
+        "--synthesis_timeout",
+        type=float,
+        default=None,
+        help=(
+            "音声合成の要求を受け付けてから実行を開始するまでの期限（秒）です。"
+            "期限内に実行を開始できなかった要求には 503 を返します。"
+            "要求ごとに X-Request-Timeout ヘッダーで上書きできます。指定しない場合、期限を設けません。"
+        ),
+    )
+
+    parser.add_argument(
+        "--output_file_threshold_mb",
+        type=int,
+        default=None,
+        help=(
+            "音声などの出力がこの大きさ（MB）を超える場合に限り、メモリ上ではなく一時ファイルを経由して返します。"
+            "指定しない場合、出力は常にメモリ上で返します。"
+        ),
+    )
+
+    parser.add_argument(
+        "--resource_cache_size_mb",
+        type=int,
+        default=0,
+        help=(
+            "キャラクターの画像や音声サンプルなどのリソースファイルをメモリにキャッシュする容量の上限（MB）です。"
+            "0の場合はキャッシュせず、要求のたびにファイルから返します。"
+        ),
+    )
+
+    parser.add_argument(
+        "--lazy_start",
+        action="store_true",
+        help=(
+            "コアや辞書の読み込みを待たずに接続の受け付けを始めます。"
+            "読み込みはバックグラウンドで行われ、完了までは /health 以外の要求に 503 を返します。"
+            "起動状況は /health で確認できます。"
+        ),
+    )
+
+    parser.add_argument(
+        "--warmup_styles",
+        type=str,
+        default=None,
+        help=(
+            "起動時にウォームアップするスタイルです。all で全てのスタイル、カンマ区切りのスタイル ID でそれらのスタイルを指定します。"
+            "指定したスタイルのモデルを読み込み、試し合成を行ってから /ready が 200 を返すようになります。"
+            "--model_memory_budget_mb 指定時は、常駐できるスタイル数を超える分のスタイルはウォームアップしません。"
+        ),
+    )
+
+    parser.add_argument(
+        "--startup_profile",
+        action="store_true",
+        help="起動処理の段階ごとの所要時間と、主なモジュールの import にかかった時間を表示します。",
+    )
+
+    parser.add_argument(
+        "--enable_server_timing",
+        action="store_true",
+        help=(
+            "応答に Server-Timing ヘッダーを付け、テキスト解析・音素長推論・音高推論・波形生成・後処理・エンコードなど"
+            "処理段階ごとの所要時間を返します。"
+        ),
+    )
+
+    parser.add_argument(
+        "--slow_request_threshold_ms",
+        type=float,
+        default=None,
+        help=(
+            "処理時間がこの値（ミリ秒）を超えた要求について、処理段階ごとの所要時間と"
+            "入力の規模（モーラ数・フレーム数・サンプリングレート）を出力します。指定しない場合、出力しません。"
+        ),
+    )
+
     args_dict = vars(parser.parse_args())
 
     # NOTE: 複数個の同名引数に基づいてリスト化されるため `CLIArgs` で複数形にリネームされている
@@ -301,45 +507,92 @@ def read_cli_arguments(envs: Envs) -> _CLIArgs:
     return args
 
 
-def main() -> None:
-    """VOICEVOX ENGINE を実行する"""
-    multiprocessing.freeze_support()
-
-    envs = read_environment_variables()
-
-    if envs.output_log_utf8:
-        set_output_log_utf8()
-
-    args = read_cli_arguments(envs)
-
-    if args.output_log_utf8:
-        set_output_log_utf8()
-
-    core_manager = initialize_cores(
-        use_gpu=args.use_gpu,
-        voicelib_dirs=args.voicelib_dirs,
-        voicevox_dir=args.voicevox_dir,
-        runtime_dirs=args.runtime_dirs,
-        cpu_num_threads=args.cpu_num_threads,
-        enable_mock=args.enable_mock,
-        load_all_models=args.load_all_models,
-    )
-    tts_engines = make_tts_engines_from_cores(core_manager)
-    song_engines = make_song_engines_from_cores(core_manager)
-    assert len(tts_engines.versions()) != 0, "音声合成エンジンがありません。"
-    assert len(song_engines.versions()) != 0, "音声合成エンジンがありません。"
+# 起動処理の計測で import のコストを個別に示すモジュール。他のモジュールが依存するものから順に並べる。
+_PROFILED_IMPORTS: Final = [
+    "numpy",
+    "fastapi",
+    "pyopenjtalk",
+    "voicevox_engine.app.application",
+]
+
+
+def generate_engine_app(
+    args: _CLIArgs, envs: Envs, profiler: StartupProfiler
+) -> ASGIApp:
+    """コアや辞書を読み込み、VOICEVOX ENGINE アプリケーションを生成する。各段階の所要時間を記録する。"""
+    # NOTE: --lazy_start 指定時に接続の受け付けを早めるため、読み込みに時間のかかるモジュールはここで import する
+    profiler.import_modules(_PROFILED_IMPORTS)
+    with profiler.phase("import others"):
+        from voicevox_engine.app.application import generate_app
+        from voicevox_engine.cancellable_engine import CancellableEngine
+        from voicevox_engine.core.core_initializer import initialize_cores
+        from voicevox_engine.core.model_residency import ModelResidencyPolicy
+        from voicevox_engine.engine_manifest import load_manifest
+        from voicevox_engine.library.library_manager import LibraryManager
+        from voicevox_engine.preset.preset_manager import PresetManager
+        from voicevox_engine.synthesis_scheduler import SynthesisScheduler
+        from voicevox_engine.tts_pipeline.song_engine import (
+            make_song_engines_from_cores,
+        )
+        from voicevox_engine.tts_pipeline.tts_engine import make_tts_engines_from_cores
+        from voicevox_engine.tts_pipeline.warmup import StyleWarmer, parse_warmup_plan
+        from voicevox_engine.tts_pipeline.wave_cache import WaveCache
+        from voicevox_engine.user_dict.user_dict_manager import UserDictionary
 
-    cancellable_engine: CancellableEngine | None = None
-    if args.enable_cancellable_synthesis:
-        cancellable_engine = CancellableEngine(
-            init_processes=args.init_processes,
+    with profiler.phase("initialize_cores"):
+        core_manager = initialize_cores(
             use_gpu=args.use_gpu,
             voicelib_dirs=args.voicelib_dirs,
             voicevox_dir=args.voicevox_dir,
             runtime_dirs=args.runtime_dirs,
             cpu_num_threads=args.cpu_num_threads,
             enable_mock=args.enable_mock,
+            load_all_models=args.load_all_models,
+            core_instances=args.core_instances,
+        )
+    model_residency_policy: ModelResidencyPolicy | None = None
+    if args.model_memory_budget_mb is not None:
+        model_residency_policy = ModelResidencyPolicy(
+            memory_budget_bytes=args.model_memory_budget_mb * 1024 * 1024,
+            bytes_per_style=args.model_memory_per_style_mb * 1024 * 1024,
+        )
+    with profiler.phase("make_engines"):
+        tts_engines = make_tts_engines_from_cores(core_manager, model_residency_policy)
+        song_engines = make_song_engines_from_cores(
+            core_manager, model_residency_policy
         )
+    assert len(tts_engines.versions()) != 0, "音声合成エンジンがありません。"
+    assert len(song_engines.versions()) != 0, "音声合成エンジンがありません。"
+
+    # 最新版のコアの指定されたスタイルをバックグラウンドでウォームアップする
+    style_warmer: StyleWarmer | None = None
+    if args.warmup_styles is not None:
+        latest_version = tts_engines.latest_version()
+        style_warmer = StyleWarmer(
+            tts_engines.get_tts_engine(latest_version),
+            core_manager.get_core(latest_version).characters,
+            parse_warmup_plan(args.warmup_styles),
+            max_workers=args.core_instances,
+        )
+        style_warmer.start()
+
+    with profiler.phase("cancellable_engine"):
+        cancellable_engine: CancellableEngine | None = None
+        if args.enable_cancellable_synthesis:
+            cancellable_engine = CancellableEngine(
+                init_processes=args.init_processes,
+                spare_processes=args.spare_processes,
+                max_processes=args.max_processes,
+                scale_up_waiters=args.process_scale_up_waiters,
+                idle_timeout_sec=args.process_idle_timeout,
+                acquire_timeout_sec=args.process_acquire_timeout,
+                use_gpu=args.use_gpu,
+                voicelib_dirs=args.voicelib_dirs,
+                voicevox_dir=args.voicevox_dir,
+                runtime_dirs=args.runtime_dirs,
+                cpu_num_threads=args.cpu_num_threads,
+                enable_mock=args.enable_mock,
+            )
 
     setting_loader = SettingHandler(args.setting_file)
     settings = setting_loader.load()
@@ -357,6 +610,35 @@ def main() -> None:
         [args.allow_origins, setting_allow_origins]
     )
 
+    wave_cache_size_mb = select_first_not_none(
+        [args.wave_cache_size_mb, settings.wave_cache_size_mb]
+    )
+    wave_cache_disk_size_mb = select_first_not_none(
+        [args.wave_cache_disk_size_mb, settings.wave_cache_disk_size_mb]
+    )
+    wave_cache: WaveCache | None = None
+    if wave_cache_size_mb > 0 or wave_cache_disk_size_mb > 0:
+        wave_cache = WaveCache(
+            max_bytes=wave_cache_size_mb * 1024 * 1024,
+            disk_dir=get_save_dir() / "wave_cache",
+            max_disk_bytes=wave_cache_disk_size_mb * 1024 * 1024,
+        )
+
+    # NOTE: 指定しない場合は従来どおり Starlette のスレッドプールで実行し、同時実行数を絞らない
+    synthesis_scheduler: SynthesisScheduler | None = None
+    if args.synthesis_workers is not None:
+        synthesis_scheduler = SynthesisScheduler(
+            max_workers=args.synthesis_workers,
+            max_queue_size=args.synthesis_queue_size,
+            default_timeout_sec=args.synthesis_timeout,
+        )
+
+    output_file_threshold_bytes = (
+        None
+        if args.output_file_threshold_mb is None
+        else args.output_file_threshold_mb * 1024 * 1024
+    )
+
     if envs.env_preset_path is not None and len(envs.env_preset_path) != 0:
         env_preset_path = Path(envs.env_preset_path)
     else:
@@ -367,7 +649,8 @@ def main() -> None:
     )
     preset_manager = PresetManager(preset_path)
 
-    user_dict = UserDictionary()
+    with profiler.phase("user_dict"):
+        user_dict = UserDictionary()
 
     engine_manifest = load_manifest(engine_manifest_path())
 
@@ -388,24 +671,65 @@ def main() -> None:
     disable_mutable_api = args.disable_mutable_api or envs.disable_mutable_api
 
     # ASGI に準拠した VOICEVOX ENGINE アプリケーションを生成する
-    app = generate_app(
-        tts_engines,
-        song_engines,
-        core_manager,
-        setting_loader,
-        preset_manager,
-        user_dict,
-        engine_manifest,
-        library_manager,
-        cancellable_engine,
-        character_info_dir,
-        cors_policy_mode,
-        allow_origin,
-        disable_mutable_api=disable_mutable_api,
-    )
+    with profiler.phase("generate_app"):
+        app = generate_app(
+            tts_engines,
+            song_engines,
+            core_manager,
+            setting_loader,
+            preset_manager,
+            user_dict,
+            engine_manifest,
+            library_manager,
+            cancellable_engine,
+            character_info_dir,
+            cors_policy_mode,
+            allow_origin,
+            disable_mutable_api=disable_mutable_api,
+            wave_cache=wave_cache,
+            synthesis_scheduler=synthesis_scheduler,
+            output_file_threshold_bytes=output_file_threshold_bytes,
+            resource_cache_max_bytes=args.resource_cache_size_mb * 1024 * 1024,
+            style_warmer=style_warmer,
+            enable_server_timing=args.enable_server_timing,
+            slow_request_threshold_sec=(
+                None
+                if args.slow_request_threshold_ms is None
+                else args.slow_request_threshold_ms / 1000
+            ),
+        )
+    return app
+
+
+def main() -> None:
+    """VOICEVOX ENGINE を実行する"""
+    multiprocessing.freeze_support()
+
+    envs = read_environment_variables()
+
+    if envs.output_log_utf8:
+        set_output_log_utf8()
+
+    args = read_cli_arguments(envs)
+
+    if args.output_log_utf8:
+        set_output_log_utf8()
+
+    profiler = StartupProfiler()
+
+    def _generate_app() -> ASGIApp:
+        app = generate_engine_app(args, envs, profiler)
+        if args.startup_profile:
+            print(profiler.report(), flush=True)
+        return app
+
+    app = LazyApplication(_generate_app, lambda: profiler.current_phase)
+    if not args.lazy_start:
+        app.build()
 
     # VOICEVOX ENGINE サーバーを起動
     # NOTE: デフォルトは ASGI に準拠した HTTP/1.1 サーバー
+    # NOTE: --lazy_start 指定時は、エンジンの生成を待たずに接続の受け付けを始める
     uvicorn.run(app, host=args.host, port=args.port)
 
 
@@ -0,0 +1,32 @@
+"""フルコンテキストラベルの解析にかかる時間の測定"""
+
+from test.benchmark.speed.utility import benchmark_time
+from voicevox_engine.tts_pipeline.njd_feature_processor import (
+    text_to_full_context_labels,
+)
+from voicevox_engine.tts_pipeline.text_analyzer import (
+    full_context_labels_to_accent_phrases,
+)
+
+_TEXT = "吾輩は猫である。名前はまだ無い。どこで生れたかとんと見当がつかぬ。" * 10
+
+
+def benchmark_full_context_labels_to_accent_phrases() -> float:
+    """フルコンテキストラベル系列からアクセント句系列を生成する時間を測定する。"""
+    full_context_labels = text_to_full_context_labels(
+        _TEXT, enable_katakana_english=False
+    )
+
+    def execute() -> None:
+        """計測対象となる処理を実行する"""
+        full_context_labels_to_accent_phrases(full_context_labels)
+
+    average_time = benchmark_time(execute, n_repeat=100, sec_sleep=0.0)
+    return average_time
+
+
+if __name__ == "__main__":
+    # 実行コマンドは `python -m test.benchmark.speed.text_analyzer` である。
+
+    result = benchmark_full_context_labels_to_accent_phrases()
+    print(f"`full_context_labels_to_accent_phrases()`: {result:.4f} sec")
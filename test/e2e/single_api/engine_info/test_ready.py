@@ -0,0 +1,38 @@
+"""/ready API のテスト。"""
+
+from typing import Any
+
+from fastapi.testclient import TestClient
+
+from voicevox_engine.app.application import generate_app
+from voicevox_engine.metas.metas import StyleId
+from voicevox_engine.tts_pipeline.warmup import StyleWarmer
+from voicevox_engine.utility.core_version_utility import MOCK_CORE_VERSION
+
+
+def test_get_ready_200(client: TestClient) -> None:
+    response = client.get("/ready")
+    assert response.status_code == 200
+    assert response.json()["done"] is True
+
+
+def test_get_ready_with_warmup(app_params: dict[str, Any]) -> None:
+    engine = app_params["tts_engines"].get_tts_engine(MOCK_CORE_VERSION)
+    characters = app_params["core_manager"].get_core(MOCK_CORE_VERSION).characters
+    warmer = StyleWarmer(engine, characters, [StyleId(0), StyleId(1)])
+    client = TestClient(generate_app(**app_params, style_warmer=warmer))
+
+    # ウォームアップ前は準備中
+    response = client.get("/ready")
+    assert response.status_code == 503
+    assert response.json()["total"] == 2
+
+    warmer.run()
+    response = client.get("/ready")
+    assert response.status_code == 200
+    assert response.json() == {
+        "total": 2,
+        "completed": 2,
+        "failed_style_ids": [],
+        "done": True,
+    }
@@ -0,0 +1,54 @@
+"""/metrics API のテスト。"""
+
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+
+from voicevox_engine.app.application import generate_app
+
+
+def test_get_metrics_200(client: TestClient) -> None:
+    client.post("/audio_query", params={"text": "テストです", "speaker": 0})
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    # 処理段階の所要時間は要求のルート・スタイル・コアのバージョンで区別される
+    assert (
+        'voicevox_stage_duration_seconds_count{stage="safe_yukarin_s_forward",'
+        'route="/audio_query",style_id="0",core_version="0.0.0"}'
+    ) in body
+    assert 'voicevox_stage_duration_seconds_count{stage="core_lock_wait"' in body
+    assert (
+        'voicevox_http_request_duration_seconds_count{route="/audio_query",'
+        'method="POST",status="200"} 1'
+    ) in body
+    # /metrics 自身の要求が処理中として数えられる
+    assert "voicevox_http_requests_in_flight 1" in body
+    assert 'voicevox_core_calls{core_version="0.0.0",instance="0"} 0' in body
+
+
+def test_server_timing_and_slow_request_log(
+    app_params: dict[str, Any], capsys: pytest.CaptureFixture[str]
+) -> None:
+    app = generate_app(
+        **app_params, enable_server_timing=True, slow_request_threshold_sec=0
+    )
+    client = TestClient(app)
+    query = client.post(
+        "/audio_query", params={"text": "テストです", "speaker": 0}
+    ).json()
+    response = client.post("/synthesis", params={"speaker": 0}, json=query)
+    assert response.status_code == 200
+    # モックのエンジンは波形生成にコアを用いないため、エンコードの所要時間のみを含む
+    entries = [
+        entry.split(";")[0] for entry in response.headers["Server-Timing"].split(", ")
+    ]
+    assert entries == ["encode", "total"]
+    response = client.post("/audio_query", params={"text": "テスト", "speaker": 0})
+    server_timing = response.headers["Server-Timing"]
+    assert "length;dur=" in server_timing
+    assert "pitch;dur=" in server_timing
+    # 閾値を超えた要求は処理段階ごとの所要時間とともに出力される
+    assert "POST /synthesis 200" in capsys.readouterr().out
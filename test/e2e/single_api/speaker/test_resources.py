@@ -0,0 +1,66 @@
+"""/_resources API のテスト。"""
+
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+
+from voicevox_engine.app.application import generate_app
+
+# テスト用キャラクターの立ち絵のハッシュ値
+_RESOURCE_HASH = "934d5c0f33e027f676543ab7e2b50be9c1abe7e5120b7d0a3b34bdd44efd82ae"
+_RESOURCE_URL = f"/_resources/{_RESOURCE_HASH}"
+
+
+@pytest.fixture(params=[0, 64 * 1024 * 1024], ids=["file", "memory"])
+def resource_client(
+    request: pytest.FixtureRequest, app_params: dict[str, Any]
+) -> TestClient:
+    """リソースのメモリキャッシュの有無を切り替えたクライアントを生成する。"""
+    return TestClient(
+        generate_app(**app_params, resource_cache_max_bytes=request.param)
+    )
+
+
+def test_get_resource_200(resource_client: TestClient) -> None:
+    response = resource_client.get(_RESOURCE_URL)
+    assert response.status_code == 200
+    assert response.headers["ETag"] == f'"{_RESOURCE_HASH}"'
+    assert "immutable" in response.headers["Cache-Control"]
+    assert response.headers["Accept-Ranges"] == "bytes"
+    assert response.headers["Content-Type"] == "image/png"
+
+
+def test_get_resource_304(resource_client: TestClient) -> None:
+    response = resource_client.get(
+        _RESOURCE_URL, headers={"If-None-Match": f'"{_RESOURCE_HASH}"'}
+    )
+    assert response.status_code == 304
+    assert response.content == b""
+
+
+def test_get_resource_range_206(resource_client: TestClient) -> None:
+    content = resource_client.get(_RESOURCE_URL).content
+
+    response = resource_client.get(_RESOURCE_URL, headers={"Range": "bytes=8-15"})
+    assert response.status_code == 206
+    assert response.headers["Content-Range"] == f"bytes 8-15/{len(content)}"
+    assert response.content == content[8:16]
+
+    response = resource_client.get(_RESOURCE_URL, headers={"Range": "bytes=-4"})
+    assert response.status_code == 206
+    assert response.content == content[-4:]
+
+
+def test_get_resource_range_with_stale_if_range_200(
+    resource_client: TestClient,
+) -> None:
+    response = resource_client.get(
+        _RESOURCE_URL, headers={"Range": "bytes=0-3", "If-Range": '"stale"'}
+    )
+    assert response.status_code == 200
+
+
+def test_get_resource_404(resource_client: TestClient) -> None:
+    response = resource_client.get("/_resources/not_exist")
+    assert response.status_code == 404
@@ -30,6 +30,17 @@ def test_get_speaker_info_with_url_200(
     assert snapshot_json == hash_long_string(response.json())
 
 
+def test_get_speaker_info_304(client: TestClient) -> None:
+    params = {"speaker_uuid": "388f246b-8c41-4ac1-8e2d-5d79f3ff56d9"}
+    response = client.get("/speaker_info", params=params)
+    etag = response.headers["ETag"]
+    response = client.get(
+        "/speaker_info", params=params, headers={"If-None-Match": f"W/{etag}"}
+    )
+    assert response.status_code == 304
+    assert response.content == b""
+
+
 def test_get_speaker_info_404(
     client: TestClient, snapshot_json: SnapshotAssertion
 ) -> None:
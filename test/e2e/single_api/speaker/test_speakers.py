@@ -8,3 +8,12 @@ def test_get_speakers_200(client: TestClient, snapshot_json: SnapshotAssertion)
     response = client.get("/speakers", params={})
     assert response.status_code == 200
     assert snapshot_json == response.json()
+
+
+def test_get_speakers_304(client: TestClient) -> None:
+    response = client.get("/speakers", params={})
+    etag = response.headers["ETag"]
+    response = client.get("/speakers", params={}, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
@@ -2,18 +2,18 @@
 
 import io
 import zipfile
+from typing import Any
 
 from fastapi.testclient import TestClient
 from syrupy.assertion import SnapshotAssertion
 
 from test.e2e.single_api.utils import gen_mora
 from test.utility import hash_wave_floats_from_wav_bytes
+from voicevox_engine.app.application import generate_app
 
 
-def test_post_multi_synthesis_200(
-    client: TestClient, snapshot: SnapshotAssertion
-) -> None:
-    queries = [
+def _gen_queries() -> list[dict[str, Any]]:
+    return [
         {
             "accent_phrases": [
                 {
@@ -66,6 +66,12 @@ def test_post_multi_synthesis_200(
             "kana": "テ'_ストト",
         },
     ]
+
+
+def test_post_multi_synthesis_200(
+    client: TestClient, snapshot: SnapshotAssertion
+) -> None:
+    queries = _gen_queries()
     response = client.post("/multi_synthesis", params={"speaker": 0}, json=queries)
     assert response.status_code == 200
     assert response.headers["content-type"] == "application/zip"
@@ -76,3 +82,25 @@ def test_post_multi_synthesis_200(
         wav_files = (zip_file.read(name) for name in zip_file.namelist())
         for wav in wav_files:
             assert snapshot == hash_wave_floats_from_wav_bytes(wav)
+
+
+def test_post_multi_synthesis_via_file(
+    client: TestClient, app_params: dict[str, Any]
+) -> None:
+    """閾値を超える出力は一時ファイルを経由して返され、内容はメモリ上で返す場合と一致する"""
+    file_client = TestClient(generate_app(**app_params, output_file_threshold_bytes=0))
+    queries = _gen_queries()
+
+    response = client.post("/multi_synthesis", params={"speaker": 0}, json=queries)
+    file_response = file_client.post(
+        "/multi_synthesis", params={"speaker": 0}, json=queries
+    )
+    assert file_response.status_code == 200
+    assert file_response.headers["content-type"] == "application/zip"
+
+    # ZIP 内のファイルの更新日時は要求ごとに異なるため、格納されたファイルを比較する
+    def read_files(content: bytes) -> dict[str, bytes]:
+        with zipfile.ZipFile(io.BytesIO(content), "r") as zip_file:
+            return {name: zip_file.read(name) for name in zip_file.namelist()}
+
+    assert read_files(file_response.content) == read_files(response.content)
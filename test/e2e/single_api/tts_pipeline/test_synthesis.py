@@ -1,10 +1,15 @@
 """/synthesis API のテスト。"""
 
+from typing import Any
+
 from fastapi.testclient import TestClient
 from syrupy.assertion import SnapshotAssertion
 
 from test.e2e.single_api.utils import gen_mora
 from test.utility import hash_wave_floats_from_wav_bytes
+from voicevox_engine.app.application import generate_app
+from voicevox_engine.synthesis_scheduler import SynthesisScheduler
+from voicevox_engine.tts_pipeline.wave_cache import WaveCache
 
 
 def test_post_synthesis_200(client: TestClient, snapshot: SnapshotAssertion) -> None:
@@ -73,3 +78,127 @@ def test_post_synthesis_old_audio_query_200(
     # 音声波形が一致する
     assert response.headers["content-type"] == "audio/wav"
     assert snapshot == hash_wave_floats_from_wav_bytes(response.read())
+
+
+def test_post_synthesis_with_wave_cache_200(
+    app_params: dict[str, Any], snapshot: SnapshotAssertion
+) -> None:
+    """音声キャッシュの有無によらず同じ音声が返り、同一クエリの 2 回目はキャッシュから返る"""
+    wave_cache = WaveCache(max_bytes=1024 * 1024)
+    client = TestClient(generate_app(**app_params, wave_cache=wave_cache))
+    query = {
+        "accent_phrases": [
+            {
+                "moras": [
+                    gen_mora("テ", "t", 2.3, "e", 0.8, 3.3),
+                    gen_mora("ス", "s", 2.1, "U", 0.3, 0.0),
+                    gen_mora("ト", "t", 2.3, "o", 1.8, 4.1),
+                ],
+                "accent": 1,
+                "pause_mora": None,
+                "is_interrogative": False,
+            }
+        ],
+        "speedScale": 1.0,
+        "pitchScale": 1.0,
+        "intonationScale": 1.0,
+        "volumeScale": 1.0,
+        "prePhonemeLength": 0.1,
+        "postPhonemeLength": 0.1,
+        "pauseLength": None,
+        "pauseLengthScale": 1.0,
+        "outputSamplingRate": 24000,
+        "outputStereo": False,
+        "kana": "テ'_スト",
+    }
+    responses = [
+        client.post("/synthesis", params={"speaker": 0}, json=query) for _ in range(2)
+    ]
+
+    for response in responses:
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "audio/wav"
+        assert snapshot == hash_wave_floats_from_wav_bytes(response.read())
+    stats = client.get("/wave_cache_stats").json()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+
+class _UnusedCancellableEngine:
+    """利用されると失敗するキャンセル可能な音声合成エンジン"""
+
+    def __getattr__(self, name: str) -> Any:
+        raise AssertionError(
+            f"キャンセル可能な音声合成エンジンが利用されました: {name}"
+        )
+
+
+def test_post_synthesis_with_wave_cache_does_not_use_cancellable_engine(
+    app_params: dict[str, Any],
+) -> None:
+    """音声キャッシュに無い音声も、キャンセル可能な音声合成エンジンを介さずに合成される"""
+    app_params["cancellable_engine"] = _UnusedCancellableEngine()
+    wave_cache = WaveCache(max_bytes=1024 * 1024)
+    client = TestClient(generate_app(**app_params, wave_cache=wave_cache))
+    query = client.post("/audio_query", params={"text": "テスト", "speaker": 0}).json()
+    response = client.post("/synthesis", params={"speaker": 0}, json=query)
+
+    assert response.status_code == 200
+    stats = client.get("/wave_cache_stats").json()
+    assert (stats["hits"], stats["misses"]) == (0, 1)
+
+
+def test_post_synthesis_with_scheduler(
+    app_params: dict[str, Any], snapshot: SnapshotAssertion
+) -> None:
+    """スケジューラー経由でも同じ音声が返り、期限切れの要求には 503 と Retry-After が返る"""
+    scheduler = SynthesisScheduler(max_workers=1, max_queue_size=1)
+    client = TestClient(generate_app(**app_params, synthesis_scheduler=scheduler))
+    query = {
+        "accent_phrases": [
+            {
+                "moras": [
+                    gen_mora("テ", "t", 2.3, "e", 0.8, 3.3),
+                    gen_mora("ス", "s", 2.1, "U", 0.3, 0.0),
+                    gen_mora("ト", "t", 2.3, "o", 1.8, 4.1),
+                ],
+                "accent": 1,
+                "pause_mora": None,
+                "is_interrogative": False,
+            }
+        ],
+        "speedScale": 1.0,
+        "pitchScale": 1.0,
+        "intonationScale": 1.0,
+        "volumeScale": 1.0,
+        "prePhonemeLength": 0.1,
+        "postPhonemeLength": 0.1,
+        "pauseLength": None,
+        "pauseLengthScale": 1.0,
+        "outputSamplingRate": 24000,
+        "outputStereo": False,
+        "kana": "テ'_スト",
+    }
+
+    response = client.post("/synthesis", params={"speaker": 0}, json=query)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "audio/wav"
+    assert snapshot == hash_wave_floats_from_wav_bytes(response.read())
+
+    expired_response = client.post(
+        "/synthesis",
+        params={"speaker": 0},
+        json=query,
+        headers={"X-Request-Timeout": "1e-9"},
+    )
+    assert expired_response.status_code == 503
+    assert int(expired_response.headers["Retry-After"]) >= 1
+    assert scheduler.num_jobs == 0
+
+    for invalid_timeout in ["soon", "-1", "0", "nan", "inf"]:
+        invalid_response = client.post(
+            "/synthesis",
+            params={"speaker": 0},
+            json=query,
+            headers={"X-Request-Timeout": invalid_timeout},
+        )
+        assert invalid_response.status_code == 422
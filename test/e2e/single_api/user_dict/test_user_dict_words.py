@@ -0,0 +1,78 @@
+"""/user_dict_words API のテスト。"""
+
+from typing import Any
+
+from fastapi.testclient import TestClient
+from syrupy.assertion import SnapshotAssertion
+
+_EXISTING_WORD_UUID = "a89596ad-caa8-4f4e-8eb3-3d2261c798fd"
+
+
+def test_post_user_dict_words_200(client: TestClient) -> None:
+    """追加・更新・削除がまとめて反映され、操作ごとの結果が返る。"""
+    original_word_uuids = list(client.get("/user_dict").json())
+    operations: dict[str, Any] = {
+        "add": [
+            {"surface": "test2", "pronunciation": "テストツー", "accent_type": 1},
+            {
+                "surface": "test3",
+                "pronunciation": "テストスリー",
+                "accent_type": 1,
+                "word_type": "COMMON_NOUN",
+                "priority": 3,
+            },
+        ],
+        "rewrite": [
+            {
+                "word_uuid": _EXISTING_WORD_UUID,
+                "surface": "test1",
+                "pronunciation": "テストワン",
+                "accent_type": 1,
+            }
+        ],
+    }
+    response = client.post("/user_dict_words", json=operations)
+    assert response.status_code == 200
+    result = response.json()
+    assert len(result["added"]) == 2
+    assert result["rewritten"] == [_EXISTING_WORD_UUID]
+    assert result["deleted"] == []
+
+    user_dict = client.get("/user_dict").json()
+    assert [user_dict[word_uuid]["surface"] for word_uuid in result["added"]] == [
+        "ｔｅｓｔ２",
+        "ｔｅｓｔ３",
+    ]
+    assert user_dict[_EXISTING_WORD_UUID]["pronunciation"] == "テストワン"
+
+    response = client.post("/user_dict_words", json={"delete": result["added"]})
+    assert response.status_code == 200
+    assert response.json()["deleted"] == result["added"]
+    assert list(client.get("/user_dict").json()) == original_word_uuids
+
+
+def test_post_user_dict_words_422(
+    client: TestClient, snapshot_json: SnapshotAssertion
+) -> None:
+    """受け入れられない操作があれば何も変更せず、受け入れられなかった操作の一覧を返す。"""
+    operations: dict[str, Any] = {
+        "add": [
+            {"surface": "test2", "pronunciation": "テストツー", "accent_type": 1},
+            {"surface": "test3", "pronunciation": "てすと", "accent_type": 1},
+        ],
+        "rewrite": [
+            {
+                "word_uuid": "00000000-0000-4000-8000-000000000000",
+                "surface": "test1",
+                "pronunciation": "テストワン",
+                "accent_type": 1,
+            }
+        ],
+        "delete": [_EXISTING_WORD_UUID, _EXISTING_WORD_UUID],
+    }
+    user_dict = client.get("/user_dict").json()
+
+    response = client.post("/user_dict_words", json=operations)
+    assert response.status_code == 422
+    assert snapshot_json == response.json()
+    assert client.get("/user_dict").json() == user_dict
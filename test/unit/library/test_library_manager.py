@@ -259,3 +259,14 @@ class _TestLibraryManager(TestCase):
 
         self.library_manger.install_library(self.library_uuid, self.library_file)
         self.library_manger.uninstall_library(self.library_uuid)
+
+    def test_change_listener(self) -> None:
+        """インストール・アンインストールのたびに変更が通知される。"""
+        notifications: list[None] = []
+        self.library_manger.add_change_listener(lambda: notifications.append(None))
+
+        self.library_manger.install_library(self.library_uuid, self.library_file)
+        assert len(notifications) == 1
+
+        self.library_manger.uninstall_library(self.library_uuid)
+        assert len(notifications) == 2
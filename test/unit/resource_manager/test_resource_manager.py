@@ -1,11 +1,17 @@
 """リソースマネージャーの単体テスト。"""
 
 import base64
+import shutil
 from pathlib import Path
 
 import pytest
 
-from voicevox_engine.resource_manager import ResourceManager, ResourceManagerError
+from voicevox_engine import resource_manager
+from voicevox_engine.resource_manager import (
+    ResourceFileCache,
+    ResourceManager,
+    ResourceManagerError,
+)
 
 with_filemap_dir = Path(__file__).parent / "with_filemap"
 without_filemap_dir = Path(__file__).parent / "without_filemap"
@@ -89,3 +95,63 @@ def test_without_filemap() -> None:
     # 登録されていないハッシュが渡された場合エラー
     with pytest.raises(ResourceManagerError):
         manager.resource_path("NOT_EXIST_HASH")
+
+
+def test_without_filemap_with_hash_index(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """ハッシュ索引がある場合、変更されたファイルだけを再びハッシュ化する。"""
+    resource_dir = tmp_path / "resources"
+    shutil.copytree(without_filemap_dir, resource_dir)
+    index_dir = tmp_path / "index"
+    ResourceManager(True, hash_index_dir=index_dir).register_dir(resource_dir)
+    assert len(list(index_dir.iterdir())) == 1
+
+    # 変更したファイルだけがハッシュ化される
+    txt_path = resource_dir / "dummy.txt"
+    txt_path.write_text("changed", encoding="utf-8")
+    hashed_paths: list[Path] = []
+    original_hash_file = resource_manager._hash_file
+
+    def _spy_hash_file(path: Path) -> str:
+        hashed_paths.append(path)
+        return original_hash_file(path)
+
+    monkeypatch.setattr(resource_manager, "_hash_file", _spy_hash_file)
+    manager = ResourceManager(True, hash_index_dir=index_dir)
+    manager.register_dir(resource_dir)
+    assert hashed_paths == [txt_path]
+    _assert_resource(manager, txt_path)
+    _assert_resource(manager, resource_dir / "dummy.png")
+
+
+def test_without_filemap_skips_broken_symlink(tmp_path: Path) -> None:
+    """リンク切れのシンボリックリンクは filemap の生成時に無視する。"""
+    resource_dir = tmp_path / "resources"
+    shutil.copytree(without_filemap_dir, resource_dir)
+    (resource_dir / "broken.png").symlink_to(tmp_path / "missing.png")
+
+    manager = ResourceManager(True, hash_index_dir=tmp_path / "index")
+    manager.register_dir(resource_dir)
+
+    _assert_resource(manager, resource_dir / "dummy.png")
+
+
+def test_resource_file_cache(tmp_path: Path) -> None:
+    """容量上限に収まるファイルだけをキャッシュし、古いものから追い出す。"""
+    small_a, small_b, large = tmp_path / "a", tmp_path / "b", tmp_path / "large"
+    small_a.write_bytes(b"a" * 6)
+    small_b.write_bytes(b"b" * 6)
+    large.write_bytes(b"c" * 11)
+    cache = ResourceFileCache(max_bytes=10)
+
+    assert cache.read("a", small_a) == b"a" * 6
+    # キャッシュ済みの内容はファイルを読まずに返す
+    small_a.unlink()
+    assert cache.read("a", small_a) == b"a" * 6
+    # 容量上限を超える大きなファイルはキャッシュしない
+    assert cache.read("large", large) is None
+    # 容量を超えると古いものから追い出される
+    assert cache.read("b", small_b) == b"b" * 6
+    with pytest.raises(FileNotFoundError):
+        cache.read("a", small_a)
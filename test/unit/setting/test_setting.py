@@ -74,3 +74,20 @@ def test_setting_handler_save(tmp_path: Path) -> None:
     setting = setting_loader.load()  # NOTE: `.load()` の正常動作を前提とする
     # Test
     assert true_setting == setting
+
+
+def test_setting_handler_save_wave_cache(tmp_path: Path) -> None:
+    """`SettingHandler.save()` で音声キャッシュの容量上限を保存できる。"""
+    # Inputs
+    setting_path = tmp_path / "setting-test-dump.yaml"
+    setting_loader = SettingHandler(setting_path)
+    new_setting = Setting(
+        cors_policy_mode=CorsPolicyMode.localapps,
+        wave_cache_size_mb=64,
+        wave_cache_disk_size_mb=512,
+    )
+    # Outputs
+    setting_loader.save(new_setting)
+    setting = setting_loader.load()
+    # Test
+    assert new_setting == setting
@@ -0,0 +1,275 @@
+"""`cancellable_engine.py` のテスト"""
+
+import asyncio
+import time
+from collections.abc import Callable
+
+import pytest
+from fastapi import Request
+from starlette.types import Message
+
+from voicevox_engine.cancellable_engine import (
+    CancellableEngine,
+    CancellableEngineBusyError,
+    CancellableEngineCancelledError,
+    FrameJob,
+    MorphJob,
+    MultiJob,
+)
+from voicevox_engine.metas.metas import StyleId
+from voicevox_engine.model import AudioQuery
+from voicevox_engine.tts_pipeline.model import (
+    AccentPhrase,
+    FrameAudioQuery,
+    FramePhoneme,
+    Mora,
+)
+from voicevox_engine.tts_pipeline.song_engine import SongInvalidInputError
+from voicevox_engine.tts_pipeline.tts_engine import LATEST_VERSION
+
+
+def _gen_query(output_sampling_rate: int = 24000) -> AudioQuery:
+    moras = [
+        Mora(
+            text="テ",
+            consonant="t",
+            consonant_length=0.1,
+            vowel="e",
+            vowel_length=0.1,
+            pitch=5.0,
+        )
+    ]
+    return AudioQuery(
+        accent_phrases=[AccentPhrase(moras=moras, accent=1)],
+        speedScale=1,
+        pitchScale=0,
+        intonationScale=1,
+        volumeScale=1,
+        prePhonemeLength=0.1,
+        postPhonemeLength=0.1,
+        pauseLength=None,
+        pauseLengthScale=1,
+        outputSamplingRate=output_sampling_rate,
+        outputStereo=False,
+        kana=None,
+    )
+
+
+def _gen_request(disconnected: asyncio.Event) -> Request:
+    async def receive() -> Message:
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    return Request({"type": "http", "method": "POST", "headers": []}, receive)
+
+
+def test_synthesize_wave_replaces_process_on_disconnect() -> None:
+    """要求元が切断すると、合成中のプロセスを直ちに新しいプロセスへ置き換える。"""
+    engine = CancellableEngine(init_processes=1, use_gpu=False, enable_mock=True)
+
+    async def run() -> None:
+        # 切断しない要求は合成結果を受け取り、プロセスは再利用される
+        wav = await engine.synthesize_wave(
+            _gen_query(),
+            StyleId(0),
+            False,
+            _gen_request(asyncio.Event()),
+            LATEST_VERSION,
+        )
+        assert wav is not None
+        assert wav.startswith(b"RIFF")
+        assert (engine.num_active_processes, engine.num_idle_processes) == (0, 1)
+
+        # 合成中に切断した要求は中断され、プロセスは作り直される
+        disconnected = asyncio.Event()
+        disconnected.set()
+        with pytest.raises(CancellableEngineCancelledError):
+            await engine.synthesize_wave(
+                _gen_query(),
+                StyleId(0),
+                False,
+                _gen_request(disconnected),
+                LATEST_VERSION,
+            )
+        assert engine.num_active_processes == 0
+        assert engine.num_replaced_processes == 1
+
+        # 作り直されたプロセスが初期化を終え次第、合成できる
+        wav = await engine.synthesize_wave(
+            _gen_query(),
+            StyleId(0),
+            False,
+            _gen_request(asyncio.Event()),
+            LATEST_VERSION,
+        )
+        assert wav is not None
+
+    asyncio.run(run())
+
+
+def test_synthesize_wave_shared_memory() -> None:
+    """共有メモリを介して受け取った WAV は、コネクションを介して受け取った WAV と一致する。"""
+    engines = [
+        CancellableEngine(init_processes=1, use_gpu=False, enable_mock=True),
+        # 共有メモリに収まらないため、コネクションを介して受け取る
+        CancellableEngine(
+            init_processes=1, use_gpu=False, enable_mock=True, wave_buffer_bytes=44
+        ),
+        CancellableEngine(
+            init_processes=1, use_gpu=False, enable_mock=True, wave_buffer_bytes=0
+        ),
+    ]
+
+    async def run(engine: CancellableEngine) -> bytes | None:
+        return await engine.synthesize_wave(
+            _gen_query(),
+            StyleId(0),
+            False,
+            _gen_request(asyncio.Event()),
+            LATEST_VERSION,
+        )
+
+    wavs = [asyncio.run(run(engine)) for engine in engines]
+    assert wavs[0] is not None
+    assert wavs[0].startswith(b"RIFF")
+    assert wavs[0] == wavs[1] == wavs[2]
+
+
+def _wait_until(condition: Callable[[], bool]) -> None:
+    deadline = time.monotonic() + 30
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_synthesize_wave_uses_spare_process() -> None:
+    """予備のプロセスがある場合、終了したプロセスを直ちに予備で置き換え、予備を作り直す。"""
+    engine = CancellableEngine(
+        init_processes=1, use_gpu=False, enable_mock=True, spare_processes=1
+    )
+    _wait_until(lambda: engine.num_spare_processes == 1)
+
+    async def cancel() -> None:
+        disconnected = asyncio.Event()
+        disconnected.set()
+        with pytest.raises(CancellableEngineCancelledError):
+            await engine.synthesize_wave(
+                _gen_query(),
+                StyleId(0),
+                False,
+                _gen_request(disconnected),
+                LATEST_VERSION,
+            )
+
+    asyncio.run(cancel())
+
+    # 初期化済みの予備が直ちに待機中となる
+    assert engine.num_idle_processes == 1
+    assert engine.num_spare_processes + engine.num_starting_processes == 1
+    _wait_until(lambda: engine.num_spare_processes == 1)
+
+
+async def _synthesize(engine: CancellableEngine) -> bytes | None:
+    return await engine.synthesize_wave(
+        _gen_query(),
+        StyleId(0),
+        False,
+        _gen_request(asyncio.Event()),
+        LATEST_VERSION,
+    )
+
+
+def test_synthesize_wave_scales_processes() -> None:
+    """空きプロセスを待つ要求があればプロセスを上限まで追加し、待機が続いたプロセスを下限まで終了する。"""
+    engine = CancellableEngine(
+        init_processes=1,
+        use_gpu=False,
+        enable_mock=True,
+        max_processes=3,
+        idle_timeout_sec=2,
+    )
+    _wait_until(lambda: engine.num_idle_processes == 1)
+
+    async def run() -> None:
+        wavs = await asyncio.gather(*[_synthesize(engine) for _ in range(4)])
+        assert all(wav is not None for wav in wavs)
+
+    asyncio.run(run())
+
+    # 待つ要求に応じてプロセスを追加し、上限を超えない
+    assert 1 < engine.num_processes <= 3
+    assert engine.num_waiting_requests == 0
+    # 待機が続いたプロセスを下限まで終了する
+    _wait_until(lambda: engine.num_processes == 1)
+    assert engine.num_idle_processes == 1
+
+
+def test_synthesize_wave_busy() -> None:
+    """期限内に空きプロセスを確保できない要求は拒否する。"""
+    engine = CancellableEngine(
+        init_processes=1, use_gpu=False, enable_mock=True, acquire_timeout_sec=0.01
+    )
+
+    async def run() -> None:
+        # 初期化を終える前は空きプロセスが無い
+        with pytest.raises(CancellableEngineBusyError):
+            await _synthesize(engine)
+        assert engine.num_waiting_requests == 0
+
+    asyncio.run(run())
+
+    # 空きプロセスを確保できれば合成できる
+    _wait_until(lambda: engine.num_idle_processes == 1)
+    assert asyncio.run(_synthesize(engine)) is not None
+
+
+def test_run_job_multi_and_morph() -> None:
+    """複数のクエリをまとめたジョブとモーフィングのジョブを、サブプロセスで実行できる。"""
+    engine = CancellableEngine(init_processes=1, use_gpu=False, enable_mock=True)
+    queries = [_gen_query(), _gen_query(output_sampling_rate=48000)]
+
+    async def run() -> None:
+        request = _gen_request(asyncio.Event())
+        wavs = await engine.run_job(
+            MultiJob(queries, StyleId(0), False, LATEST_VERSION), request
+        )
+        # クエリごとに合成した音声と一致する
+        assert wavs is not None
+        for query, wav in zip(queries, wavs, strict=True):
+            assert wav == await engine.synthesize_wave(
+                query, StyleId(0), False, request, LATEST_VERSION
+            )
+
+        morph_job = MorphJob(
+            _gen_query(), StyleId(0), StyleId(0), 0.5, False, LATEST_VERSION
+        )
+        morphed_wavs = await engine.run_job(morph_job, request)
+        assert morphed_wavs is not None
+        assert morphed_wavs[0].startswith(b"RIFF")
+
+    asyncio.run(run())
+
+
+def test_run_job_frame_invalid_input() -> None:
+    """歌唱音声合成の入力が不正な場合は、プロセスを再利用したまま入力のエラーを送出する。"""
+    engine = CancellableEngine(init_processes=1, use_gpu=False, enable_mock=True)
+    query = FrameAudioQuery(
+        f0=[0.0],
+        volume=[0.0],
+        phonemes=[FramePhoneme(phoneme="invalid", frame_length=1)],
+        volumeScale=1,
+        outputSamplingRate=24000,
+        outputStereo=False,
+    )
+
+    async def run() -> None:
+        with pytest.raises(SongInvalidInputError, match="invalid"):
+            await engine.run_job(
+                FrameJob(query, StyleId(0), LATEST_VERSION),
+                _gen_request(asyncio.Event()),
+            )
+
+    asyncio.run(run())
+
+    assert engine.num_replaced_processes == 0
+    assert engine.num_idle_processes == 1
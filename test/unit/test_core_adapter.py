@@ -0,0 +1,285 @@
+"""`core_adapter.py` のテスト"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from numpy.typing import NDArray
+
+from voicevox_engine.core.core_adapter import CoreAdapter
+from voicevox_engine.core.core_wrapper import OldCoreError
+from voicevox_engine.core.model_residency import ModelResidencyPolicy
+from voicevox_engine.dev.core.mock import MockCoreWrapper
+from voicevox_engine.metas.metas import StyleId
+
+
+class _BlockingCoreWrapper(MockCoreWrapper):
+    """推論呼び出しを記録し、全インスタンスへ呼び出しが届くまで推論を止める `MockCoreWrapper`"""
+
+    def __init__(self, barrier: threading.Barrier) -> None:
+        super().__init__()
+        self.barrier = barrier
+        self.num_calls = 0
+
+    def yukarin_s_forward(
+        self,
+        length: int,
+        phoneme_list: NDArray[np.int64],
+        style_id: NDArray[np.int64],
+    ) -> NDArray[np.float32]:
+        self.num_calls += 1
+        self.barrier.wait(timeout=10)
+        return super().yukarin_s_forward(length, phoneme_list, style_id)
+
+
+class _ResidentCoreWrapper(MockCoreWrapper):
+    """読み込まれたモデルを記録する `MockCoreWrapper`"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.loaded_style_ids: set[int] = set()
+
+    def unload_all_models(self) -> None:
+        self.loaded_style_ids.clear()
+
+    def load_model(self, style_id: int) -> None:
+        self.loaded_style_ids.add(style_id)
+
+    def is_model_loaded(self, style_id: int) -> bool:
+        return style_id in self.loaded_style_ids
+
+
+class _CountingResidentCoreWrapper(_ResidentCoreWrapper):
+    """モデルの読み込み状態の問い合わせ回数を記録する `_ResidentCoreWrapper`"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.num_is_model_loaded_calls = 0
+
+    def is_model_loaded(self, style_id: int) -> bool:
+        self.num_is_model_loaded_calls += 1
+        return super().is_model_loaded(style_id)
+
+
+class _StrictResidentCoreWrapper(_ResidentCoreWrapper):
+    """読み込まれていないスタイルでの推論を拒否し、指定スタイルのモデルの読み込みに失敗できる `_ResidentCoreWrapper`"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.failing_style_ids: set[int] = set()
+
+    def load_model(self, style_id: int) -> None:
+        if style_id in self.failing_style_ids:
+            raise RuntimeError("モデルの読み込みに失敗しました")
+        super().load_model(style_id)
+
+    def yukarin_s_forward(
+        self,
+        length: int,
+        phoneme_list: NDArray[np.int64],
+        style_id: NDArray[np.int64],
+    ) -> NDArray[np.float32]:
+        assert int(style_id[0]) in self.loaded_style_ids
+        return super().yukarin_s_forward(length, phoneme_list, style_id)
+
+
+class _LockCheckingResidentCoreWrapper(_ResidentCoreWrapper):
+    """排他区間の外でのモデルの読み込み状態の問い合わせを拒否する `_ResidentCoreWrapper`"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.mutex: threading.Lock | None = None
+
+    def is_model_loaded(self, style_id: int) -> bool:
+        assert self.mutex is not None
+        assert self.mutex.locked()
+        return super().is_model_loaded(style_id)
+
+
+class _OldResidentCoreWrapper(_ResidentCoreWrapper):
+    """初期化し直しに対応しない `_ResidentCoreWrapper`"""
+
+    def unload_all_models(self) -> None:
+        raise OldCoreError
+
+
+def test_core_adapter_dispatches_to_least_loaded_instance() -> None:
+    """複製をもつ CoreAdapter は同時の推論呼び出しを各インスタンスへ振り分け、並列に実行する。"""
+    # Inputs
+    barrier = threading.Barrier(3)
+    cores = [_BlockingCoreWrapper(barrier) for _ in range(3)]
+    core_adapter = CoreAdapter(cores[0], replicas=cores[1:])
+    phoneme_ids = np.array([7, 14, 21], dtype=np.int64)
+    # Expects
+    true_lengths = CoreAdapter(MockCoreWrapper()).safe_yukarin_s_forward(
+        phoneme_ids, StyleId(1)
+    )
+    # Outputs
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = [
+            executor.submit(
+                core_adapter.safe_yukarin_s_forward, phoneme_ids, StyleId(1)
+            )
+            for _ in range(3)
+        ]
+        results = [future.result(timeout=10) for future in futures]
+
+    # Test
+    # インスタンスが排他的に 1 つだけ使われた場合、バリアを越えられずタイムアウトする
+    assert core_adapter.num_instances == 3
+    assert [core.num_calls for core in cores] == [1, 1, 1]
+    for lengths in results:
+        assert np.array_equal(true_lengths, lengths)
+
+
+def test_core_adapter_skips_loaded_style_check() -> None:
+    """読み込み済みのスタイルで推論する場合、コアへモデルの読み込み状態を問い合わせない。"""
+    # Inputs
+    core = _CountingResidentCoreWrapper()
+    core_adapter = CoreAdapter(core)
+    phoneme_ids = np.array([7, 14, 21], dtype=np.int64)
+
+    # Outputs
+    for _ in range(3):
+        core_adapter.safe_yukarin_s_forward(phoneme_ids, StyleId(1))
+
+    # Test
+    assert core.loaded_style_ids == {1}
+    assert core.num_is_model_loaded_calls == 1
+
+
+def test_core_adapter_recycles_least_recently_used_styles() -> None:
+    """常駐数が上限に達した状態で新しいスタイルを使うと、最近使われたスタイル以外のモデルを解放する。"""
+    # Inputs
+    core = _ResidentCoreWrapper()
+    policy = ModelResidencyPolicy(memory_budget_bytes=4, bytes_per_style=1)
+    core_adapter = CoreAdapter(core, model_residency_policy=policy)
+    phoneme_ids = np.array([7, 14, 21], dtype=np.int64)
+
+    # Outputs
+    for style_id in [1, 2, 3, 1, 4]:
+        core_adapter.safe_yukarin_s_forward(phoneme_ids, StyleId(style_id))
+    stats_before = core_adapter.residency_stats()[0]
+    core_adapter.safe_yukarin_s_forward(phoneme_ids, StyleId(5))
+    stats_after = core_adapter.residency_stats()[0]
+
+    # Test
+    assert stats_before.resident_style_ids == [2, 3, 1, 4]
+    assert stats_before.recycles == 0
+    # 上限の半分である最近使われた 2 スタイルを読み込み直した上で、新しいスタイルを読み込む
+    assert core.loaded_style_ids == {1, 4, 5}
+    assert stats_after.resident_style_ids == [1, 4, 5]
+    assert stats_after.resident_bytes == 3
+    assert stats_after.budget_bytes == 4
+    assert stats_after.loads == 7
+    assert stats_after.recycles == 1
+
+
+def test_core_adapter_disables_residency_for_old_core() -> None:
+    """初期化し直しに対応しないコアでは、警告を出して常駐管理を無効にする。"""
+    # Inputs
+    core = _OldResidentCoreWrapper()
+    policy = ModelResidencyPolicy(memory_budget_bytes=1, bytes_per_style=1)
+    core_adapter = CoreAdapter(core, model_residency_policy=policy)
+    core_adapter.initialize_style_id_synthesis(StyleId(1), skip_reinit=True)
+
+    # Outputs
+    with pytest.warns(UserWarning, match="常駐管理"):
+        core_adapter.initialize_style_id_synthesis(StyleId(2), skip_reinit=True)
+
+    # Test
+    assert core.loaded_style_ids == {1, 2}
+    assert core_adapter.residency_stats() == []
+
+
+def test_core_adapters_share_core_lock() -> None:
+    """同じコアを扱う CoreAdapter 同士は排他制御を共有し、リサイクルで推論中のモデルを解放しない。"""
+    # Inputs
+    core = _StrictResidentCoreWrapper()
+    policy = ModelResidencyPolicy(memory_budget_bytes=2, bytes_per_style=1)
+    resident_adapter = CoreAdapter(core, model_residency_policy=policy)
+    other_adapter = CoreAdapter(core)
+    phoneme_ids = np.array([7, 14, 21], dtype=np.int64)
+
+    # Outputs
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [
+            executor.submit(adapter.safe_yukarin_s_forward, phoneme_ids, StyleId(i % 5))
+            for i in range(200)
+            for adapter in [resident_adapter, other_adapter]
+        ]
+        for future in futures:
+            future.result(timeout=10)
+
+    # Test
+    assert resident_adapter.mutex is other_adapter.mutex
+    assert resident_adapter.residency_stats()[0].recycles > 0
+
+
+def test_core_adapters_share_model_residency() -> None:
+    """同じコアを扱う CoreAdapter 同士は常駐管理を共有し、常駐設定の無い CoreAdapter が読み込んだモデルも上限に数える。"""
+    # Inputs
+    core = _StrictResidentCoreWrapper()
+    policy = ModelResidencyPolicy(memory_budget_bytes=2, bytes_per_style=1)
+    resident_adapter = CoreAdapter(core, model_residency_policy=policy)
+    other_adapter = CoreAdapter(core)
+    phoneme_ids = np.array([7, 14, 21], dtype=np.int64)
+
+    # Outputs
+    resident_adapter.safe_yukarin_s_forward(phoneme_ids, StyleId(1))
+    other_adapter.safe_yukarin_s_forward(phoneme_ids, StyleId(2))
+    stats_before = resident_adapter.residency_stats()[0]
+    resident_adapter.safe_yukarin_s_forward(phoneme_ids, StyleId(3))
+    other_adapter.safe_yukarin_s_forward(phoneme_ids, StyleId(2))
+
+    # Test
+    assert stats_before.resident_style_ids == [1, 2]
+    # 最近使われたスタイルは他の CoreAdapter のものでもリサイクル後に読み込み直される
+    assert core.loaded_style_ids == {2, 3}
+    for adapter in [resident_adapter, other_adapter]:
+        stats = adapter.residency_stats()[0]
+        assert stats.resident_style_ids == [3, 2]
+        assert stats.recycles == 1
+
+
+def test_core_adapter_recycle_failure_keeps_residency_consistent() -> None:
+    """リサイクル中のモデルの読み込みに失敗しても、常駐状況はコアの状態と食い違わない。"""
+    # Inputs
+    core = _StrictResidentCoreWrapper()
+    policy = ModelResidencyPolicy(memory_budget_bytes=4, bytes_per_style=1)
+    core_adapter = CoreAdapter(core, model_residency_policy=policy)
+    phoneme_ids = np.array([7, 14, 21], dtype=np.int64)
+    for style_id in [1, 2, 3, 4]:
+        core_adapter.safe_yukarin_s_forward(phoneme_ids, StyleId(style_id))
+    core.failing_style_ids = {4}
+
+    # Outputs
+    with pytest.raises(RuntimeError, match="読み込みに失敗"):
+        core_adapter.safe_yukarin_s_forward(phoneme_ids, StyleId(5))
+    stats = core_adapter.residency_stats()[0]
+    core.failing_style_ids = set()
+    core_adapter.safe_yukarin_s_forward(phoneme_ids, StyleId(4))
+
+    # Test
+    # 読み込み直せたスタイルだけが常駐中として記録される
+    assert stats.resident_style_ids == [3]
+    assert stats.recycles == 1
+    assert core.loaded_style_ids == {3, 4}
+
+
+def test_core_adapter_checks_loaded_style_exclusively() -> None:
+    """モデルの読み込み状態は、リサイクルと排他的に問い合わせる。"""
+    # Inputs
+    core = _LockCheckingResidentCoreWrapper()
+    core_adapter = CoreAdapter(core)
+    core.mutex = core_adapter.mutex
+    core_adapter.initialize_style_id_synthesis(StyleId(1), skip_reinit=False)
+
+    # Outputs
+    is_initialized = core_adapter.is_initialized_style_id_synthesis(StyleId(1))
+    is_not_initialized = core_adapter.is_initialized_style_id_synthesis(StyleId(2))
+
+    # Test
+    assert is_initialized
+    assert not is_not_initialized
@@ -9,6 +9,7 @@ from voicevox_engine.core.core_initializer import (
     CoreManager,
     CoreNotFound,
     _get_half_logical_cores,
+    initialize_cores,
 )
 from voicevox_engine.dev.core.mock import MockCoreWrapper
 
@@ -143,3 +144,21 @@ def test_half_logical_cores_odd(mock_cpu_count: int) -> None:
 @patch("os.cpu_count", return_value=None)
 def test_half_logical_cores_none(mock_cpu_count: int) -> None:
     assert _get_half_logical_cores() == 0
+
+
+def test_initialize_cores_with_instances() -> None:
+    """initialize_cores() は指定された数のインスタンスをもつコアを登録する。"""
+    # Outputs
+    core_manager = initialize_cores(
+        use_gpu=False, enable_mock=True, cpu_num_threads=4, core_instances=2
+    )
+    (_, core), *_ = core_manager.items()
+
+    # Test
+    assert core.num_instances == 2
+
+
+def test_initialize_cores_with_invalid_instances() -> None:
+    """initialize_cores() はインスタンス数が 1 未満の場合にエラーを送出する。"""
+    with pytest.raises(ValueError, match="core_instances"):
+        initialize_cores(use_gpu=False, enable_mock=True, core_instances=0)
@@ -0,0 +1,13 @@
+"""`core_process.py` のテスト"""
+
+from pathlib import Path
+
+import pytest
+
+from voicevox_engine.core.core_process import CoreProcessWrapper
+
+
+def test_core_process_wrapper_raises_load_error(tmp_path: Path) -> None:
+    """CoreProcessWrapper はサブプロセスでのコアの読み込みエラーを再送出する。"""
+    with pytest.raises(RuntimeError, match="コアが見つかりません"):
+        CoreProcessWrapper(use_gpu=False, core_dir=tmp_path)
@@ -0,0 +1,64 @@
+"""LazyApplication の単体テスト。"""
+
+import threading
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.types import ASGIApp
+
+from voicevox_engine.app.lazy_application import LazyApplication
+
+
+def _gen_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/version")
+    def version() -> str:
+        return "latest"
+
+    return app
+
+
+def _wait_for_build(app: LazyApplication) -> None:
+    while app.status == "starting":
+        time.sleep(0.01)
+
+
+def test_lazy_application_serves_after_build() -> None:
+    """生成の完了前は 503 を返し、完了後は本体へ委譲する。"""
+    # Inputs
+    release = threading.Event()
+
+    def build_app() -> ASGIApp:
+        release.wait()
+        return _gen_app()
+
+    app = LazyApplication(build_app, lambda: "initialize_cores")
+
+    # Tests
+    with TestClient(app) as client:
+        response = client.get("/version")
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+        health = client.get("/health")
+        assert health.status_code == 200
+        assert health.json() == {"status": "starting", "phase": "initialize_cores"}
+
+        release.set()
+        _wait_for_build(app)
+        assert client.get("/version").json() == "latest"
+        assert client.get("/health").json() == {"status": "ready", "phase": None}
+
+
+def test_lazy_application_failed() -> None:
+    """生成に失敗した場合、`/health` は 503 を返す。"""
+
+    def build_app() -> ASGIApp:
+        raise RuntimeError("コアがありません")
+
+    app = LazyApplication(build_app)
+    with TestClient(app) as client:
+        _wait_for_build(app)
+        assert client.get("/health").status_code == 503
+        assert client.get("/version").status_code == 503
@@ -2,7 +2,13 @@
 # TODO: モジュール/ファイル名とモジュール docstring の一貫性を検証
 
 import uuid
+from pathlib import Path
 
+from voicevox_engine.core.core_adapter import (
+    CoreCharacter,
+    CoreCharacterStyle,
+    CoreStyleId,
+)
 from voicevox_engine.metas.metas import (
     SpeakerStyle,
     SpeakerSupportedFeatures,
@@ -13,8 +19,10 @@ from voicevox_engine.metas.metas_store import (
     _SING_STYLE_TYPES,
     _TALK_STYLE_TYPES,
     Character,
+    MetasStore,
     filter_characters_and_styles,
 )
+from voicevox_engine.resource_manager import ResourceManager
 
 
 def _gen_character(style_types: list[StyleType]) -> Character:
@@ -97,3 +105,63 @@ def test_filter_characters_and_styles_with_sing() -> None:
     for character in result:
         for style in character.talk_styles + character.sing_styles:
             assert style.type in ["singing_teacher", "frame_decode", "sing"]
+
+
+def _gen_metas_store(
+    tmp_path: Path, core_characters: list[CoreCharacter]
+) -> tuple[MetasStore, list[str | None]]:
+    """コアのキャラクター情報を返す関数の呼び出し履歴とともに `MetasStore` を生成する。"""
+    for core_character in core_characters:
+        character_dir = tmp_path / core_character.speaker_uuid
+        character_dir.mkdir()
+        (character_dir / "metas.json").write_text("{}", encoding="utf-8")
+    calls: list[str | None] = []
+
+    def get_core_characters(core_version: str | None) -> list[CoreCharacter]:
+        calls.append(core_version)
+        return core_characters
+
+    store = MetasStore(tmp_path, get_core_characters, ResourceManager(False))
+    return store, calls
+
+
+def test_metas_store_caches_characters(tmp_path: Path) -> None:
+    # Inputs
+    styles = [
+        CoreCharacterStyle("", CoreStyleId(0), "talk"),
+        CoreCharacterStyle("", CoreStyleId(6000), "sing"),
+    ]
+    core_character = CoreCharacter("", str(uuid.uuid4()), styles, "")
+    store, calls = _gen_metas_store(tmp_path, [core_character])
+
+    # Outputs
+    talk_characters = store.talk_characters(None)
+    sing_characters = store.sing_characters(None)
+    speakers_json = store.speakers_json("talk", None)
+    cached_speakers_json = store.speakers_json("talk", None)
+
+    # Tests
+    # コアへの問い合わせはバージョンごとに一度きり
+    assert calls == [None]
+    # スタイルの絞り込みがキャッシュへ波及しない
+    assert [style.id for style in talk_characters[0].talk_styles] == [0]
+    assert [style.id for style in sing_characters[0].sing_styles] == [6000]
+    assert cached_speakers_json is speakers_json
+
+
+def test_metas_store_invalidate_cache(tmp_path: Path) -> None:
+    # Inputs
+    core_character = CoreCharacter(
+        "", str(uuid.uuid4()), [CoreCharacterStyle("", CoreStyleId(0), "talk")], ""
+    )
+    store, calls = _gen_metas_store(tmp_path, [core_character])
+    speakers_json = store.speakers_json("talk", None)
+
+    # Outputs
+    store.invalidate_cache()
+    reloaded_speakers_json = store.speakers_json("talk", None)
+
+    # Tests
+    assert calls == [None, None]
+    assert reloaded_speakers_json is not speakers_json
+    assert reloaded_speakers_json.etag == speakers_json.etag
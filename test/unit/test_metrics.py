@@ -0,0 +1,53 @@
+"""`metrics.py` のテスト"""
+
+from voicevox_engine.metrics import CallbackMetric, Histogram, MetricsRegistry
+
+
+def test_histogram_render() -> None:
+    """ヒストグラムはバケットごとの累積数と合計・総数を出力する。"""
+    # Inputs
+    histogram = Histogram("test_seconds", "テスト", ["stage"], buckets=[0.1, 1.0])
+    histogram.observe(0.05, "a")
+    histogram.observe(0.5, "a")
+    histogram.observe(2.0, "a")
+    histogram.observe(0.5, 'b"')
+    registry = MetricsRegistry()
+    registry.register(histogram)
+    # Expects
+    true_text = "\n".join(
+        [
+            "# HELP test_seconds テスト",
+            "# TYPE test_seconds histogram",
+            'test_seconds_bucket{stage="a",le="0.1"} 1',
+            'test_seconds_bucket{stage="a",le="1"} 2',
+            'test_seconds_bucket{stage="a",le="+Inf"} 3',
+            'test_seconds_sum{stage="a"} 2.55',
+            'test_seconds_count{stage="a"} 3',
+            'test_seconds_bucket{stage="b\\"",le="0.1"} 0',
+            'test_seconds_bucket{stage="b\\"",le="1"} 1',
+            'test_seconds_bucket{stage="b\\"",le="+Inf"} 1',
+            'test_seconds_sum{stage="b\\""} 0.5',
+            'test_seconds_count{stage="b\\""} 1',
+            "",
+        ]
+    )
+    # Outputs
+    text = registry.render()
+    # Tests
+    assert true_text == text
+
+
+def test_callback_metric_render() -> None:
+    """収集のたびに関数から取得した値を出力する。"""
+    # Inputs
+    values = [1]
+    metric = CallbackMetric(
+        "test_jobs", "テスト", "gauge", ["state"], lambda: [(("idle",), values[0])]
+    )
+    # Outputs
+    first = metric.render()
+    values[0] = 3
+    second = metric.render()
+    # Tests
+    assert first[-1] == 'test_jobs{state="idle"} 1'
+    assert second[-1] == 'test_jobs{state="idle"} 3'
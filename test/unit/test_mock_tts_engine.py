@@ -78,3 +78,30 @@ def test_synthesize_wave() -> None:
         StyleId(0),
         enable_interrogative_upspeak=True,
     )
+
+
+def test_synthesize_wave_stream() -> None:
+    """`.synthesize_wave_stream()` は無音モーラをもつアクセント句の後で分割して出力する"""
+    engine = MockTTSEngine()
+    waves = list(
+        engine.synthesize_wave_stream(
+            AudioQuery(
+                accent_phrases=_gen_accent_phrases(),
+                speedScale=1,
+                pitchScale=0,
+                intonationScale=1,
+                volumeScale=1,
+                prePhonemeLength=0.1,
+                postPhonemeLength=0.1,
+                pauseLength=None,
+                pauseLengthScale=1.0,
+                outputSamplingRate=24000,
+                outputStereo=False,
+                kana=create_kana(_gen_accent_phrases()),
+            ),
+            StyleId(0),
+            enable_interrogative_upspeak=True,
+        )
+    )
+    assert len(waves) == 2
+    assert all(len(wave) > 0 for wave in waves)
@@ -0,0 +1,102 @@
+"""`synthesis_scheduler.py` のテスト"""
+
+import asyncio
+import threading
+
+import pytest
+
+from voicevox_engine.synthesis_scheduler import (
+    SynthesisDeadlineExceededError,
+    SynthesisQueueFullError,
+    SynthesisScheduler,
+)
+
+
+def test_run_returns_result() -> None:
+    """SynthesisScheduler.run() はジョブの結果を返し、ジョブが送出した例外を再送出する。"""
+    # Inputs
+    scheduler = SynthesisScheduler(max_workers=2)
+
+    def fail() -> None:
+        raise ValueError("failed")
+
+    async def run() -> list[int]:
+        return list(await asyncio.gather(*[scheduler.run(lambda: 2) for _ in range(8)]))
+
+    # Outputs
+    results = asyncio.run(run())
+
+    # Test
+    assert results == [2] * 8
+    with pytest.raises(ValueError, match="failed"):
+        asyncio.run(scheduler.run(fail))
+    assert scheduler.num_jobs == 0
+
+
+def test_run_rejects_when_queue_is_full() -> None:
+    """SynthesisScheduler.run() は実行待ちのジョブ数が上限に達していればジョブを即座に拒否する。"""
+    # Inputs
+    scheduler = SynthesisScheduler(max_workers=1, max_queue_size=1)
+    started = threading.Event()
+    release = threading.Event()
+
+    def block() -> int:
+        started.set()
+        release.wait()
+        return 1
+
+    async def run() -> tuple[list[int], SynthesisQueueFullError]:
+        running = asyncio.ensure_future(scheduler.run(block))
+        await asyncio.to_thread(started.wait)
+        waiting = asyncio.ensure_future(scheduler.run(lambda: 2))
+        await asyncio.sleep(0)
+        try:
+            await scheduler.run(lambda: 3)
+        except SynthesisQueueFullError as e:
+            error = e
+        release.set()
+        return [await running, await waiting], error
+
+    # Outputs
+    results, error = asyncio.run(run())
+
+    # Test
+    assert results == [1, 2]
+    assert error.retry_after_sec >= 1
+    assert scheduler.num_jobs == 0
+
+
+def test_run_drops_expired_job() -> None:
+    """SynthesisScheduler.run() は実行開始前に期限を過ぎたジョブを実行せずに破棄する。"""
+    # Inputs
+    scheduler = SynthesisScheduler(max_workers=1)
+    started = threading.Event()
+    release = threading.Event()
+    called: list[bool] = []
+
+    def block() -> None:
+        started.set()
+        release.wait()
+
+    async def run() -> None:
+        running = asyncio.ensure_future(scheduler.run(block))
+        await asyncio.to_thread(started.wait)
+        try:
+            with pytest.raises(SynthesisDeadlineExceededError):
+                await scheduler.run(lambda: called.append(True), timeout_sec=0.05)
+        finally:
+            release.set()
+        await running
+
+    # Outputs
+    asyncio.run(run())
+
+    # Test
+    assert called == []
+    assert scheduler.num_jobs == 0
+
+
+def test_invalid_setting() -> None:
+    """SynthesisScheduler は不正な設定を拒否する。"""
+    with pytest.raises(ValueError, match="max_workers"):
+        SynthesisScheduler(max_workers=0)
@@ -0,0 +1,68 @@
+"""`MoraTable` のテスト"""
+
+import numpy as np
+
+from test.unit.tts_pipeline.tts_utils import gen_mora, sec
+from voicevox_engine.tts_pipeline.mora_table import MoraTable, concat_mora_tables
+
+
+def test_from_moras() -> None:
+    """`MoraTable.from_moras()` はモーラ系列を列ごとの配列へ変換する。"""
+    # Inputs
+    moras = [
+        gen_mora("　", None, None, "sil", sec(2), 0.0),
+        gen_mora("ヒ", "h", sec(2), "i", sec(4), 5.0),
+        gen_mora("、", None, None, "pau", sec(3), 0.0),
+        gen_mora("ス", "s", sec(1), "U", sec(4), 0.0),
+    ]
+    # Outputs
+    table = MoraTable.from_moras(moras)
+
+    # Test
+    assert len(table) == 4
+    assert table.consonant_ids.tolist() == [-1, 19, -1, 35]
+    assert table.vowel_ids.tolist() == [0, 21, 0, 6]
+    assert table.consonant_lengths.tolist() == [0.0, sec(2), 0.0, sec(1)]
+    assert table.vowel_lengths.tolist() == [sec(2), sec(4), sec(3), sec(4)]
+    assert table.pitches.tolist() == [0.0, 5.0, 0.0, 0.0]
+    assert table.is_pause.tolist() == [False, False, True, False]
+    assert table.is_unvoiced.tolist() == [True, False, True, True]
+
+
+def test_phoneme_ids() -> None:
+    """`MoraTable.phoneme_ids()` は子音・母音の順に並べた音素 ID 系列を返す。"""
+    # Inputs
+    moras = [
+        gen_mora("　", None, None, "sil", sec(2), 0.0),
+        gen_mora("ヒ", "h", sec(2), "i", sec(4), 5.0),
+        gen_mora("　", None, None, "sil", sec(6), 0.0),
+    ]
+    # Expects
+    #                     pau  h   i  pau
+    true_phoneme_ids = [0, 19, 21, 0]
+    # Outputs
+    phoneme_ids = MoraTable.from_moras(moras).phoneme_ids()
+
+    # Test
+    assert true_phoneme_ids == phoneme_ids.tolist()
+
+
+def test_concat_mora_tables() -> None:
+    """`concat_mora_tables()` は列指向表現をモーラ方向に連結する。"""
+    # Inputs
+    moras = [
+        gen_mora("ヒ", "h", sec(2), "i", sec(4), 5.0),
+        gen_mora("ホ", "h", sec(4), "O", sec(2), 0.0),
+        gen_mora("ン", None, None, "N", sec(4), 5.0),
+    ]
+    # Expects
+    true_table = MoraTable.from_moras(moras)
+    # Outputs
+    table = concat_mora_tables(
+        [MoraTable.from_moras(moras[:1]), MoraTable.from_moras(moras[1:])]
+    )
+
+    # Test
+    assert np.array_equal(table.consonant_ids, true_table.consonant_ids)
+    assert np.array_equal(table.vowel_lengths, true_table.vowel_lengths)
+    assert np.array_equal(table.is_unvoiced, true_table.is_unvoiced)
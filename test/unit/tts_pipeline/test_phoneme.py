@@ -13,7 +13,7 @@ def test_unknown_phoneme() -> None:
     unknown_phoneme = Phoneme("xx")
 
     # Tests
-    with pytest.raises(ValueError, match="not in tuple"):
+    with pytest.raises(ValueError, match="音素リストに存在しない音素"):
         _ = unknown_phoneme.id
 
 
@@ -0,0 +1,76 @@
+"""テキスト解析結果キャッシュのテスト"""
+
+from pathlib import Path
+
+from voicevox_engine.tts_pipeline.model import AccentPhrase
+from voicevox_engine.tts_pipeline.njd_feature_processor import (
+    text_to_full_context_labels,
+)
+from voicevox_engine.tts_pipeline.text_analysis_cache import (
+    clear_text_analysis_cache,
+    text_to_accent_phrases,
+)
+from voicevox_engine.tts_pipeline.text_analyzer import (
+    full_context_labels_to_accent_phrases,
+)
+from voicevox_engine.user_dict.user_dict_manager import UserDictionary
+from voicevox_engine.user_dict.user_dict_word import WordProperty
+
+
+def _to_kana(accent_phrases: list[AccentPhrase]) -> str:
+    return "".join(mora.text for ap in accent_phrases for mora in ap.moras)
+
+
+def test_text_to_accent_phrases() -> None:
+    """`text_to_accent_phrases()` はキャッシュの有無によらずテキスト解析と同じ結果を返す。"""
+    # Inputs
+    clear_text_analysis_cache()
+    text = "こんにちは、ヒホです"
+    # Expects
+    true_accent_phrases = full_context_labels_to_accent_phrases(
+        text_to_full_context_labels(text, enable_katakana_english=True)
+    )
+    # Outputs
+    miss = text_to_accent_phrases(text, enable_katakana_english=True)
+    hit = text_to_accent_phrases(text, enable_katakana_english=True)
+
+    # Test
+    assert true_accent_phrases == miss
+    assert true_accent_phrases == hit
+
+
+def test_text_to_accent_phrases_returns_copy() -> None:
+    """`text_to_accent_phrases()` の返り値を変更してもキャッシュは変更されない。"""
+    # Inputs
+    clear_text_analysis_cache()
+    text = "こんにちは"
+    accent_phrases = text_to_accent_phrases(text, enable_katakana_english=True)
+    # Expects
+    true_accent_phrases = text_to_accent_phrases(text, enable_katakana_english=True)
+    # Outputs
+    accent_phrases[0].moras[0].pitch = 100.0
+    accent_phrases[0].accent = 100
+    result = text_to_accent_phrases(text, enable_katakana_english=True)
+
+    # Test
+    assert true_accent_phrases == result
+
+
+def test_text_to_accent_phrases_invalidated_by_user_dict(tmp_path: Path) -> None:
+    """`text_to_accent_phrases()` はユーザー辞書の更新後に新しい辞書で解析した結果を返す。"""
+    # Inputs
+    user_dict = UserDictionary(user_dict_path=tmp_path / "user_dict.json")
+    text = "テスト用の文字列"
+    pronunciation = "デフォルトノジショデハゼッタイニセイセイサレナイヨミ"
+    before = text_to_accent_phrases(text, enable_katakana_english=True)
+    # Outputs
+    user_dict.apply_word(
+        WordProperty(
+            surface=text, pronunciation=pronunciation, accent_type=1, priority=10
+        )
+    )
+    after = text_to_accent_phrases(text, enable_katakana_english=True)
+
+    # Test
+    assert _to_kana(before) != pronunciation
+    assert _to_kana(after) == pronunciation
@@ -1,11 +1,17 @@
 """テキスト分析の単体テスト。"""
 
+import re
+
 import pytest
 
 from voicevox_engine.tts_pipeline.model import AccentPhrase, Mora
+from voicevox_engine.tts_pipeline.njd_feature_processor import (
+    text_to_full_context_labels,
+)
 from voicevox_engine.tts_pipeline.text_analyzer import (
     NonOjtPhonemeError,
     OjtUnknownPhonemeError,
+    _Label,
     full_context_labels_to_accent_phrases,
     mora_to_text,
 )
@@ -246,3 +252,110 @@ def test_full_context_labels_to_accent_phrases_unknown_phoneme(
     """`full_context_labels_to_accent_phrases()` は unknown 音素を含むフルコンテキストラベルを受け入れない。"""
     with pytest.raises(OjtUnknownPhonemeError):
         full_context_labels_to_accent_phrases(test_case_koxx)
+
+
+# NOTE: 高速化前の `_Label.from_feature()` が用いていた正規表現。新しいパーサーとの等価性検証に用いる。
+_REFERENCE_LABEL_PATTERN = re.compile(
+    r"^(?P<p1>.+?)\^(?P<p2>.+?)\-(?P<p3>.+?)\+(?P<p4>.+?)\=(?P<p5>.+?)"
+    r"/A\:(?P<a1>.+?)\+(?P<a2>.+?)\+(?P<a3>.+?)"
+    r"/B\:(?P<b1>.+?)\-(?P<b2>.+?)\_(?P<b3>.+?)"
+    r"/C\:(?P<c1>.+?)\_(?P<c2>.+?)\+(?P<c3>.+?)"
+    r"/D\:(?P<d1>.+?)\+(?P<d2>.+?)\_(?P<d3>.+?)"
+    r"/E\:(?P<e1>.+?)\_(?P<e2>.+?)\!(?P<e3>.+?)\_(?P<e4>.+?)\-(?P<e5>.+?)"
+    r"/F\:(?P<f1>.+?)\_(?P<f2>.+?)\#(?P<f3>.+?)\_(?P<f4>.+?)\@(?P<f5>.+?)\_(?P<f6>.+?)\|(?P<f7>.+?)\_(?P<f8>.+?)"
+    r"/G\:(?P<g1>.+?)\_(?P<g2>.+?)\%(?P<g3>.+?)\_(?P<g4>.+?)\_(?P<g5>.+?)"
+    r"/H\:(?P<h1>.+?)\_(?P<h2>.+?)"
+    r"/I\:(?P<i1>.+?)\-(?P<i2>.+?)\@(?P<i3>.+?)\+(?P<i4>.+?)\&(?P<i5>.+?)\-(?P<i6>.+?)\|(?P<i7>.+?)\+(?P<i8>.+?)"
+    r"/J\:(?P<j1>.+?)\_(?P<j2>.+?)"
+    r"/K\:(?P<k1>.+?)\+(?P<k2>.+?)\-(?P<k3>.+?)$"
+)
+
+
+def _reference_label_fields(
+    feature: str,
+) -> tuple[str, bool, int | None, int | None, bool, str, str]:
+    """高速化前の実装でフルコンテキストラベルから `_Label` の各属性値を抽出する。"""
+    result = _REFERENCE_LABEL_PATTERN.search(feature)
+    if result is None:
+        raise ValueError(feature)
+    contexts = result.groupdict()
+    return (
+        contexts["p3"],
+        contexts["f1"] == "xx",
+        None if contexts["a2"] == "xx" else int(contexts["a2"]),
+        None if contexts["f2"] == "xx" else int(contexts["f2"]),
+        contexts["f3"] == "1",
+        contexts["f5"],
+        contexts["i3"],
+    )
+
+
+def _label_fields(
+    label: _Label,
+) -> tuple[str, bool, int | None, int | None, bool, str, str]:
+    return (
+        label.phoneme,
+        label.is_pause,
+        label.mora_index,
+        label.accent_position,
+        label.is_interrogative,
+        label.accent_phrase_index,
+        label.breath_group_index,
+    )
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "",
+        "こんにちは、ヒホです。",
+        "これはありますか？",
+        "吾輩は猫である。名前はまだ無い。どこで生れたかとんと見当がつかぬ。",
+        "2024年12月31日、午後11時59分にVOICEVOXを起動した!?",
+        "ｔｅｓｔ　テスト、「かっこ」とABC123…ですよね？？",
+        "ア" * 60 + "、" + "ヴァヴィヴェヴォっ" * 5,
+    ],
+)
+def test_label_from_features_equivalent_to_reference(text: str) -> None:
+    """`_Label.from_features()` は高速化前の正規表現によるパースと同じ結果を返す。"""
+    # Inputs
+    features = text_to_full_context_labels(text, enable_katakana_english=True)
+    # Expects
+    true_fields = [_reference_label_fields(feature) for feature in features]
+    # Outputs
+    fields = [_label_fields(label) for label in _Label.from_features(features)]
+    single_fields = [_label_fields(_Label.from_feature(f)) for f in features]
+    # Tests
+    assert true_fields == fields
+    assert true_fields == single_fields
+
+
+def test_label_from_features_equivalent_to_reference_fixtures(
+    test_case_hello_hiho: list[str], sil_sil: list[str]
+) -> None:
+    """`_Label.from_features()` はハードコードされたラベルでも高速化前のパースと同じ結果を返す。"""
+    for features in [test_case_hello_hiho, sil_sil]:
+        true_fields = [_reference_label_fields(feature) for feature in features]
+        fields = [_label_fields(label) for label in _Label.from_features(features)]
+        assert true_fields == fields
+
+
+@pytest.mark.parametrize(
+    "feature",
+    [
+        "",
+        "xx^xx-sil+k=o",
+        "xx^xx-sil+k=o/A:xx+xx+xx/B:xx-xx_xx/C:xx_xx+xx/D:09+xx_xx/E:xx_xx!xx_xx-xx"
+        + "/F:xx_xx#xx_xx@xx_xx|xx_xx/G:5_5%0_xx_xx/H:xx_xx/I:xx-xx"
+        + "@xx+xx&xx-xx|xx+xx/J:1_5",
+        "xx^xx-+k=o/A:xx+xx+xx/B:xx-xx_xx/C:xx_xx+xx/D:09+xx_xx/E:xx_xx!xx_xx-xx"
+        + "/F:xx_xx#xx_xx@xx_xx|xx_xx/G:5_5%0_xx_xx/H:xx_xx/I:xx-xx"
+        + "@xx+xx&xx-xx|xx+xx/J:1_5/K:2+2-9",
+    ],
+)
+def test_label_from_feature_invalid(feature: str) -> None:
+    """`_Label.from_feature()` は高速化前のパースと同様に不正な形式のラベルを受け入れない。"""
+    with pytest.raises(ValueError, match=re.escape(feature)):
+        _reference_label_fields(feature)
+    with pytest.raises(ValueError, match=re.escape(feature)):
+        _Label.from_feature(feature)
@@ -4,9 +4,10 @@ from typing import Any
 from unittest.mock import MagicMock
 
 import numpy as np
+import pytest
 from syrupy.assertion import SnapshotAssertion
 
-from test.unit.tts_pipeline.tts_utils import gen_mora, sec
+from test.unit.tts_pipeline.tts_utils import gen_mora
 from test.utility import pydantic_to_native_type, round_floats, summarize_big_ndarray
 from voicevox_engine.dev.core.mock import MockCoreWrapper
 from voicevox_engine.metas.metas import StyleId
@@ -18,35 +19,18 @@ from voicevox_engine.tts_pipeline.model import (
     Note,
     Score,
 )
+from voicevox_engine.tts_pipeline.phoneme import Phoneme
 from voicevox_engine.tts_pipeline.song_engine import (
     SongEngine,
 )
 from voicevox_engine.tts_pipeline.tts_engine import (
     TTSEngine,
     _apply_interrogative_upspeak,
-    _to_flatten_phonemes,
+    _split_frames_at_pauses,
     to_flatten_moras,
 )
 
 
-def test_to_flatten_phonemes() -> None:
-    """Test `_to_flatten_phonemes()`."""
-    # Inputs
-    moras = [
-        gen_mora("　", None, None, "sil", sec(2), 0.0),
-        gen_mora("ヒ", "h", sec(2), "i", sec(4), 5.0),
-        gen_mora("　", None, None, "sil", sec(6), 0.0),
-    ]
-    # Expects
-    true_phoneme_strs = ["pau", "h", "i", "pau"]
-    # Outputs
-    phonemes = _to_flatten_phonemes(moras)
-    phoneme_strs = list(map(lambda p: p._phoneme, phonemes))
-
-    # Test
-    assert true_phoneme_strs == phoneme_strs
-
-
 def _gen_hello_hiho_accent_phrases() -> list[AccentPhrase]:
     return [
         AccentPhrase(
@@ -672,3 +656,55 @@ def test_upspeak_voiced_u_last_mora() -> None:
     outputs = _apply_interrogative_upspeak(inputs, False)
     # Test
     _assert_equeal_accent_phrases(expected, outputs)
+
+
+def test_split_frames_at_pauses() -> None:
+    """`_split_frames_at_pauses()` は文中の無音区間の中央で分割し、前後無音では分割しない。"""
+    # Inputs
+    pau, a = Phoneme("pau").onehot, Phoneme("a").onehot
+    phoneme = np.stack([pau] * 3 + [a] * 4 + [pau] * 4 + [a] * 2 + [pau] * 2)
+    # Expects
+    true_spans = [(0, 9), (9, 15)]
+    # Outputs
+    spans = _split_frames_at_pauses(phoneme)
+
+    # Test
+    assert true_spans == spans
+
+
+def test_mocked_synthesize_wave_stream_output() -> None:
+    """モックされた `TTSEngine.synthesize_wave_stream()` の出力を結合すると `TTSEngine.synthesize_wave()` の出力と一致する"""
+    # Inputs
+    tts_engine = TTSEngine(MockCoreWrapper())
+    hello_hiho = _gen_hello_hiho_query()
+    hello_hiho.outputStereo = False
+    # Expects
+    true_wave = tts_engine.synthesize_wave(
+        hello_hiho, StyleId(1), enable_interrogative_upspeak=True
+    )
+    # Outputs
+    waves = list(
+        tts_engine.synthesize_wave_stream(
+            hello_hiho, StyleId(1), enable_interrogative_upspeak=True
+        )
+    )
+    wave = np.concatenate(waves)
+
+    # Test
+    assert len(waves) == 2
+    assert true_wave.shape == wave.shape
+    assert np.allclose(true_wave, wave, atol=1e-5)
+
+
+def test_synthesize_wave_stream_validates_query_eagerly() -> None:
+    """`TTSEngine.synthesize_wave_stream()` は出力を取り出す前の呼び出し時点で不正なクエリを拒否する"""
+    # Inputs
+    tts_engine = TTSEngine(MockCoreWrapper())
+    hello_hiho = _gen_hello_hiho_query()
+    hello_hiho.accent_phrases[0].moras[0].vowel = "xx"
+
+    # Test
+    with pytest.raises(ValueError, match="音素リストに存在しない音素"):
+        tts_engine.synthesize_wave_stream(
+            hello_hiho, StyleId(1), enable_interrogative_upspeak=True
+        )
@@ -0,0 +1,113 @@
+"""スタイルのウォームアップのテスト"""
+
+import numpy as np
+import pytest
+from numpy.typing import NDArray
+
+from voicevox_engine.core.core_adapter import CoreAdapter
+from voicevox_engine.core.model_residency import ModelResidencyPolicy
+from voicevox_engine.dev.core.mock import MockCoreWrapper
+from voicevox_engine.dev.tts_engine.mock import MockTTSEngine
+from voicevox_engine.metas.metas import StyleId
+from voicevox_engine.model import AudioQuery
+from voicevox_engine.tts_pipeline.warmup import StyleWarmer, parse_warmup_plan
+
+
+class _SpyTTSEngine(MockTTSEngine):
+    """初期化と音声合成の対象スタイルを記録するエンジン"""
+
+    def __init__(
+        self, model_residency_policy: ModelResidencyPolicy | None = None
+    ) -> None:
+        super().__init__(model_residency_policy)
+        self.initialized: list[StyleId] = []
+        self.synthesized: list[StyleId] = []
+
+    def initialize_synthesis(self, style_id: StyleId, skip_reinit: bool) -> None:
+        if style_id < 0:
+            raise ValueError("存在しないスタイルです")
+        self.initialized.append(style_id)
+
+    def synthesize_wave(
+        self,
+        query: AudioQuery,
+        style_id: StyleId,
+        enable_interrogative_upspeak: bool,
+    ) -> NDArray[np.float32]:
+        self.synthesized.append(style_id)
+        return np.zeros(1, dtype=np.float32)
+
+
+def test_parse_warmup_plan() -> None:
+    assert parse_warmup_plan("all") == "all"
+    assert parse_warmup_plan("0, 2,") == [StyleId(0), StyleId(2)]
+    with pytest.raises(ValueError, match="不正"):
+        parse_warmup_plan("zundamon")
+
+
+def test_style_warmer_all() -> None:
+    """全てのスタイルを読み込み、喋れるスタイルだけを試し合成する。"""
+    # Inputs
+    engine = _SpyTTSEngine()
+    characters = CoreAdapter(MockCoreWrapper()).characters
+    warmer = StyleWarmer(engine, characters, "all", max_workers=2)
+
+    # Outputs
+    warmer.run()
+    progress = warmer.progress()
+
+    # Expects
+    all_style_ids = [StyleId(style.id) for c in characters for style in c.styles]
+    talk_style_ids = [
+        StyleId(style.id)
+        for c in characters
+        for style in c.styles
+        if style.type == "talk"
+    ]
+
+    # Tests
+    assert sorted(engine.initialized) == sorted(all_style_ids)
+    assert sorted(engine.synthesized) == sorted(talk_style_ids)
+    assert progress.done
+    assert progress.completed == progress.total == len(all_style_ids)
+
+
+def test_style_warmer_failed_style() -> None:
+    """読み込みに失敗したスタイルを記録し、残りのスタイルのウォームアップを続ける。"""
+    # Inputs
+    engine = _SpyTTSEngine()
+    characters = CoreAdapter(MockCoreWrapper()).characters
+    warmer = StyleWarmer(engine, characters, [StyleId(-1), StyleId(0)])
+
+    # Outputs
+    progress_before = warmer.progress()
+    warmer.run()
+    progress = warmer.progress()
+
+    # Tests
+    assert not progress_before.done
+    assert progress.done
+    assert progress.completed == 1
+    assert progress.failed_style_ids == [StyleId(-1)]
+
+
+def test_style_warmer_caps_plan_at_residency_capacity() -> None:
+    """モデルの常駐数に上限がある場合、警告を出してウォームアップ対象を上限までのスタイルに絞る。"""
+    # Inputs
+    policy = ModelResidencyPolicy(memory_budget_bytes=2, bytes_per_style=1)
+    engine = _SpyTTSEngine(policy)
+    characters = CoreAdapter(MockCoreWrapper()).characters
+    with pytest.warns(UserWarning, match="常駐数の上限"):
+        warmer = StyleWarmer(engine, characters, "all")
+
+    # Outputs
+    warmer.run()
+    progress = warmer.progress()
+
+    # Expects
+    all_style_ids = [StyleId(style.id) for c in characters for style in c.styles]
+
+    # Tests
+    assert engine.initialized == all_style_ids[:2]
+    assert progress.done
+    assert progress.completed == progress.total == 2
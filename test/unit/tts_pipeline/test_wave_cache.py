@@ -0,0 +1,94 @@
+"""合成済み音声キャッシュのテスト"""
+
+from pathlib import Path
+
+from test.unit.tts_pipeline.tts_utils import gen_mora
+from voicevox_engine.metas.metas import StyleId
+from voicevox_engine.model import AudioQuery
+from voicevox_engine.tts_pipeline.model import AccentPhrase
+from voicevox_engine.tts_pipeline.wave_cache import WaveCache, make_wave_cache_key
+
+
+def _gen_query(kana: str | None = None) -> AudioQuery:
+    return AudioQuery(
+        accent_phrases=[
+            AccentPhrase(
+                moras=[
+                    gen_mora("ハ", "h", 0.1, "a", 0.1, 5.0),
+                    gen_mora("イ", None, None, "i", 0.1, 5.0),
+                ],
+                accent=1,
+                pause_mora=None,
+                is_interrogative=True,
+            )
+        ],
+        speedScale=1.0,
+        pitchScale=0.0,
+        intonationScale=1.0,
+        volumeScale=1.0,
+        prePhonemeLength=0.1,
+        postPhonemeLength=0.1,
+        pauseLength=None,
+        pauseLengthScale=1.0,
+        outputSamplingRate=24000,
+        outputStereo=False,
+        kana=kana,
+    )
+
+
+def test_make_wave_cache_key() -> None:
+    """`make_wave_cache_key()` は音声に影響する入力のみでキーを区別する。"""
+    # Inputs
+    query = _gen_query()
+    # Outputs
+    key = make_wave_cache_key(query, StyleId(1), True, "0.0.1")
+
+    # Test
+    # 読み仮名は合成に影響しない
+    assert key == make_wave_cache_key(_gen_query("ハ'イ？"), StyleId(1), True, "0.0.1")
+    assert key != make_wave_cache_key(query, StyleId(2), True, "0.0.1")
+    assert key != make_wave_cache_key(query, StyleId(1), False, "0.0.1")
+    assert key != make_wave_cache_key(query, StyleId(1), True, "0.0.2")
+    # キー生成は元のクエリを変更しない
+    assert query == _gen_query()
+
+
+def test_wave_cache_lru_eviction() -> None:
+    """`WaveCache` は容量上限を超えると最も古く使われたエントリを追い出す。"""
+    # Inputs
+    wave_cache = WaveCache(max_bytes=10)
+    wave_cache.put("a", b"aaaa")
+    wave_cache.put("b", b"bbbb")
+    wave_cache.get("a")
+    wave_cache.put("c", b"cccc")
+    # Outputs
+    a, b, c = wave_cache.get("a"), wave_cache.get("b"), wave_cache.get("c")
+    stats = wave_cache.stats()
+
+    # Test
+    assert (a, b, c) == (b"aaaa", None, b"cccc")
+    assert stats.hits == 3
+    assert stats.misses == 1
+    assert stats.evictions == 1
+    assert stats.memory_entries == 2
+    assert stats.memory_bytes == 8
+
+
+def test_wave_cache_disk_tier(tmp_path: Path) -> None:
+    """`WaveCache` のディスク層は別インスタンスからも利用でき、容量上限を超えると古い順に削除される。"""
+    # Inputs
+    wave_cache = WaveCache(max_bytes=0, disk_dir=tmp_path, max_disk_bytes=10)
+    wave_cache.put("a", b"aaaa")
+    wave_cache.put("b", b"bbbb")
+    wave_cache.put("c", b"cccc")
+    # Outputs
+    restarted_cache = WaveCache(max_bytes=0, disk_dir=tmp_path, max_disk_bytes=10)
+    a, c = restarted_cache.get("a"), restarted_cache.get("c")
+    stats = restarted_cache.stats()
+
+    # Test
+    assert (a, c) == (None, b"cccc")
+    assert wave_cache.stats().disk_evictions == 1
+    assert stats.disk_hits == 1
+    assert stats.disk_entries == 2
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["b.wav", "c.wav"]
@@ -1,6 +1,10 @@
 """波形合成のテスト"""
 
+import itertools
+from dataclasses import fields
+
 import numpy as np
+from numpy.typing import NDArray
 
 from test.unit.tts_pipeline.tts_utils import gen_mora, sec
 from voicevox_engine.model import AudioQuery
@@ -10,7 +14,9 @@ from voicevox_engine.tts_pipeline.audio_postprocessing import (
     _apply_volume_scale,
     raw_wave_to_output_wave,
 )
-from voicevox_engine.tts_pipeline.model import AccentPhrase
+from voicevox_engine.tts_pipeline.model import AccentPhrase, Mora
+from voicevox_engine.tts_pipeline.mora_table import MoraTable
+from voicevox_engine.tts_pipeline.phoneme import Phoneme
 from voicevox_engine.tts_pipeline.tts_engine import (
     _apply_intonation_scale,
     _apply_pitch_scale,
@@ -18,6 +24,8 @@ from voicevox_engine.tts_pipeline.tts_engine import (
     _apply_speed_scale,
     _count_frame_per_unit,
     _query_to_decoder_feature,
+    prepare_synthesis_query,
+    to_flatten_moras,
 )
 
 TRUE_NUM_PHONEME = 45
@@ -53,6 +61,13 @@ def _gen_query(
     )
 
 
+def _assert_mora_table_equal(table: MoraTable, true_table: MoraTable) -> None:
+    for field in fields(MoraTable):
+        assert np.array_equal(
+            getattr(table, field.name), getattr(true_table, field.name)
+        ), field.name
+
+
 def test_apply_prepost_silence() -> None:
     """Test `_apply_prepost_silence()`."""
     # Inputs
@@ -67,10 +82,12 @@ def test_apply_prepost_silence() -> None:
         gen_mora("　", None, None, "sil", sec(6), 0.0),
     ]
     # Outputs
-    moras_with_silence = _apply_prepost_silence(moras, query)
+    moras_with_silence = _apply_prepost_silence(MoraTable.from_moras(moras), query)
 
     # Test
-    assert moras_with_silence == true_moras_with_silence
+    _assert_mora_table_equal(
+        moras_with_silence, MoraTable.from_moras(true_moras_with_silence)
+    )
 
 
 def test_apply_speed_scale() -> None:
@@ -93,10 +110,10 @@ def test_apply_speed_scale() -> None:
         gen_mora("ホ", "h", sec(2), "O", sec(1), 0.0),
     ]
     # Outputs
-    moras = _apply_speed_scale(input_moras, query)
+    moras = _apply_speed_scale(MoraTable.from_moras(input_moras), query)
 
     # Test
-    assert moras == true_moras
+    _assert_mora_table_equal(moras, MoraTable.from_moras(true_moras))
 
 
 def test_apply_pitch_scale() -> None:
@@ -119,10 +136,10 @@ def test_apply_pitch_scale() -> None:
         gen_mora("ホ", "h", 0.0, "O", 0.0, 0.0),
     ]
     # Outputs
-    moras = _apply_pitch_scale(input_moras, query)
+    moras = _apply_pitch_scale(MoraTable.from_moras(input_moras), query)
 
     # Test
-    assert moras == true_moras
+    _assert_mora_table_equal(moras, MoraTable.from_moras(true_moras))
 
 
 def test_apply_intonation_scale() -> None:
@@ -145,10 +162,10 @@ def test_apply_intonation_scale() -> None:
         gen_mora("ホ", "h", 0.0, "O", 0.0, 0.0),
     ]
     # Outputs
-    moras = _apply_intonation_scale(input_moras, query)
+    moras = _apply_intonation_scale(MoraTable.from_moras(input_moras), query)
 
     # Test
-    assert moras == true_moras
+    _assert_mora_table_equal(moras, MoraTable.from_moras(true_moras))
 
 
 def test_apply_volume_scale() -> None:
@@ -199,13 +216,13 @@ def test_count_frame_per_unit() -> None:
     """Test `_count_frame_per_unit()`."""
     # Inputs
     moras = [
-        gen_mora("　", None, None, "　", sec(2), 0.0),
+        gen_mora("　", None, None, "sil", sec(2), 0.0),
         gen_mora("コ", "k", sec(2), "o", sec(4), 0.0),
         gen_mora("ン", None, None, "N", sec(4), 0.0),
         gen_mora("、", None, None, "pau", sec(2), 0.0),
         gen_mora("ヒ", "h", sec(2), "i", sec(4), 0.0),
         gen_mora("ホ", "h", sec(4), "O", sec(2), 0.0),
-        gen_mora("　", None, None, "　", sec(6), 0.0),
+        gen_mora("　", None, None, "sil", sec(6), 0.0),
     ]
 
     # Expects
@@ -217,7 +234,9 @@ def test_count_frame_per_unit() -> None:
     true_frame_per_mora = np.array(true_frame_per_mora_list, dtype=np.int32)
 
     # Outputs
-    frame_per_phoneme, frame_per_mora = _count_frame_per_unit(moras)
+    frame_per_phoneme, frame_per_mora = _count_frame_per_unit(
+        MoraTable.from_moras(moras)
+    )
 
     # Test
     assert np.array_equal(frame_per_phoneme, true_frame_per_phoneme)
@@ -279,13 +298,125 @@ def test_query_to_decoder_feature() -> None:
     true_f0 = np.array(true1_f0 + true2_f0 + true3_f0, dtype=np.float32)
 
     # Outputs
-    phoneme, f0 = _query_to_decoder_feature(query)
+    phoneme, f0 = _query_to_decoder_feature(query, False)
 
     # Test
     assert np.array_equal(phoneme, true_phoneme)
     assert np.array_equal(f0, true_f0)
 
 
+def _reference_query_to_decoder_feature(
+    query: AudioQuery, enable_interrogative_upspeak: bool
+) -> tuple[NDArray[np.float32], NDArray[np.float32]]:
+    """pydantic のモーラ系列を逐次更新する（ベクトル化前の）デコーダー入力特徴量の生成。"""
+    query = prepare_synthesis_query(query, enable_interrogative_upspeak)
+    moras = to_flatten_moras(query.accent_phrases)
+    moras = (
+        [gen_mora("　", None, None, "sil", query.prePhonemeLength, 0.0)]
+        + moras
+        + [gen_mora("　", None, None, "sil", query.postPhonemeLength, 0.0)]
+    )
+    for mora in moras:
+        if mora.vowel == "pau":
+            if query.pauseLength is not None:
+                mora.vowel_length = query.pauseLength
+            mora.vowel_length *= query.pauseLengthScale
+    for mora in moras:
+        mora.vowel_length /= query.speedScale
+        if mora.consonant_length:
+            mora.consonant_length /= query.speedScale
+        mora.pitch *= 2**query.pitchScale
+    voiced = [mora for mora in moras if mora.pitch > 0]
+    mean_f0 = np.mean([mora.pitch for mora in voiced]).item()
+    for mora in voiced:
+        mora.pitch = (mora.pitch - mean_f0) * query.intonationScale + mean_f0
+
+    def to_frame(sec: float) -> int:
+        return int(np.round(sec * 93.75).astype(np.int32))
+
+    onehots: list[NDArray[np.float32]] = []
+    frame_per_phoneme: list[int] = []
+    frame_per_mora: list[int] = []
+    for mora in moras:
+        vowel_frames = to_frame(mora.vowel_length)
+        consonant_frames = (
+            to_frame(mora.consonant_length) if mora.consonant_length is not None else 0
+        )
+        if mora.consonant:
+            onehots += [Phoneme(mora.consonant).onehot]
+            frame_per_phoneme += [consonant_frames]
+        onehots += [Phoneme(mora.vowel).onehot]
+        frame_per_phoneme += [vowel_frames]
+        frame_per_mora += [vowel_frames + consonant_frames]
+
+    phoneme = np.repeat(np.stack(onehots), frame_per_phoneme, axis=0)
+    f0 = np.repeat(np.array([m.pitch for m in moras], dtype=np.float32), frame_per_mora)
+    return phoneme, f0
+
+
+def _gen_random_moras(rng: np.random.Generator, n_mora: int) -> list[Mora]:
+    """ランダムな音素・長さ・音高をもつモーラ系列を生成する。"""
+    consonants = [None, "k", "sh", "ts", "ny", "b", "v"]
+    vowels = ["a", "i", "u", "e", "o", "N", "cl", "A", "I", "U"]
+    moras: list[Mora] = []
+    for _ in range(n_mora):
+        consonant = consonants[rng.integers(len(consonants))]
+        # 偶数丸めの境界 (x.5 フレーム) を含む長さ
+        consonant_length = rng.integers(0, 20) / 2 / 93.75 if consonant else None
+        vowel = vowels[rng.integers(len(vowels))]
+        vowel_length = float(
+            rng.choice([rng.random() * 0.3, rng.integers(0, 40) / 2 / 93.75])
+        )
+        pitch = 0.0 if vowel in ["A", "I", "U", "cl"] else float(rng.random() * 6.0)
+        moras += [
+            gen_mora("ア", consonant, consonant_length, vowel, vowel_length, pitch)
+        ]
+    return moras
+
+
+def test_query_to_decoder_feature_equivalent_to_reference() -> None:
+    """`_query_to_decoder_feature()` はモーラ単位ループによる実装とビット単位で一致する。"""
+    rng = np.random.default_rng(0)
+    for n_mora, upspeak in itertools.product([0, 1, 5, 30, 300], [False, True]):
+        accent_phrases = [
+            AccentPhrase(
+                moras=[gen_mora("ア", None, None, "a", 0.1, 5.0)]
+                + _gen_random_moras(rng, n_mora),
+                accent=1,
+                pause_mora=gen_mora("、", None, None, "pau", float(rng.random()), 0.0),
+            ),
+            AccentPhrase(
+                moras=_gen_random_moras(rng, n_mora // 2 + 1),
+                accent=1,
+                pause_mora=None,
+                is_interrogative=True,
+            ),
+        ]
+        query = _gen_query(
+            accent_phrases=accent_phrases,
+            speedScale=float(rng.uniform(0.5, 2.0)),
+            pitchScale=float(rng.uniform(-0.15, 0.15)),
+            intonationScale=float(rng.uniform(0.0, 2.0)),
+            prePhonemeLength=float(rng.random()),
+            postPhonemeLength=float(rng.random()),
+            pauseLength=float(rng.random()) if rng.random() < 0.5 else None,
+            pauseLengthScale=float(rng.uniform(0.0, 2.0)),
+        )
+        original_query = query.model_copy(deep=True)
+
+        # Expects
+        true_phoneme, true_f0 = _reference_query_to_decoder_feature(query, upspeak)
+        # Outputs
+        phoneme, f0 = _query_to_decoder_feature(query, upspeak)
+
+        # Test
+        assert phoneme.dtype == true_phoneme.dtype
+        assert f0.dtype == true_f0.dtype
+        assert np.array_equal(phoneme, true_phoneme)
+        assert np.array_equal(f0, true_f0)
+        assert query == original_query
+
+
 def test_raw_wave_to_output_wave_with_resample() -> None:
     """Test `raw_wave_to_output_wave` with resampling option."""
     # Inputs
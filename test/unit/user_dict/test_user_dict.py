@@ -4,17 +4,22 @@ import json
 from copy import deepcopy
 from pathlib import Path
 
+import pyopenjtalk
 import pytest
 from pyopenjtalk import g2p, unset_user_dict
 
 from voicevox_engine.user_dict.model import (
     USER_DICT_MAX_PRIORITY,
     UserDictWord,
+    UserDictWordOperations,
+    UserDictWordProperty,
+    UserDictWordRewrite,
     WordTypes,
 )
 from voicevox_engine.user_dict.user_dict_manager import UserDictionary
 from voicevox_engine.user_dict.user_dict_word import (
     UserDictInputError,
+    UserDictWordOperationsError,
     WordProperty,
     create_word,
     part_of_speech_data,
@@ -298,3 +303,95 @@ def test_update_dict(tmp_path: Path) -> None:
     user_dict.update_dict()
 
     assert g2p(text=test_text, kana=True) == success_pronunciation
+
+
+def test_apply_word_operations(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """一括操作は全ての操作を反映し、辞書のコンパイルを一度だけ行う。"""
+    user_dict_path = tmp_path / "user_dict.json"
+    user_dict_path.write_text(json.dumps(valid_dict_dict_json), encoding="utf-8")
+    user_dict = UserDictionary(user_dict_path=user_dict_path)
+    num_compiles = 0
+    original_mecab_dict_index = pyopenjtalk.mecab_dict_index
+
+    def mecab_dict_index(path: str, out_path: str) -> None:
+        nonlocal num_compiles
+        num_compiles += 1
+        original_mecab_dict_index(path, out_path)
+
+    monkeypatch.setattr(pyopenjtalk, "mecab_dict_index", mecab_dict_index)
+
+    result = user_dict.apply_word_operations(
+        UserDictWordOperations(
+            add=[
+                UserDictWordProperty(
+                    surface=f"test{i}", pronunciation="テスト", accent_type=1
+                )
+                for i in range(3)
+            ],
+            delete=["aab7dda2-0d97-43c8-8cb7-3f440dab9b4e"],
+        )
+    )
+
+    assert num_compiles == 1
+    assert result.deleted == ["aab7dda2-0d97-43c8-8cb7-3f440dab9b4e"]
+    assert list(user_dict.read_dict()) == result.added
+
+
+def test_apply_word_operations_with_invalid_operation(tmp_path: Path) -> None:
+    """受け入れられない操作を含む一括操作は何も変更しない。"""
+    user_dict_path = tmp_path / "user_dict.json"
+    user_dict_path.write_text(json.dumps(valid_dict_dict_json), encoding="utf-8")
+    user_dict = UserDictionary(user_dict_path=user_dict_path)
+    true_user_dict = user_dict.read_dict()
+
+    with pytest.raises(UserDictWordOperationsError) as e:
+        user_dict.apply_word_operations(
+            UserDictWordOperations(
+                add=[
+                    UserDictWordProperty(
+                        surface="test", pronunciation="テスト", accent_type=1
+                    ),
+                    UserDictWordProperty(
+                        surface="test", pronunciation="テスト", accent_type=10
+                    ),
+                ],
+                delete=["aab7dda2-0d97-43c8-8cb7-3f440dab9b4e"],
+            )
+        )
+
+    assert [(error.operation, error.index) for error in e.value.errors] == [("add", 1)]
+    assert user_dict.read_dict() == true_user_dict
+
+
+def test_apply_word_operations_with_duplicate_rewrite(tmp_path: Path) -> None:
+    """同じ言葉を重複して上書き更新する一括操作は拒否する。"""
+    user_dict_path = tmp_path / "user_dict.json"
+    user_dict_path.write_text(json.dumps(valid_dict_dict_json), encoding="utf-8")
+    user_dict = UserDictionary(user_dict_path=user_dict_path)
+    true_user_dict = user_dict.read_dict()
+    word_uuid = "aab7dda2-0d97-43c8-8cb7-3f440dab9b4e"
+
+    with pytest.raises(UserDictWordOperationsError) as e:
+        user_dict.apply_word_operations(
+            UserDictWordOperations(
+                rewrite=[
+                    UserDictWordRewrite(
+                        word_uuid=word_uuid,
+                        surface="test",
+                        pronunciation="テスト",
+                        accent_type=1,
+                    ),
+                    UserDictWordRewrite(
+                        word_uuid=word_uuid,
+                        surface="test",
+                        pronunciation="テスト",
+                        accent_type=2,
+                    ),
+                ],
+            )
+        )
+
+    assert [(error.operation, error.index) for error in e.value.errors] == [
+        ("rewrite", 1)
+    ]
+    assert user_dict.read_dict() == true_user_dict
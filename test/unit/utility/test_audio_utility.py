@@ -0,0 +1,67 @@
+"""音声データのエンコード用ユーティリティのテスト"""
+
+import io
+
+import numpy as np
+import pytest
+import soundfile
+from numpy.typing import NDArray
+
+from voicevox_engine.utility.audio_utility import (
+    generate_streaming_wav_header,
+    wav_size,
+    wave_to_pcm16_bytes,
+    wave_to_wav_bytes,
+    write_wav,
+)
+
+
+def _gen_wave(shape: tuple[int, ...], dtype: type[np.floating]) -> NDArray[np.floating]:
+    """範囲外の値を含む音声波形を生成する。"""
+    rng = np.random.default_rng(0)
+    return rng.uniform(-1.5, 1.5, shape).astype(dtype)
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+@pytest.mark.parametrize("shape", [(0,), (1000,), (1000, 2)])
+def test_wave_to_wav_bytes(shape: tuple[int, ...], dtype: type[np.floating]) -> None:
+    """`wave_to_wav_bytes()` は soundfile による WAV 出力と同一のバイト列を生成する。"""
+    # Inputs
+    wave = _gen_wave(shape, dtype)
+    # Expects
+    buffer = io.BytesIO()
+    soundfile.write(file=buffer, data=wave, samplerate=24000, format="WAV")
+    true_wav = buffer.getvalue()
+    # Outputs
+    wav = wave_to_wav_bytes(wave, 24000)
+
+    assert wav == true_wav
+
+
+@pytest.mark.parametrize("shape", [(1000,), (1000, 2)])
+def test_wave_to_pcm16_bytes(shape: tuple[int, ...]) -> None:
+    """`wave_to_pcm16_bytes()` は WAV 出力からヘッダーを除いたバイト列を生成する。"""
+    # Inputs
+    wave = _gen_wave(shape, np.float32)
+    # Outputs
+    pcm = wave_to_pcm16_bytes(wave)
+    wav = wave_to_wav_bytes(wave, 24000)
+    header = generate_streaming_wav_header(24000, 1 if wave.ndim == 1 else 2)
+
+    assert wav[len(header) :] == pcm
+    # データ長以外のヘッダーは一致する
+    assert wav[8:40] == header[8:40]
+
+
+def test_write_wav() -> None:
+    """`write_wav()` はバッファの先頭へ `wave_to_wav_bytes()` と同一のバイト列を書き込む。"""
+    # Inputs
+    wave = _gen_wave((1000, 2), np.float32)
+    buffer = bytearray(b"\xff" * (wav_size(wave) + 10))
+    # Outputs
+    size = write_wav(wave, 24000, memoryview(buffer))
+
+    assert size == wav_size(wave)
+    assert bytes(buffer[:size]) == wave_to_wav_bytes(wave, 24000)
+    # 書き込んだ範囲の外は変更しない
+    assert buffer[size:] == b"\xff" * 10
@@ -7,7 +7,10 @@ from fastapi import FastAPI
 from voicevox_engine import __version__
 from voicevox_engine.app.dependencies import generate_mutability_allowed_verifier
 from voicevox_engine.app.global_exceptions import configure_global_exception_handlers
-from voicevox_engine.app.middlewares import configure_middlewares
+from voicevox_engine.app.middlewares import (
+    configure_metrics_middleware,
+    configure_middlewares,
+)
 from voicevox_engine.app.openapi_schema import (
     configure_openapi_schema,
     simplify_operation_ids,
@@ -15,6 +18,7 @@ from voicevox_engine.app.openapi_schema import (
 from voicevox_engine.app.routers.character import generate_character_router
 from voicevox_engine.app.routers.engine_info import generate_engine_info_router
 from voicevox_engine.app.routers.library import generate_library_router
+from voicevox_engine.app.routers.metrics import generate_metrics_router
 from voicevox_engine.app.routers.morphing import generate_morphing_router
 from voicevox_engine.app.routers.portal_page import generate_portal_page_router
 from voicevox_engine.app.routers.preset import generate_preset_router
@@ -27,14 +31,18 @@ from voicevox_engine.core.core_initializer import CoreManager
 from voicevox_engine.engine_manifest import EngineManifest
 from voicevox_engine.library.library_manager import LibraryManager
 from voicevox_engine.metas.metas_store import MetasStore
+from voicevox_engine.metrics import STAGE_DURATION, MetricsRegistry
 from voicevox_engine.preset.preset_manager import PresetManager
-from voicevox_engine.resource_manager import ResourceManager
+from voicevox_engine.resource_manager import ResourceFileCache, ResourceManager
 from voicevox_engine.setting.model import CorsPolicyMode
 from voicevox_engine.setting.setting_manager import SettingHandler
+from voicevox_engine.synthesis_scheduler import SynthesisScheduler
 from voicevox_engine.tts_pipeline.song_engine import SongEngineManager
 from voicevox_engine.tts_pipeline.tts_engine import TTSEngineManager
+from voicevox_engine.tts_pipeline.warmup import StyleWarmer
+from voicevox_engine.tts_pipeline.wave_cache import WaveCache
 from voicevox_engine.user_dict.user_dict_manager import UserDictionary
-from voicevox_engine.utility.path_utility import engine_root
+from voicevox_engine.utility.path_utility import engine_root, get_save_dir
 from voicevox_engine.utility.runtime_utility import is_development
 
 
@@ -52,6 +60,13 @@ def generate_app(
     cors_policy_mode: CorsPolicyMode = CorsPolicyMode.localapps,
     allow_origin: list[str] | None = None,
     disable_mutable_api: bool = False,
+    wave_cache: WaveCache | None = None,
+    synthesis_scheduler: SynthesisScheduler | None = None,
+    output_file_threshold_bytes: int | None = None,
+    resource_cache_max_bytes: int = 0,
+    style_warmer: StyleWarmer | None = None,
+    enable_server_timing: bool = False,
+    slow_request_threshold_sec: float | None = None,
 ) -> FastAPI:
     """ASGI 'application' 仕様に準拠した VOICEVOX ENGINE アプリケーションインスタンスを生成する。"""
     if character_info_dir is None:
@@ -68,10 +83,22 @@ def generate_app(
         separate_input_output_schemas=False,  # Pydantic V1 のときのスキーマに合わせるため
     )
     app = configure_middlewares(app, cors_policy_mode, allow_origin)
+    metrics_registry = MetricsRegistry()
+    metrics_registry.register(STAGE_DURATION)
+    app = configure_metrics_middleware(
+        app, metrics_registry, enable_server_timing, slow_request_threshold_sec
+    )
     app = configure_global_exception_handlers(app)
 
-    resource_manager = ResourceManager(is_development())
+    resource_manager = ResourceManager(
+        is_development(), hash_index_dir=get_save_dir() / "resource_hash_index"
+    )
     resource_manager.register_dir(character_info_dir)
+    resource_file_cache = (
+        ResourceFileCache(resource_cache_max_bytes)
+        if resource_cache_max_bytes > 0
+        else None
+    )
 
     core_version_list = core_manager.versions()
 
@@ -85,28 +112,49 @@ def generate_app(
         _get_core_characters,
         resource_manager,
     )
+    # 音声ライブラリの変更でキャラクターが増減しうるため、キャッシュを破棄する
+    library_manager.add_change_listener(metas_store.invalidate_cache)
 
     app.include_router(
         generate_tts_pipeline_router(
-            tts_engines, song_engines, preset_manager, cancellable_engine
+            tts_engines,
+            song_engines,
+            preset_manager,
+            cancellable_engine,
+            wave_cache,
+            synthesis_scheduler,
+            output_file_threshold_bytes,
+        )
+    )
+    app.include_router(
+        generate_morphing_router(
+            tts_engines, metas_store, output_file_threshold_bytes, cancellable_engine
         )
     )
-    app.include_router(generate_morphing_router(tts_engines, metas_store))
     app.include_router(
         generate_preset_router(preset_manager, verify_mutability_allowed)
     )
-    app.include_router(generate_character_router(resource_manager, metas_store))
+    app.include_router(
+        generate_character_router(resource_manager, metas_store, resource_file_cache)
+    )
     if engine_manifest.supported_features.manage_library:
         app.include_router(
             generate_library_router(library_manager, verify_mutability_allowed)
         )
     app.include_router(generate_user_dict_router(user_dict, verify_mutability_allowed))
-    app.include_router(generate_engine_info_router(core_version_list, engine_manifest))
+    app.include_router(
+        generate_engine_info_router(core_version_list, engine_manifest, style_warmer)
+    )
     app.include_router(
         generate_setting_router(
             setting_loader, engine_manifest.brand_name, verify_mutability_allowed
         )
     )
+    app.include_router(
+        generate_metrics_router(
+            metrics_registry, tts_engines, synthesis_scheduler, cancellable_engine
+        )
+    )
     app.include_router(generate_portal_page_router(engine_manifest.name))
 
     app = simplify_operation_ids(app)
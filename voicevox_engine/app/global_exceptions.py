@@ -1,9 +1,20 @@
 """グローバルな例外ハンドラの定義と登録"""
 
-from fastapi import FastAPI, Request
+from traceback import print_exception
+
+from fastapi import FastAPI, Request, Response
 from fastapi.responses import JSONResponse
 
+from voicevox_engine.cancellable_engine import (
+    CancellableEngineBusyError,
+    CancellableEngineCancelledError,
+    CancellableEngineInternalError,
+)
 from voicevox_engine.core.core_initializer import CoreNotFound
+from voicevox_engine.synthesis_scheduler import (
+    SynthesisCancelledError,
+    SynthesisSchedulerError,
+)
 from voicevox_engine.tts_pipeline.tts_engine import (
     MockTTSEngineNotFound,
     TTSEngineNotFound,
@@ -34,4 +45,52 @@ def configure_global_exception_handlers(app: FastAPI) -> FastAPI:
         msg = "モックが見つかりません。エンジンの起動引数 `--enable_mock` を確認してください。"
         return JSONResponse(status_code=422, content={"message": msg})
 
+    # 過負荷により音声合成ジョブを受け付けられなかったエラー
+    @app.exception_handler(SynthesisSchedulerError)
+    async def synthesis_scheduler_exception_handler(
+        request: Request, e: SynthesisSchedulerError
+    ) -> JSONResponse:
+        return JSONResponse(
+            status_code=503,
+            content={"message": str(e)},
+            headers={"Retry-After": str(e.retry_after_sec)},
+        )
+
+    # 要求元の切断により音声合成ジョブを中断したエラー
+    @app.exception_handler(SynthesisCancelledError)
+    async def synthesis_cancelled_exception_handler(
+        request: Request, e: SynthesisCancelledError
+    ) -> Response:
+        # NOTE: 要求元は切断済みで応答は届かないため、ログ上で区別できる 499 (Client Closed Request) を返す
+        return Response(status_code=499)
+
+    # 空きプロセスが無いためキャンセル可能な音声合成を受け付けられなかったエラー
+    @app.exception_handler(CancellableEngineBusyError)
+    async def cancellable_engine_busy_exception_handler(
+        request: Request, e: CancellableEngineBusyError
+    ) -> JSONResponse:
+        return JSONResponse(
+            status_code=503,
+            content={"message": str(e)},
+            headers={"Retry-After": str(e.retry_after_sec)},
+        )
+
+    # 要求元の切断によりキャンセル可能な音声合成を中断したエラー
+    @app.exception_handler(CancellableEngineCancelledError)
+    async def cancellable_engine_cancelled_exception_handler(
+        request: Request, e: CancellableEngineCancelledError
+    ) -> Response:
+        # NOTE: 要求元は切断済みで応答は届かないため、ログ上で区別できる 499 (Client Closed Request) を返す
+        return Response(status_code=499)
+
+    # キャンセル可能な音声合成のサブプロセスが異常終了したエラー
+    @app.exception_handler(CancellableEngineInternalError)
+    async def cancellable_engine_internal_exception_handler(
+        request: Request, e: CancellableEngineInternalError
+    ) -> JSONResponse:
+        print_exception(e)
+        return JSONResponse(
+            status_code=500, content={"message": "Internal Server Error"}
+        )
+
     return app
@@ -0,0 +1,152 @@
+"""起動処理の完了前から接続を受け付ける ASGI アプリケーション"""
+
+import json
+import threading
+import traceback
+from collections.abc import Callable
+from typing import Final, Literal
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+HEALTH_PATH: Final = "/health"
+
+StartupStatus = Literal["starting", "ready", "failed"]
+
+
+class LazyApplication:
+    """
+    本体のアプリケーションをバックグラウンドで生成しつつ、生成の完了前から接続を受け付ける ASGI アプリケーション。
+
+    生成の完了前は `/health` 以外の要求に 503 を返し、完了後は全ての要求を本体へ委譲する。
+    `/health` は起動処理の状況（起動中・起動済み・失敗）を常に返す。
+    """
+
+    def __init__(
+        self,
+        build_app: Callable[[], ASGIApp],
+        get_current_phase: Callable[[], str | None] | None = None,
+    ) -> None:
+        """
+        アプリケーションを生成する。本体の生成は `start` または `build` の呼び出しで始まる。
+
+        Parameters
+        ----------
+        build_app : Callable[[], ASGIApp]
+            本体のアプリケーションを生成する関数
+        get_current_phase : Callable[[], str | None] | None
+            起動処理の実行中の段階の名前を返す関数。`/health` の応答に含める。
+        """
+        self._build_app = build_app
+        self._get_current_phase = get_current_phase
+        self._lock = threading.Lock()
+        self._started = False
+        self._status: StartupStatus = "starting"
+        self._app: ASGIApp | None = None
+
+    @property
+    def status(self) -> StartupStatus:
+        """起動処理の状況を取得する。"""
+        return self._status
+
+    def start(self) -> None:
+        """本体の生成をバックグラウンドのスレッドで開始する。既に開始している場合は何もしない。"""
+        if self._begin():
+            threading.Thread(
+                target=self._run_build, name="startup", daemon=True
+            ).start()
+
+    def build(self) -> None:
+        """本体を同期的に生成する。生成に失敗した場合はその例外を送出する。"""
+        if not self._begin():
+            return
+        try:
+            self._app = self._build_app()
+        except BaseException:
+            self._status = "failed"
+            raise
+        self._status = "ready"
+
+    def _begin(self) -> bool:
+        with self._lock:
+            if self._started:
+                return False
+            self._started = True
+            return True
+
+    def _run_build(self) -> None:
+        try:
+            self._app = self._build_app()
+        except BaseException:
+            traceback.print_exc()
+            self._status = "failed"
+        else:
+            self._status = "ready"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """ASGI アプリケーションとして要求を処理する。"""
+        if scope["type"] == "lifespan":
+            await self._handle_lifespan(receive, send)
+            return
+        if scope["type"] == "http" and scope["path"] == HEALTH_PATH:
+            await self._send_health(send)
+            return
+        app = self._app
+        if app is None:
+            # NOTE: lifespan に対応しないサーバーでは最初の要求を契機に生成を始める
+            self.start()
+            await self._send_unavailable(scope, send)
+            return
+        await app(scope, receive, send)
+
+    async def _handle_lifespan(self, receive: Receive, send: Send) -> None:
+        # NOTE: 本体は lifespan のイベントを利用しないため委譲しない
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                self.start()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _send_health(self, send: Send) -> None:
+        status = self._status
+        phase = None
+        if status == "starting" and self._get_current_phase is not None:
+            phase = self._get_current_phase()
+        body = {"status": status, "phase": phase}
+        await _send_json(send, 503 if status == "failed" else 200, body)
+
+    async def _send_unavailable(self, scope: Scope, send: Send) -> None:
+        if scope["type"] == "websocket":
+            # NOTE: 1013 は「後で再試行せよ」を表す
+            await send({"type": "websocket.close", "code": 1013})
+            return
+        if self._status == "failed":
+            detail = "エンジンの起動に失敗しました。"
+            headers = []
+        else:
+            detail = "エンジンを起動しています。"
+            headers = [(b"retry-after", b"1")]
+        await _send_json(send, 503, {"detail": detail}, headers)
+
+
+async def _send_json(
+    send: Send,
+    status_code: int,
+    content: dict[str, str | None],
+    extra_headers: list[tuple[bytes, bytes]] | None = None,
+) -> None:
+    body = json.dumps(content, ensure_ascii=False).encode("utf-8")
+    headers = [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(body)).encode("latin-1")),
+    ]
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status_code,
+            "headers": headers + (extra_headers or []),
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
@@ -1,15 +1,29 @@
 """FastAPI ミドルウェア"""
 
 import re
+import time
 import warnings
 from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
 from traceback import print_exception
+from typing import Final
 
 from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+from starlette.datastructures import MutableHeaders
 from starlette.middleware.errors import ServerErrorMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from voicevox_engine.metrics import (
+    CallbackMetric,
+    Histogram,
+    MetricsRegistry,
+    RequestTrace,
+    bind_request,
+    route_label,
+    unbind_request,
+)
 from voicevox_engine.setting.model import CorsPolicyMode
 
 
@@ -88,3 +102,163 @@ def configure_middlewares(
             )
 
     return app
+
+
+@dataclass
+class _InFlightRequests:
+    """処理中の HTTP 要求の数"""
+
+    count: int = 0
+
+
+# Server-Timing ヘッダーで用いる処理段階の名前
+_SERVER_TIMING_NAMES: Final = {
+    "text_to_full_context_labels": "frontend",
+    "safe_yukarin_s_forward": "length",
+    "safe_yukarin_sa_forward": "pitch",
+    "safe_decode_forward": "decode",
+    "raw_wave_to_output_wave": "postprocess",
+    "wave_to_wav_bytes": "encode",
+    "core_lock_wait": "lock_wait",
+    "cancellable_process_wait": "process_wait",
+}
+
+
+def _server_timing(stage_seconds: dict[str, float], total_sec: float) -> str:
+    """処理段階ごとの所要時間を Server-Timing ヘッダーの値にする。"""
+    entries = [
+        f"{_SERVER_TIMING_NAMES.get(stage, stage)};dur={sec * 1000:.1f}"
+        for stage, sec in stage_seconds.items()
+    ]
+    entries.append(f"total;dur={total_sec * 1000:.1f}")
+    return ", ".join(entries)
+
+
+def _print_slow_request(
+    scope: Scope, status_code: int, elapsed_sec: float, trace: RequestTrace
+) -> None:
+    """処理に時間のかかった要求について、処理段階ごとの所要時間と入力の規模を出力する。"""
+    stages = " ".join(
+        f"{stage}={sec * 1000:.1f}ms" for stage, sec in trace.stage_seconds().items()
+    )
+    attributes = " ".join(
+        f"{name}={value}" for name, value in trace.attributes().items()
+    )
+    print(
+        f"処理に時間のかかった要求: {scope['method']} {scope['path']} {status_code} "
+        f"{elapsed_sec * 1000:.1f}ms [{stages}] [{attributes}]",
+        flush=True,
+    )
+
+
+class _MetricsMiddleware:
+    """
+    HTTP 要求の処理時間と処理中の数を計測し、要求内の処理段階の計測を要求に結び付けるミドルウェア。
+
+    設定に応じて、処理段階ごとの所要時間を Server-Timing ヘッダーで返し、処理に時間のかかった要求を出力する。
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        request_duration: Histogram,
+        in_flight: _InFlightRequests,
+        enable_server_timing: bool,
+        slow_request_threshold_sec: float | None,
+    ) -> None:
+        self._app = app
+        self._request_duration = request_duration
+        self._in_flight = in_flight
+        self._enable_server_timing = enable_server_timing
+        self._slow_request_threshold_sec = slow_request_threshold_sec
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self._app(scope, receive, send)
+            return
+
+        status_code = 500
+        start = time.perf_counter()
+        trace = RequestTrace(
+            scope,
+            record_stages=self._enable_server_timing
+            or self._slow_request_threshold_sec is not None,
+        )
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self._enable_server_timing:
+                    headers = MutableHeaders(scope=message)
+                    headers.append(
+                        "Server-Timing",
+                        _server_timing(
+                            trace.stage_seconds(), time.perf_counter() - start
+                        ),
+                    )
+            await send(message)
+
+        token = bind_request(trace)
+        # NOTE: イベントループのスレッドでのみ増減するため排他は不要
+        self._in_flight.count += 1
+        try:
+            await self._app(scope, receive, send_with_status)
+        finally:
+            self._in_flight.count -= 1
+            elapsed_sec = time.perf_counter() - start
+            self._request_duration.observe(
+                elapsed_sec, route_label(scope), scope["method"], str(status_code)
+            )
+            if (
+                self._slow_request_threshold_sec is not None
+                and elapsed_sec > self._slow_request_threshold_sec
+            ):
+                _print_slow_request(scope, status_code, elapsed_sec, trace)
+            unbind_request(token)
+
+
+def configure_metrics_middleware(
+    app: FastAPI,
+    registry: MetricsRegistry,
+    enable_server_timing: bool = False,
+    slow_request_threshold_sec: float | None = None,
+) -> FastAPI:
+    """
+    HTTP 要求を計測するミドルウェアを設定し、そのメトリクスを登録する。
+
+    Parameters
+    ----------
+    app : FastAPI
+        ミドルウェアを設定するアプリケーション
+    registry : MetricsRegistry
+        HTTP 要求のメトリクスの登録先
+    enable_server_timing : bool
+        処理段階ごとの所要時間を Server-Timing ヘッダーで返すか否か
+    slow_request_threshold_sec : float | None
+        処理時間がこの秒数を超えた要求を出力する。None の場合は出力しない。
+    """
+    request_duration = Histogram(
+        "voicevox_http_request_duration_seconds",
+        "HTTP 要求の受信から応答の送信完了までの時間（秒）",
+        ["route", "method", "status"],
+    )
+    in_flight = _InFlightRequests()
+    registry.register(request_duration)
+    registry.register(
+        CallbackMetric(
+            "voicevox_http_requests_in_flight",
+            "処理中の HTTP 要求の数",
+            "gauge",
+            [],
+            lambda: [((), in_flight.count)],
+        )
+    )
+    app.add_middleware(
+        _MetricsMiddleware,
+        request_duration=request_duration,
+        in_flight=in_flight,
+        enable_server_timing=enable_server_timing,
+        slow_request_threshold_sec=slow_request_threshold_sec,
+    )
+    return app
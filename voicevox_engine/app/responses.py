@@ -0,0 +1,136 @@
+"""バイナリデータやシリアライズ済みデータを返す HTTP レスポンスの生成"""
+
+import io
+import re
+import zipfile
+from tempfile import NamedTemporaryFile
+from typing import IO
+
+from fastapi import Response
+from starlette.background import BackgroundTask
+from starlette.responses import FileResponse
+
+from voicevox_engine.utility.file_utility import try_delete_file
+
+_SINGLE_BYTE_RANGE_PATTERN = re.compile(r"^\s*bytes\s*=\s*(\d*)\s*-\s*(\d*)\s*$")
+
+
+def _needs_file(size: int, file_threshold_bytes: int | None) -> bool:
+    """出力を一時ファイル経由で返すべきか判定する。"""
+    return file_threshold_bytes is not None and size > file_threshold_bytes
+
+
+def _write_zip(file: IO[bytes], files: dict[str, bytes]) -> None:
+    with zipfile.ZipFile(file, mode="w") as zip_file:
+        for name, content in files.items():
+            zip_file.writestr(name, content)
+
+
+def generate_binary_response(
+    content: bytes, media_type: str, file_threshold_bytes: int | None = None
+) -> Response:
+    """
+    バイト列を返すレスポンスを生成する。
+
+    通常はメモリ上のバイト列をそのまま返す。
+    `file_threshold_bytes` が指定され、それを超える大きな出力に限り一時ファイルへ書き出して返し、送信後に削除する。
+    """
+    if not _needs_file(len(content), file_threshold_bytes):
+        return Response(content, media_type=media_type)
+    with NamedTemporaryFile(delete=False) as f:
+        f.write(content)
+    return FileResponse(
+        f.name,
+        media_type=media_type,
+        background=BackgroundTask(try_delete_file, f.name),
+    )
+
+
+def generate_zip_response(
+    files: dict[str, bytes], file_threshold_bytes: int | None = None
+) -> Response:
+    """
+    ファイル名と内容の組を無圧縮の ZIP 形式で返すレスポンスを生成する。
+
+    一時ファイルを用いる条件は `generate_binary_response` と同じであり、格納するファイルの合計サイズで判定する。
+    """
+    total_size = sum(len(content) for content in files.values())
+    if not _needs_file(total_size, file_threshold_bytes):
+        buffer = io.BytesIO()
+        _write_zip(buffer, files)
+        return Response(buffer.getvalue(), media_type="application/zip")
+    with NamedTemporaryFile(delete=False) as f:
+        _write_zip(f, files)
+    return FileResponse(
+        f.name,
+        media_type="application/zip",
+        background=BackgroundTask(try_delete_file, f.name),
+    )
+
+
+def etag_matches(etag: str, if_none_match: str) -> bool:
+    """`If-None-Match` ヘッダーの値が ETag に一致するか弱い比較で判定する。"""
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (candidate.strip() for candidate in if_none_match.split(","))
+    return etag.removeprefix("W/") in (
+        candidate.removeprefix("W/") for candidate in candidates
+    )
+
+
+def generate_etag_response(
+    content: bytes, etag: str, media_type: str, if_none_match: str | None
+) -> Response:
+    """
+    ETag つきでバイト列を返すレスポンスを生成する。
+
+    `If-None-Match` ヘッダーの値が ETag に一致する場合は本文を省いた 304 Not Modified を返す。
+    内容は音声ライブラリの変更などで変わりうるため、クライアントには毎回の再検証を求める。
+    """
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if if_none_match is not None and etag_matches(etag, if_none_match):
+        return Response(status_code=304, headers=headers)
+    return Response(content, media_type=media_type, headers=headers)
+
+
+def parse_single_byte_range(range_header: str, size: int) -> tuple[int, int] | None:
+    """
+    `Range` ヘッダーの単一のバイト範囲指定を `(開始位置, 終了位置)` の半開区間として解釈する。
+
+    複数の範囲指定や不正な指定、満たせない範囲の場合は None を返す。
+    """
+    match = _SINGLE_BYTE_RANGE_PATTERN.match(range_header)
+    if match is None:
+        return None
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last) + 1, size) if last else size
+    elif last:
+        # `bytes=-N` は末尾 N バイトを表す
+        start = max(size - int(last), 0)
+        end = size
+    else:
+        return None
+    if not start < end:
+        return None
+    return start, end
+
+
+def generate_byte_range_response(
+    content: bytes,
+    byte_range: tuple[int, int],
+    media_type: str,
+    headers: dict[str, str],
+) -> Response:
+    """バイト列の一部を返す 206 Partial Content レスポンスを生成する。"""
+    start, end = byte_range
+    range_headers = headers | {
+        "Content-Range": f"bytes {start}-{end - 1}/{len(content)}"
+    }
+    return Response(
+        content[start:end],
+        status_code=206,
+        media_type=media_type,
+        headers=range_headers,
+    )
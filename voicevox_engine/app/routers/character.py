@@ -1,70 +1,84 @@
 """キャラクター情報機能を提供する API Router"""
 
-from typing import Annotated
+import mimetypes
+from typing import Annotated, Final
 
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import FileResponse
 from pydantic.json_schema import SkipJsonSchema
 
 from voicevox_engine.metas.metas import Speaker, SpeakerInfo
 from voicevox_engine.metas.metas_store import (
-    Character,
     CharacterInfoNotFoundError,
     CharacterNotFoundError,
     MetasStore,
     ResourceFormat,
+    SerializedJson,
+)
+from voicevox_engine.resource_manager import (
+    ResourceFileCache,
+    ResourceManager,
+    ResourceManagerError,
+)
+
+from ..responses import (
+    etag_matches,
+    generate_byte_range_response,
+    generate_etag_response,
+    parse_single_byte_range,
 )
-from voicevox_engine.resource_manager import ResourceManager, ResourceManagerError
 
 RESOURCE_ENDPOINT = "_resources"
 
+# リソースは内容のハッシュ値で識別され内容が変わらないため、変更されない前提で長期間キャッシュさせる
+_RESOURCE_CACHE_CONTROL: Final = "public, max-age=31536000, immutable"  # 365日
+
 
 async def _get_resource_baseurl(request: Request) -> str:
     return f"{request.url.scheme}://{request.url.netloc}/{RESOURCE_ENDPOINT}"
 
 
-def _characters_to_speakers(characters: list[Character]) -> list[Speaker]:
-    """キャラクターのリストを `Speaker` のリストへキャストする。"""
-    return list(
-        map(
-            lambda character: Speaker(
-                name=character.name,
-                speaker_uuid=character.uuid,
-                styles=character.talk_styles + character.sing_styles,
-                version=character.version,
-                supported_features=character.supported_features,
-            ),
-            characters,
-        )
+def _json_response(serialized: SerializedJson, request: Request) -> Response:
+    """シリアライズ済みの JSON を、`If-None-Match` に応じて ETag つきで返す。"""
+    return generate_etag_response(
+        serialized.body,
+        serialized.etag,
+        "application/json",
+        request.headers.get("if-none-match"),
     )
 
 
 def generate_character_router(
-    resource_manager: ResourceManager, metas_store: MetasStore
+    resource_manager: ResourceManager,
+    metas_store: MetasStore,
+    resource_file_cache: ResourceFileCache | None = None,
 ) -> APIRouter:
     """キャラクター情報 API Router を生成する"""
     router = APIRouter(tags=["その他"])
 
-    @router.get("/speakers")
-    def speakers(core_version: str | SkipJsonSchema[None] = None) -> list[Speaker]:
+    @router.get("/speakers", response_model=list[Speaker])
+    def speakers(
+        request: Request, core_version: str | SkipJsonSchema[None] = None
+    ) -> Response:
         """喋れるキャラクターの情報の一覧を返します。"""
-        characters = metas_store.talk_characters(core_version)
-        return _characters_to_speakers(characters)
+        return _json_response(metas_store.speakers_json("talk", core_version), request)
 
-    @router.get("/speaker_info")
+    @router.get("/speaker_info", response_model=SpeakerInfo)
     def speaker_info(
+        request: Request,
         resource_baseurl: Annotated[str, Depends(_get_resource_baseurl)],
         speaker_uuid: str,
         resource_format: ResourceFormat = "base64",
         core_version: str | SkipJsonSchema[None] = None,
-    ) -> SpeakerInfo:
+    ) -> Response:
         """
         UUID で指定された喋れるキャラクターの情報を返します。
 
         画像や音声はresource_formatで指定した形式で返されます。
         """
         try:
-            return metas_store.character_info(
+            character_info = metas_store.character_info_json(
                 character_uuid=speaker_uuid,
                 talk_or_sing="talk",
                 core_version=core_version,
@@ -75,27 +89,30 @@ def generate_character_router(
             raise HTTPException(status_code=404, detail=str(e)) from e
         except CharacterInfoNotFoundError as e:
             raise HTTPException(status_code=500, detail=str(e)) from e
+        return _json_response(character_info, request)
 
-    @router.get("/singers")
-    def singers(core_version: str | SkipJsonSchema[None] = None) -> list[Speaker]:
+    @router.get("/singers", response_model=list[Speaker])
+    def singers(
+        request: Request, core_version: str | SkipJsonSchema[None] = None
+    ) -> Response:
         """歌えるキャラクターの情報の一覧を返します。"""
-        characters = metas_store.sing_characters(core_version)
-        return _characters_to_speakers(characters)
+        return _json_response(metas_store.speakers_json("sing", core_version), request)
 
-    @router.get("/singer_info")
+    @router.get("/singer_info", response_model=SpeakerInfo)
     def singer_info(
+        request: Request,
         resource_baseurl: Annotated[str, Depends(_get_resource_baseurl)],
         speaker_uuid: str,
         resource_format: ResourceFormat = "base64",
         core_version: str | SkipJsonSchema[None] = None,
-    ) -> SpeakerInfo:
+    ) -> Response:
         """
         UUID で指定された歌えるキャラクターの情報を返します。
 
         画像や音声はresource_formatで指定した形式で返されます。
         """
         try:
-            return metas_store.character_info(
+            character_info = metas_store.character_info_json(
                 character_uuid=speaker_uuid,
                 talk_or_sing="sing",
                 core_version=core_version,
@@ -106,18 +123,50 @@ def generate_character_router(
             raise HTTPException(status_code=404, detail=str(e)) from e
         except CharacterInfoNotFoundError as e:
             raise HTTPException(status_code=500, detail=str(e)) from e
+        return _json_response(character_info, request)
 
     # リソースはAPIとしてアクセスするものではないことを表明するためOpenAPIスキーマーから除外する
     @router.get(f"/{RESOURCE_ENDPOINT}/{{resource_hash}}", include_in_schema=False)
-    async def resources(resource_hash: str) -> FileResponse:
-        """ResourceManagerから発行されたハッシュ値に対応するリソースファイルを返す。"""
+    async def resources(resource_hash: str, request: Request) -> Response:
+        """
+        ResourceManagerから発行されたハッシュ値に対応するリソースファイルを返す。
+
+        ハッシュ値を強い ETag とし、`If-None-Match` による再検証と `Range` による部分取得に応じる。
+        """
         try:
             resource_path = resource_manager.resource_path(resource_hash)
         except ResourceManagerError as e:
             raise HTTPException(status_code=404) from e
-        return FileResponse(
-            resource_path,
-            headers={"Cache-Control": "max-age=2592000"},  # 30日
-        )
+
+        headers = {
+            "ETag": f'"{resource_hash}"',
+            "Cache-Control": _RESOURCE_CACHE_CONTROL,
+        }
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None and etag_matches(headers["ETag"], if_none_match):
+            return Response(status_code=304, headers=headers)
+
+        content = None
+        if resource_file_cache is not None:
+            content = await run_in_threadpool(
+                resource_file_cache.read, resource_hash, resource_path
+            )
+        if content is None:
+            # NOTE: 部分取得と `If-Range` の判定は FileResponse が ETag を用いて行う
+            return FileResponse(resource_path, headers=headers)
+
+        media_type = mimetypes.guess_type(resource_path)[0] or "text/plain"
+        headers["Accept-Ranges"] = "bytes"
+        range_header = request.headers.get("range")
+        if_range = request.headers.get("if-range")
+        if range_header is None or (
+            if_range is not None and if_range != headers["ETag"]
+        ):
+            return Response(content, media_type=media_type, headers=headers)
+        byte_range = parse_single_byte_range(range_header, len(content))
+        if byte_range is None:
+            # 複数範囲や満たせない範囲の指定はファイルから応答する
+            return FileResponse(resource_path, headers=headers)
+        return generate_byte_range_response(content, byte_range, media_type, headers)
 
     return router
@@ -1,13 +1,16 @@
 """エンジンの情報機能を提供する API Router"""
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Response
 
 from voicevox_engine import __version__
 from voicevox_engine.engine_manifest import EngineManifest
+from voicevox_engine.tts_pipeline.warmup import StyleWarmer, WarmupProgress
 
 
 def generate_engine_info_router(
-    core_version_list: list[str], engine_manifest_data: EngineManifest
+    core_version_list: list[str],
+    engine_manifest_data: EngineManifest,
+    style_warmer: StyleWarmer | None = None,
 ) -> APIRouter:
     """エンジン情報 API Router を生成する"""
     router = APIRouter(tags=["その他"])
@@ -27,4 +30,32 @@ def generate_engine_info_router(
         """エンジンマニフェストを取得します。"""
         return engine_manifest_data
 
+    @router.get(
+        "/ready",
+        response_model=WarmupProgress,
+        responses={
+            503: {
+                "description": "スタイルのウォームアップ中",
+                "model": WarmupProgress,
+            }
+        },
+    )
+    def ready() -> Response:
+        """
+        エンジンが要求を処理する準備を終えたかを返します。
+
+        起動時に指定されたスタイルのウォームアップが終わるまでは 503 を返します。
+        """
+        if style_warmer is None:
+            progress = WarmupProgress(
+                total=0, completed=0, failed_style_ids=[], done=True
+            )
+        else:
+            progress = style_warmer.progress()
+        return Response(
+            progress.model_dump_json(),
+            status_code=200 if progress.done else 503,
+            media_type="application/json",
+        )
+
     return router
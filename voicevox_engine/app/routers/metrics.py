@@ -0,0 +1,172 @@
+"""メトリクス機能を提供する API Router"""
+
+from collections.abc import Callable
+
+from fastapi import APIRouter, Response
+
+from voicevox_engine.cancellable_engine import CancellableEngine
+from voicevox_engine.core.model_residency import ModelResidencyStats
+from voicevox_engine.metrics import (
+    CONTENT_TYPE,
+    CallbackMetric,
+    MetricsRegistry,
+    Sample,
+)
+from voicevox_engine.synthesis_scheduler import SynthesisScheduler
+from voicevox_engine.tts_pipeline.tts_engine import TTSEngineManager
+
+
+def _register_engine_metrics(
+    registry: MetricsRegistry,
+    tts_engines: TTSEngineManager,
+    synthesis_scheduler: SynthesisScheduler | None,
+    cancellable_engine: CancellableEngine | None,
+) -> None:
+    """音声合成エンジンの状態を表すメトリクスを登録する。"""
+
+    def core_calls() -> list[Sample]:
+        return [
+            ((version, str(instance)), num_calls)
+            for version in tts_engines.versions()
+            for instance, num_calls in enumerate(
+                tts_engines.get_tts_engine(version).pending_core_calls()
+            )
+        ]
+
+    registry.register(
+        CallbackMetric(
+            "voicevox_core_calls",
+            "コアのインスタンスごとの実行中および実行待ちの推論呼び出し数",
+            "gauge",
+            ["core_version", "instance"],
+            core_calls,
+        )
+    )
+
+    def residency_metric(
+        name: str,
+        documentation: str,
+        value: Callable[[ModelResidencyStats], float],
+        is_counter: bool = False,
+    ) -> CallbackMetric:
+        def collect() -> list[Sample]:
+            return [
+                ((version, str(instance)), value(stats))
+                for version in tts_engines.versions()
+                for instance, stats in enumerate(
+                    tts_engines.get_tts_engine(version).residency_stats()
+                )
+            ]
+
+        return CallbackMetric(
+            name,
+            documentation,
+            "counter" if is_counter else "gauge",
+            ["core_version", "instance"],
+            collect,
+        )
+
+    registry.register(
+        residency_metric(
+            "voicevox_model_resident_styles",
+            "モデルが常駐中のスタイル数",
+            lambda stats: len(stats.resident_style_ids),
+        )
+    )
+    registry.register(
+        residency_metric(
+            "voicevox_model_resident_bytes",
+            "常駐中の音声合成モデルが占めるメモリの見積もり（バイト）",
+            lambda stats: stats.resident_bytes,
+        )
+    )
+    registry.register(
+        residency_metric(
+            "voicevox_model_memory_budget_bytes",
+            "音声合成モデルが占めるメモリの上限（バイト）",
+            lambda stats: stats.budget_bytes,
+        )
+    )
+    registry.register(
+        residency_metric(
+            "voicevox_model_loads_total",
+            "音声合成モデルを読み込んだ回数",
+            lambda stats: stats.loads,
+            is_counter=True,
+        )
+    )
+    registry.register(
+        residency_metric(
+            "voicevox_model_recycles_total",
+            "メモリの上限を超えるためにコアを初期化し直した回数",
+            lambda stats: stats.recycles,
+            is_counter=True,
+        )
+    )
+
+    if synthesis_scheduler is not None:
+        scheduler = synthesis_scheduler
+        registry.register(
+            CallbackMetric(
+                "voicevox_synthesis_jobs",
+                "スケジューラーで実行中および実行待ちの音声合成ジョブ数",
+                "gauge",
+                [],
+                lambda: [((), scheduler.num_jobs)],
+            )
+        )
+
+    if cancellable_engine is not None:
+        engine = cancellable_engine
+        registry.register(
+            CallbackMetric(
+                "voicevox_cancellable_engine_processes",
+                "キャンセル可能な音声合成のプロセス数",
+                "gauge",
+                ["state"],
+                lambda: [
+                    (("active",), engine.num_active_processes),
+                    (("idle",), engine.num_idle_processes),
+                    (("spare",), engine.num_spare_processes),
+                    (("starting",), engine.num_starting_processes),
+                ],
+            )
+        )
+        registry.register(
+            CallbackMetric(
+                "voicevox_cancellable_engine_waiting_requests",
+                "キャンセル可能な音声合成で、空きプロセスを待っている要求の数",
+                "gauge",
+                [],
+                lambda: [((), engine.num_waiting_requests)],
+            )
+        )
+        registry.register(
+            CallbackMetric(
+                "voicevox_cancellable_engine_replaced_processes_total",
+                "キャンセル可能な音声合成で、終了したプロセスを置き換えた回数",
+                "counter",
+                [],
+                lambda: [((), engine.num_replaced_processes)],
+            )
+        )
+
+
+def generate_metrics_router(
+    registry: MetricsRegistry,
+    tts_engines: TTSEngineManager,
+    synthesis_scheduler: SynthesisScheduler | None = None,
+    cancellable_engine: CancellableEngine | None = None,
+) -> APIRouter:
+    """メトリクス API Router を生成する"""
+    _register_engine_metrics(
+        registry, tts_engines, synthesis_scheduler, cancellable_engine
+    )
+    router = APIRouter()
+
+    @router.get("/metrics", include_in_schema=False)
+    def metrics() -> Response:
+        """Prometheus のテキスト形式でメトリクスを取得する。"""
+        return Response(registry.render(), media_type=CONTENT_TYPE)
+
+    return router
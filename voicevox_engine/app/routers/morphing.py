@@ -1,15 +1,15 @@
 """モーフィング機能を提供する API Router"""
 
 from functools import lru_cache
-from tempfile import NamedTemporaryFile
 from typing import Annotated
 
-import soundfile
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 from pydantic.json_schema import SkipJsonSchema
-from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool
 from starlette.responses import FileResponse
 
+from voicevox_engine.app.responses import generate_binary_response
+from voicevox_engine.cancellable_engine import CancellableEngine, MorphJob
 from voicevox_engine.metas.metas import StyleId
 from voicevox_engine.metas.metas_store import MetasStore
 from voicevox_engine.model import AudioQuery
@@ -24,7 +24,7 @@ from voicevox_engine.morphing.morphing import (
     synthesis_morphing_parameter as _synthesis_morphing_parameter,
 )
 from voicevox_engine.tts_pipeline.tts_engine import LATEST_VERSION, TTSEngineManager
-from voicevox_engine.utility.file_utility import try_delete_file
+from voicevox_engine.utility.audio_utility import wave_to_wav_bytes
 
 # キャッシュを有効化
 # モジュール側でlru_cacheを指定するとキャッシュを制御しにくいため、HTTPサーバ側で指定する
@@ -33,7 +33,10 @@ synthesis_morphing_parameter = lru_cache(maxsize=4)(_synthesis_morphing_paramete
 
 
 def generate_morphing_router(
-    tts_engines: TTSEngineManager, metas_store: MetasStore
+    tts_engines: TTSEngineManager,
+    metas_store: MetasStore,
+    output_file_threshold_bytes: int | None = None,
+    cancellable_engine: CancellableEngine | None = None,
 ) -> APIRouter:
     """モーフィング API Router を生成する"""
     router = APIRouter(tags=["音声合成"])
@@ -76,8 +79,9 @@ def generate_morphing_router(
         },
         summary="2種類のスタイルでモーフィングした音声を合成する",
     )
-    def _synthesis_morphing(
+    async def _synthesis_morphing(
         query: AudioQuery,
+        request: Request,
         base_style_id: Annotated[StyleId, Query(alias="base_speaker")],
         target_style_id: Annotated[StyleId, Query(alias="target_speaker")],
         morph_rate: Annotated[float, Query(ge=0.0, le=1.0)],
@@ -88,7 +92,7 @@ def generate_morphing_router(
             ),
         ] = True,
         core_version: str | SkipJsonSchema[None] = None,
-    ) -> FileResponse:
+    ) -> Response:
         """
         指定された2種類のスタイルで音声を合成、指定した割合でモーフィングした音声を得ます。
 
@@ -98,7 +102,7 @@ def generate_morphing_router(
         engine = tts_engines.get_tts_engine(version)
 
         # モーフィングが許可されないキャラクターペアを拒否する
-        characters = metas_store.characters(core_version)
+        characters = await run_in_threadpool(metas_store.characters, core_version)
         try:
             morphable = is_morphable(characters, base_style_id, target_style_id)
         except StyleIdNotFoundError as e:
@@ -108,34 +112,43 @@ def generate_morphing_router(
             msg = "指定されたスタイルペアでのモーフィングはできません"
             raise HTTPException(status_code=400, detail=msg)
 
-        # 生成したパラメータはキャッシュされる
-        morph_param = synthesis_morphing_parameter(
-            engine=engine,
-            query=query,
-            base_style_id=base_style_id,
-            target_style_id=target_style_id,
-            enable_interrogative_upspeak=enable_interrogative_upspeak,
-        )
-
-        morph_wave = synthesize_morphed_wave(
-            morph_param=morph_param,
-            morph_rate=morph_rate,
-            output_fs=query.outputSamplingRate,
-            output_stereo=query.outputStereo,
-        )
-
-        with NamedTemporaryFile(delete=False) as f:
-            soundfile.write(
-                file=f,
-                data=morph_wave,
-                samplerate=query.outputSamplingRate,
-                format="WAV",
+        def wav_response(wav: bytes) -> Response:
+            return generate_binary_response(
+                wav, "audio/wav", output_file_threshold_bytes
+            )
+
+        if cancellable_engine is not None:
+            job = MorphJob(
+                query,
+                base_style_id,
+                target_style_id,
+                morph_rate,
+                enable_interrogative_upspeak,
+                version,
+            )
+            wavs = await cancellable_engine.run_job(job, request)
+            if wavs is None:
+                raise HTTPException(status_code=422, detail="不明なバージョンです")
+            return await run_in_threadpool(wav_response, wavs[0])
+
+        def synthesize() -> Response:
+            # 生成したパラメータはキャッシュされる
+            morph_param = synthesis_morphing_parameter(
+                engine=engine,
+                query=query,
+                base_style_id=base_style_id,
+                target_style_id=target_style_id,
+                enable_interrogative_upspeak=enable_interrogative_upspeak,
+            )
+
+            morph_wave = synthesize_morphed_wave(
+                morph_param=morph_param,
+                morph_rate=morph_rate,
+                output_fs=query.outputSamplingRate,
+                output_stereo=query.outputStereo,
             )
+            return wav_response(wave_to_wav_bytes(morph_wave, query.outputSamplingRate))
 
-        return FileResponse(
-            f.name,
-            media_type="audio/wav",
-            background=BackgroundTask(try_delete_file, f.name),
-        )
+        return await run_in_threadpool(synthesize)
 
     return router
@@ -1,5 +1,6 @@
 """設定機能を提供する API Router"""
 
+from dataclasses import replace
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, Form, Request, Response
@@ -9,7 +10,7 @@ from pydantic.json_schema import SkipJsonSchema
 
 from voicevox_engine.engine_manifest import BrandName
 from voicevox_engine.setting.model import CorsPolicyMode
-from voicevox_engine.setting.setting_manager import Setting, SettingHandler
+from voicevox_engine.setting.setting_manager import SettingHandler
 from voicevox_engine.utility.path_utility import resource_root
 
 from ..dependencies import VerifyMutabilityAllowed
@@ -58,7 +59,9 @@ def generate_setting_router(
         allow_origin: Annotated[str | SkipJsonSchema[None], Form()] = None,
     ) -> None:
         """設定を更新します。"""
-        settings = Setting(
+        # 設定ページで編集できない項目は現在の値を引き継ぐ
+        settings = replace(
+            setting_loader.load(),
             cors_policy_mode=cors_policy_mode,
             allow_origin=allow_origin,
         )
@@ -1,20 +1,28 @@
 """音声合成機能を提供する API Router"""
 
-import zipfile
-from tempfile import NamedTemporaryFile, TemporaryFile
+import asyncio
+import contextlib
+import math
+from collections.abc import Callable, Iterator
 from traceback import print_exception
-from typing import Annotated, Self
+from typing import Annotated, Final, Self, TypeVar
 
-import soundfile
-from fastapi import APIRouter, HTTPException, Query, Request
+import numpy as np
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from numpy.typing import NDArray
 from pydantic import BaseModel, Field
 from pydantic.json_schema import SkipJsonSchema
-from starlette.background import BackgroundTask
-from starlette.responses import FileResponse
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import FileResponse, StreamingResponse
 
+from voicevox_engine.app.responses import (
+    generate_binary_response,
+    generate_zip_response,
+)
 from voicevox_engine.cancellable_engine import (
     CancellableEngine,
-    CancellableEngineInternalError,
+    FrameJob,
+    MultiJob,
 )
 from voicevox_engine.core.core_adapter import DeviceSupport
 from voicevox_engine.metas.metas import StyleId
@@ -24,6 +32,10 @@ from voicevox_engine.preset.preset_manager import (
     PresetInternalError,
     PresetManager,
 )
+from voicevox_engine.synthesis_scheduler import (
+    SynthesisCancelledError,
+    SynthesisScheduler,
+)
 from voicevox_engine.tts_pipeline.connect_base64_waves import (
     ConnectBase64WavesException,
     connect_base64_waves,
@@ -45,9 +57,25 @@ from voicevox_engine.tts_pipeline.song_engine import (
 )
 from voicevox_engine.tts_pipeline.tts_engine import (
     LATEST_VERSION,
+    LatestVersion,
     TTSEngineManager,
 )
-from voicevox_engine.utility.file_utility import try_delete_file
+from voicevox_engine.tts_pipeline.wave_cache import (
+    WaveCache,
+    WaveCacheStats,
+    make_wave_cache_key,
+)
+from voicevox_engine.utility.audio_utility import (
+    generate_streaming_wav_header,
+    wave_to_pcm16_bytes,
+    wave_to_wav_bytes,
+)
+from voicevox_engine.utility.http_utility import wait_for_disconnect
+
+T = TypeVar("T")
+
+# 音声合成ジョブの受付から実行開始までの期限（秒）を要求ごとに指定するヘッダー
+REQUEST_TIMEOUT_HEADER: Final = "X-Request-Timeout"
 
 
 class ParseKanaBadRequest(BaseModel):
@@ -87,10 +115,167 @@ def generate_tts_pipeline_router(
     song_engines: SongEngineManager,
     preset_manager: PresetManager,
     cancellable_engine: CancellableEngine | None,
+    wave_cache: WaveCache | None = None,
+    synthesis_scheduler: SynthesisScheduler | None = None,
+    output_file_threshold_bytes: int | None = None,
 ) -> APIRouter:
     """音声合成 API Router を生成する"""
     router = APIRouter()
 
+    async def _run_synthesis(request: Request, call: Callable[[], T]) -> T:
+        """
+        音声合成ジョブを実行する。スケジューラーがあれば、要求ごとの期限を付けてスケジューラーへ投入する。
+
+        スケジューラーで実行を待つ間に要求元が切断した場合、ジョブを実行開始前に破棄して `SynthesisCancelledError` を送出する。
+        """
+        if synthesis_scheduler is None:
+            return await run_in_threadpool(call)
+
+        timeout_sec: float | None = None
+        timeout_header = request.headers.get(REQUEST_TIMEOUT_HEADER)
+        if timeout_header is not None:
+            try:
+                timeout_sec = float(timeout_header)
+            except ValueError:
+                timeout_sec = None
+            if (
+                timeout_sec is None
+                or not math.isfinite(timeout_sec)
+                or timeout_sec <= 0
+            ):
+                msg = f"{REQUEST_TIMEOUT_HEADER} ヘッダーは正の秒数で指定してください。"
+                raise HTTPException(status_code=422, detail=msg)
+
+        # NOTE: uvicorn は要求元の切断時にハンドラーをキャンセルしないため、http.disconnect を待ち受ける
+        job = asyncio.ensure_future(synthesis_scheduler.run(call, timeout_sec))
+        disconnection = asyncio.ensure_future(wait_for_disconnect(request))
+        try:
+            await asyncio.wait(
+                [job, disconnection], return_when=asyncio.FIRST_COMPLETED
+            )
+        except BaseException:
+            job.cancel()
+            raise
+        finally:
+            disconnection.cancel()
+
+        if not job.done():
+            # 実行開始前のジョブは破棄される。実行中のジョブは完了まで実行される。
+            job.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await job
+            raise SynthesisCancelledError("要求元が切断しました")
+        return job.result()
+
+    def _wav_response(wav: bytes) -> Response:
+        """WAV バイト列を返すレスポンスを生成する。"""
+        return generate_binary_response(wav, "audio/wav", output_file_threshold_bytes)
+
+    def _wave_cache_key(
+        query: AudioQuery,
+        style_id: StyleId,
+        enable_interrogative_upspeak: bool,
+        version: str | LatestVersion,
+    ) -> str:
+        """バージョン指定を解決した上で音声キャッシュのキーを生成する。"""
+        if version == LATEST_VERSION:
+            version = tts_engines.latest_version()
+        return make_wave_cache_key(
+            query, style_id, enable_interrogative_upspeak, version
+        )
+
+    async def _synthesize_wavs(
+        request: Request,
+        queries: list[AudioQuery],
+        style_id: StyleId,
+        enable_interrogative_upspeak: bool,
+        version: str | LatestVersion,
+        use_cancellable_engine: bool,
+    ) -> list[bytes]:
+        """
+        複数の音声を合成して WAV バイト列を得る。
+
+        音声キャッシュがあれば利用し、キャッシュに無い音声だけを合成して登録する。
+        `use_cancellable_engine` が真かつキャンセル可能な音声合成が有効な場合はサブプロセスで、そうでない場合は 1 つの合成ジョブでまとめて合成する。
+        """
+        cached_wavs: dict[int, bytes] = {}
+        cache_keys: list[str] = []
+        if wave_cache is not None:
+            for i, query in enumerate(queries):
+                cache_key = _wave_cache_key(
+                    query, style_id, enable_interrogative_upspeak, version
+                )
+                cache_keys.append(cache_key)
+                # キャッシュに存在する音声は合成ジョブを介さずに返す
+                cached_wav = await run_in_threadpool(wave_cache.get, cache_key)
+                if cached_wav is not None:
+                    cached_wavs[i] = cached_wav
+
+        missing = [i for i in range(len(queries)) if i not in cached_wavs]
+        if len(missing) != 0:
+            missing_queries = [queries[i] for i in missing]
+            synthesized = await (
+                _synthesize_missing_cancellable(
+                    cancellable_engine,
+                    request,
+                    missing_queries,
+                    style_id,
+                    enable_interrogative_upspeak,
+                    version,
+                )
+                if use_cancellable_engine and cancellable_engine is not None
+                else _synthesize_missing(
+                    request,
+                    missing_queries,
+                    style_id,
+                    enable_interrogative_upspeak,
+                    version,
+                )
+            )
+            for i, wav in zip(missing, synthesized, strict=True):
+                cached_wavs[i] = wav
+                if wave_cache is not None:
+                    await run_in_threadpool(wave_cache.put, cache_keys[i], wav)
+        return [cached_wavs[i] for i in range(len(queries))]
+
+    async def _synthesize_missing(
+        request: Request,
+        queries: list[AudioQuery],
+        style_id: StyleId,
+        enable_interrogative_upspeak: bool,
+        version: str | LatestVersion,
+    ) -> list[bytes]:
+        """複数の音声を 1 つの合成ジョブでまとめて合成する。ジョブは全体で受け付けられるか拒否されるかのどちらかである。"""
+        engine = tts_engines.get_tts_engine(version)
+
+        def synthesize() -> list[bytes]:
+            wavs = []
+            for query in queries:
+                wave = engine.synthesize_wave(
+                    query,
+                    style_id,
+                    enable_interrogative_upspeak=enable_interrogative_upspeak,
+                )
+                wavs.append(wave_to_wav_bytes(wave, query.outputSamplingRate))
+            return wavs
+
+        return await _run_synthesis(request, synthesize)
+
+    async def _synthesize_missing_cancellable(
+        engine: CancellableEngine,
+        request: Request,
+        queries: list[AudioQuery],
+        style_id: StyleId,
+        enable_interrogative_upspeak: bool,
+        version: str | LatestVersion,
+    ) -> list[bytes]:
+        """キャンセル可能なサブプロセスで複数の音声をまとめて合成する。"""
+        job = MultiJob(queries, style_id, enable_interrogative_upspeak, version)
+        wavs = await engine.run_job(job, request)
+        if wavs is None:
+            raise HTTPException(status_code=422, detail="不明なバージョンです")
+        return wavs
+
     @router.post(
         "/audio_query",
         tags=["クエリ作成"],
@@ -268,8 +453,9 @@ def generate_tts_pipeline_router(
         tags=["音声合成"],
         summary="音声合成する",
     )
-    def synthesis(
+    async def synthesis(
         query: AudioQuery,
+        request: Request,
         style_id: Annotated[StyleId, Query(alias="speaker")],
         enable_interrogative_upspeak: Annotated[
             bool,
@@ -278,23 +464,84 @@ def generate_tts_pipeline_router(
             ),
         ] = True,
         core_version: str | SkipJsonSchema[None] = None,
-    ) -> FileResponse:
+    ) -> Response:
         version = core_version or LATEST_VERSION
+        if wave_cache is not None:
+            wavs = await _synthesize_wavs(
+                request,
+                [query],
+                style_id,
+                enable_interrogative_upspeak,
+                version,
+                use_cancellable_engine=False,
+            )
+            return await run_in_threadpool(_wav_response, wavs[0])
+
         engine = tts_engines.get_tts_engine(version)
-        wave = engine.synthesize_wave(
-            query, style_id, enable_interrogative_upspeak=enable_interrogative_upspeak
-        )
 
-        with NamedTemporaryFile(delete=False) as f:
-            soundfile.write(
-                file=f, data=wave, samplerate=query.outputSamplingRate, format="WAV"
+        def synthesize() -> Response:
+            wave = engine.synthesize_wave(
+                query,
+                style_id,
+                enable_interrogative_upspeak=enable_interrogative_upspeak,
             )
+            return _wav_response(wave_to_wav_bytes(wave, query.outputSamplingRate))
 
-        return FileResponse(
-            f.name,
-            media_type="audio/wav",
-            background=BackgroundTask(try_delete_file, f.name),
-        )
+        return await _run_synthesis(request, synthesize)
+
+    @router.post(
+        "/streaming_synthesis",
+        response_class=StreamingResponse,
+        responses={
+            200: {
+                "content": {
+                    "audio/wav": {"schema": {"type": "string", "format": "binary"}}
+                },
+            }
+        },
+        tags=["音声合成"],
+        summary="音声合成し、生成できた区間から順に音声を送信する",
+    )
+    async def streaming_synthesis(
+        query: AudioQuery,
+        request: Request,
+        style_id: Annotated[StyleId, Query(alias="speaker")],
+        enable_interrogative_upspeak: Annotated[
+            bool,
+            Query(
+                description="疑問系のテキストが与えられたら語尾を自動調整する",
+            ),
+        ] = True,
+        core_version: str | SkipJsonSchema[None] = None,
+    ) -> StreamingResponse:
+        """
+        文中の無音区間で区切られた区間ごとに音声を合成し、合成できた区間から順に送信します。
+
+        音声はデータ長が未確定な 16 bit リニア PCM の WAV 形式で送信されます。
+        """
+        version = core_version or LATEST_VERSION
+        engine = tts_engines.get_tts_engine(version)
+        sampling_rate = query.outputSamplingRate
+        num_channels = 2 if query.outputStereo else 1
+
+        def start_stream() -> tuple[bytes, Iterator[NDArray[np.float32]]]:
+            waves = engine.synthesize_wave_stream(
+                query,
+                style_id,
+                enable_interrogative_upspeak=enable_interrogative_upspeak,
+            )
+            return wave_to_pcm16_bytes(next(waves)), waves
+
+        # NOTE: 応答の送信開始後はエラーを返せないため、クエリの検証と最初の区間の合成を送信前に行う
+        first_pcm, waves = await _run_synthesis(request, start_stream)
+
+        def generate_wav_stream() -> Iterator[bytes]:
+            yield generate_streaming_wav_header(sampling_rate, num_channels)
+            yield first_pcm
+            for wave in waves:
+                yield wave_to_pcm16_bytes(wave)
+
+        return StreamingResponse(generate_wav_stream(), media_type="audio/wav")
 
     @router.post(
         "/cancellable_synthesis",
@@ -309,39 +556,43 @@ def generate_tts_pipeline_router(
         tags=["音声合成"],
         summary="音声合成する（キャンセル可能）",
     )
-    def cancellable_synthesis(
+    async def cancellable_synthesis(
         query: AudioQuery,
         request: Request,
         style_id: Annotated[StyleId, Query(alias="speaker")],
         enable_interrogative_upspeak: bool = True,
         core_version: str | SkipJsonSchema[None] = None,
-    ) -> FileResponse:
+    ) -> Response:
         if cancellable_engine is None:
             raise HTTPException(
                 status_code=404,
                 detail="実験的機能はデフォルトで無効になっています。使用するには引数を指定してください。",
             )
-        try:
-            version = core_version or LATEST_VERSION
-            f_name = cancellable_engine.synthesize_wave(
-                query,
-                style_id,
-                enable_interrogative_upspeak=enable_interrogative_upspeak,
-                request=request,
-                version=version,
+        version = core_version or LATEST_VERSION
+        cache_key: str | None = None
+        if wave_cache is not None:
+            cache_key = _wave_cache_key(
+                query, style_id, enable_interrogative_upspeak, version
             )
-        except CancellableEngineInternalError as e:
-            print_exception(e)
-            raise HTTPException(status_code=500) from e
+            cached_wav = await run_in_threadpool(wave_cache.get, cache_key)
+            if cached_wav is not None:
+                return await run_in_threadpool(_wav_response, cached_wav)
+
+        wav = await cancellable_engine.synthesize_wave(
+            query,
+            style_id,
+            enable_interrogative_upspeak=enable_interrogative_upspeak,
+            request=request,
+            version=version,
+        )
 
-        if f_name == "":
+        if wav is None:
             raise HTTPException(status_code=422, detail="不明なバージョンです")
 
-        return FileResponse(
-            f_name,
-            media_type="audio/wav",
-            background=BackgroundTask(try_delete_file, f_name),
-        )
+        if wave_cache is not None and cache_key is not None:
+            await run_in_threadpool(wave_cache.put, cache_key, wav)
+
+        return await run_in_threadpool(_wav_response, wav)
 
     @router.post(
         "/multi_synthesis",
@@ -358,8 +609,9 @@ def generate_tts_pipeline_router(
         tags=["音声合成"],
         summary="複数まとめて音声合成する",
     )
-    def multi_synthesis(
+    async def multi_synthesis(
         queries: list[AudioQuery],
+        request: Request,
         style_id: Annotated[StyleId, Query(alias="speaker")],
         enable_interrogative_upspeak: Annotated[
             bool,
@@ -368,37 +620,27 @@ def generate_tts_pipeline_router(
             ),
         ] = True,
         core_version: str | SkipJsonSchema[None] = None,
-    ) -> FileResponse:
+    ) -> Response:
         version = core_version or LATEST_VERSION
-        engine = tts_engines.get_tts_engine(version)
+        tts_engines.get_tts_engine(version)  # バージョンの存在を先に確認する
         sampling_rate = queries[0].outputSamplingRate
+        if any(query.outputSamplingRate != sampling_rate for query in queries):
+            msg = "サンプリングレートが異なるクエリがあります"
+            raise HTTPException(status_code=422, detail=msg)
+
+        # NOTE: 一部のクエリを合成した後に過負荷で拒否されないよう、まとめて 1 つのジョブとして投入する
+        wavs = await _synthesize_wavs(
+            request,
+            queries,
+            style_id,
+            enable_interrogative_upspeak,
+            version,
+            use_cancellable_engine=True,
+        )
 
-        with NamedTemporaryFile(delete=False) as f:
-            with zipfile.ZipFile(f, mode="a") as zip_file:
-                for i in range(len(queries)):
-                    if queries[i].outputSamplingRate != sampling_rate:
-                        msg = "サンプリングレートが異なるクエリがあります"
-                        raise HTTPException(status_code=422, detail=msg)
-
-                    with TemporaryFile() as wav_file:
-                        wave = engine.synthesize_wave(
-                            queries[i],
-                            style_id,
-                            enable_interrogative_upspeak=enable_interrogative_upspeak,
-                        )
-                        soundfile.write(
-                            file=wav_file,
-                            data=wave,
-                            samplerate=sampling_rate,
-                            format="WAV",
-                        )
-                        wav_file.seek(0)
-                        zip_file.writestr(f"{str(i + 1).zfill(3)}.wav", wav_file.read())
-
-        return FileResponse(
-            f.name,
-            media_type="application/zip",
-            background=BackgroundTask(try_delete_file, f.name),
+        files = {f"{str(i + 1).zfill(3)}.wav": wav for i, wav in enumerate(wavs)}
+        return await run_in_threadpool(
+            generate_zip_response, files, output_file_threshold_bytes
         )
 
     @router.post(
@@ -482,30 +724,36 @@ def generate_tts_pipeline_router(
         },
         tags=["音声合成"],
     )
-    def frame_synthesis(
+    async def frame_synthesis(
         query: FrameAudioQuery,
+        request: Request,
         style_id: Annotated[StyleId, Query(alias="speaker")],
         core_version: str | SkipJsonSchema[None] = None,
-    ) -> FileResponse:
+    ) -> Response:
         """歌唱音声合成を行います。"""
         version = core_version or LATEST_VERSION
         engine = song_engines.get_song_engine(version)
-        try:
+
+        if cancellable_engine is not None:
+            try:
+                wavs = await cancellable_engine.run_job(
+                    FrameJob(query, style_id, version), request
+                )
+            except SongInvalidInputError as e:
+                raise HTTPException(status_code=400, detail=str(e)) from e
+            if wavs is None:
+                raise HTTPException(status_code=422, detail="不明なバージョンです")
+            return await run_in_threadpool(_wav_response, wavs[0])
+
+        def synthesize() -> Response:
             wave = engine.frame_synthesize_wave(query, style_id)
+            return _wav_response(wave_to_wav_bytes(wave, query.outputSamplingRate))
+
+        try:
+            return await _run_synthesis(request, synthesize)
         except SongInvalidInputError as e:
             raise HTTPException(status_code=400, detail=str(e)) from e
 
-        with NamedTemporaryFile(delete=False) as f:
-            soundfile.write(
-                file=f, data=wave, samplerate=query.outputSamplingRate, format="WAV"
-            )
-
-        return FileResponse(
-            f.name,
-            media_type="audio/wav",
-            background=BackgroundTask(try_delete_file, f.name),
-        )
-
     @router.post(
         "/connect_waves",
         response_class=FileResponse,
@@ -519,26 +767,14 @@ def generate_tts_pipeline_router(
         tags=["その他"],
         summary="base64エンコードされた複数のwavデータを一つに結合する",
     )
-    def connect_waves(waves: list[str]) -> FileResponse:
+    def connect_waves(waves: list[str]) -> Response:
         """base64エンコードされたwavデータを一纏めにし、wavファイルで返します。"""
         try:
             waves_nparray, sampling_rate = connect_base64_waves(waves)
         except ConnectBase64WavesException as e:
             raise HTTPException(status_code=422, detail=str(e)) from e
 
-        with NamedTemporaryFile(delete=False) as f:
-            soundfile.write(
-                file=f,
-                data=waves_nparray,
-                samplerate=sampling_rate,
-                format="WAV",
-            )
-
-        return FileResponse(
-            f.name,
-            media_type="audio/wav",
-            background=BackgroundTask(try_delete_file, f.name),
-        )
+        return _wav_response(wave_to_wav_bytes(waves_nparray, sampling_rate))
 
     @router.post(
         "/validate_kana",
@@ -609,4 +845,13 @@ def generate_tts_pipeline_router(
             raise HTTPException(status_code=422, detail="非対応の機能です。")
         return SupportedDevicesInfo.generate_from(supported_devices)
 
+    @router.get("/wave_cache_stats", include_in_schema=False)
+    def wave_cache_stats() -> WaveCacheStats:
+        """音声キャッシュの利用状況を返します。"""
+        if wave_cache is None:
+            raise HTTPException(
+                status_code=404, detail="音声キャッシュは無効になっています。"
+            )
+        return wave_cache.stats()
+
     return router
@@ -10,10 +10,16 @@ from voicevox_engine.user_dict.model import (
     USER_DICT_MAX_PRIORITY,
     USER_DICT_MIN_PRIORITY,
     UserDictWord,
+    UserDictWordOperations,
+    UserDictWordOperationsResult,
     WordTypes,
 )
 from voicevox_engine.user_dict.user_dict_manager import UserDictionary
-from voicevox_engine.user_dict.user_dict_word import UserDictInputError, WordProperty
+from voicevox_engine.user_dict.user_dict_word import (
+    UserDictInputError,
+    UserDictWordOperationsError,
+    WordProperty,
+)
 
 from ..dependencies import VerifyMutabilityAllowed
 
@@ -171,6 +177,29 @@ def generate_user_dict_router(
                 status_code=500, detail="ユーザー辞書の更新に失敗しました。"
             ) from e
 
+    @router.post("/user_dict_words", dependencies=[Depends(verify_mutability)])
+    def apply_user_dict_word_operations(
+        operations: Annotated[
+            UserDictWordOperations,
+            Body(description="ユーザー辞書の言葉に対する一括操作"),
+        ],
+    ) -> UserDictWordOperationsResult:
+        """
+        ユーザー辞書の言葉の追加・更新・削除をまとめて行います。
+
+        全ての操作を検証した上で、辞書の保存と更新を一度だけ行います。
+        受け入れられない操作が一つでもある場合は何も変更せず、受け入れられなかった操作の一覧を 422 エラーの `detail` として返します。
+        """
+        try:
+            return user_dict.apply_word_operations(operations)
+        except UserDictWordOperationsError as e:
+            detail = [error.model_dump() for error in e.errors]
+            raise HTTPException(status_code=422, detail=detail) from e
+        except Exception as e:
+            raise HTTPException(
+                status_code=500, detail="ユーザー辞書の更新に失敗しました。"
+            ) from e
+
     @router.post(
         "/import_user_dict",
         status_code=204,
@@ -1,9 +1,24 @@
 """キャンセル可能な音声合成"""
 
 import asyncio
+import contextlib
+import math
+import os
 import sys
+import threading
+import time
+import warnings
+import weakref
+from collections import deque
+from dataclasses import dataclass
+from functools import lru_cache
 from multiprocessing import Pipe, Process
-from queue import Queue
+from multiprocessing.shared_memory import SharedMemory
+from queue import Empty, Queue
+from typing import Final, TypeAlias
+
+import numpy as np
+from numpy.typing import NDArray
 
 if sys.platform == "win32":
     from multiprocessing.connection import PipeConnection as ConnectionType
@@ -11,15 +26,101 @@ else:
     from multiprocessing.connection import Connection as ConnectionType
 
 from pathlib import Path
-from tempfile import NamedTemporaryFile
 
-import soundfile
 from fastapi import Request
+from starlette.concurrency import run_in_threadpool
 
 from .core.core_initializer import initialize_cores
 from .metas.metas import StyleId
+from .metrics import time_stage
 from .model import AudioQuery
-from .tts_pipeline.tts_engine import LatestVersion, make_tts_engines_from_cores
+from .morphing.morphing import synthesis_morphing_parameter, synthesize_morphed_wave
+from .tts_pipeline.model import FrameAudioQuery
+from .tts_pipeline.song_engine import (
+    MockSongEngineNotFound,
+    SongEngineManager,
+    SongEngineNotFound,
+    SongInvalidInputError,
+    make_song_engines_from_cores,
+)
+from .tts_pipeline.tts_engine import (
+    LatestVersion,
+    MockTTSEngineNotFound,
+    TTSEngineManager,
+    TTSEngineNotFound,
+    make_tts_engines_from_cores,
+)
+from .utility.audio_utility import wav_size, wave_to_wav_bytes, write_wav
+from .utility.http_utility import wait_for_disconnect
+
+# サブプロセスが初期化を終えたことを表すメッセージ
+_READY: Final = "ready"
+
+# サブプロセスごとに確保する、WAV を受け渡す共有メモリの既定の大きさ（バイト）
+# NOTE: 48kHz ステレオで約 87 秒分。これを超える WAV はコネクションを介して送る
+DEFAULT_WAVE_BUFFER_BYTES: Final = 16 * 1024 * 1024
+
+# 待機中のプロセスの縮小を確認する間隔の上限（秒）
+_MAX_SHRINK_INTERVAL_SEC: Final = 1.0
+
+# サブプロセスの起動を直列化するロック
+_process_start_lock: Final = threading.Lock()
+
+
+@dataclass(frozen=True)
+class TalkJob:
+    """トーク音声合成のジョブ"""
+
+    query: AudioQuery
+    style_id: StyleId
+    enable_interrogative_upspeak: bool
+    version: str | LatestVersion
+
+
+@dataclass(frozen=True)
+class FrameJob:
+    """歌唱音声合成のジョブ"""
+
+    query: FrameAudioQuery
+    style_id: StyleId
+    version: str | LatestVersion
+
+
+@dataclass(frozen=True)
+class MorphJob:
+    """2 種類のスタイルでモーフィングした音声合成のジョブ"""
+
+    query: AudioQuery
+    base_style_id: StyleId
+    target_style_id: StyleId
+    morph_rate: float
+    enable_interrogative_upspeak: bool
+    version: str | LatestVersion
+
+
+@dataclass(frozen=True)
+class MultiJob:
+    """複数のクエリをまとめたトーク音声合成のジョブ"""
+
+    queries: list[AudioQuery]
+    style_id: StyleId
+    enable_interrogative_upspeak: bool
+    version: str | LatestVersion
+
+
+# サブプロセスで実行できる音声合成ジョブ
+SynthesisJob: TypeAlias = TalkJob | FrameJob | MorphJob | MultiJob
+
+# モーフィング用パラメータのキャッシュ（サブプロセスごとに持つ）
+_synthesis_morphing_parameter = lru_cache(maxsize=4)(synthesis_morphing_parameter)
+
+# 指定されたバージョンのエンジンが見つからないエラー
+_VERSION_NOT_FOUND_ERRORS: Final = (
+    TTSEngineNotFound,
+    MockTTSEngineNotFound,
+    SongEngineNotFound,
+    MockSongEngineNotFound,
+)
 
 
 class CancellableEngineInternalError(Exception):
@@ -28,6 +129,48 @@ class CancellableEngineInternalError(Exception):
     pass
 
 
+class CancellableEngineBusyError(Exception):
+    """空きプロセスを期限内に確保できなかったエラー"""
+
+    def __init__(self, message: str, retry_after_sec: int):
+        super().__init__(message)
+        self.retry_after_sec = retry_after_sec  # 再試行までに待つべき秒数の目安
+
+
+class CancellableEngineCancelledError(Exception):
+    """要求元の切断により音声合成を中断したエラー"""
+
+    pass
+
+
+def _release_wave_buffer(wave_buffer: SharedMemory | None, owner_pid: int) -> None:
+    """共有メモリを閉じて破棄する。"""
+    # NOTE: fork で引き継がれた複製がサブプロセス側で回収された場合は、メインプロセスの共有メモリを破棄しない
+    if wave_buffer is not None and os.getpid() == owner_pid:
+        wave_buffer.close()
+        wave_buffer.unlink()
+
+
+@dataclass
+class _Worker:
+    """音声合成を行うサブプロセスと、その通信手段"""
+
+    process: Process
+    connection: ConnectionType
+    wave_buffer: SharedMemory | None  # WAV を受け渡す共有メモリ
+
+    def __post_init__(self) -> None:
+        # NOTE: 待機中のまま終了する場合も共有メモリを残さないよう、終了時にも破棄する
+        self._release_wave_buffer = weakref.finalize(
+            self, _release_wave_buffer, self.wave_buffer, os.getpid()
+        )
+
+    def release(self) -> None:
+        """終了したサブプロセスの通信手段を解放する。"""
+        self.connection.close()
+        self._release_wave_buffer()
+
+
 class CancellableEngine:
     """キャンセル可能な合成をサポートする音声合成エンジン"""
 
@@ -40,49 +183,276 @@ class CancellableEngine:
         runtime_dirs: list[Path] | None = None,
         cpu_num_threads: int | None = None,
         enable_mock: bool = True,
+        spare_processes: int = 0,
+        wave_buffer_bytes: int = DEFAULT_WAVE_BUFFER_BYTES,
+        max_processes: int | None = None,
+        scale_up_waiters: int = 0,
+        idle_timeout_sec: float | None = None,
+        acquire_timeout_sec: float | None = None,
     ) -> None:
-        """init_processesの数だけ同時処理できるエンジンを立ち上げる。その他の引数はcore_initializerを参照。"""
+        """
+        init_processesの数だけ同時処理できるエンジンを立ち上げる。その他の引数はcore_initializerを参照。
+
+        プロセスは初期化を終えてから待機中プールへ加わる。
+        spare_processes を指定した場合、その数の初期化済みのプロセスを予備として待機させ、
+        終了したプロセスの代わりに直ちに用いる。
+        合成した WAV は、プロセスごとに確保した wave_buffer_bytes バイトの共有メモリを介して受け取る。
+        0 を指定した場合、共有メモリを用いずコネクションを介して受け取る。
+
+        max_processes に init_processes より大きい値を指定した場合、プロセス数を需要に応じて増減させる。
+        空きプロセスを待つ要求の数が、起動中のプロセス数に scale_up_waiters を加えた数を超えると、max_processes までプロセスを追加する。
+        idle_timeout_sec を指定した場合、その秒数を超えて待機したプロセスを init_processes まで終了する。
+        acquire_timeout_sec を指定した場合、その秒数のうちに空きプロセスを確保できない要求は `CancellableEngineBusyError` で拒否する。
+        """
+        if max_processes is not None and max_processes < init_processes:
+            raise ValueError("max_processes は init_processes 以上である必要があります")
         self.use_gpu = use_gpu
         self.voicelib_dirs = voicelib_dirs
         self.voicevox_dir = voicevox_dir
         self.runtime_dirs = runtime_dirs
         self.cpu_num_threads = cpu_num_threads
         self.enable_mock = enable_mock
+        self.wave_buffer_bytes = wave_buffer_bytes
+        self._min_processes = init_processes
+        self._max_processes = init_processes if max_processes is None else max_processes
+        self._scale_up_waiters = scale_up_waiters
+        self._idle_timeout_sec = idle_timeout_sec
+        self._acquire_timeout_sec = acquire_timeout_sec
 
         # 実行中プール
         # 「実行されているリクエスト」と「そのリクエストを処理しているプロセス」のペアのリスト
         self._actives_pool: list[tuple[Request, Process]] = []
 
         # 待機中プール
-        # 「待機しているプロセス」と「そのプロセスへのコネクション」のペアのキュー
-        self._idles_pool: Queue[tuple[Process, ConnectionType]] = Queue()
+        # 「待機しているプロセス」と「待機を始めた時刻」のペアのキュー（待機を始めた時刻が古い順）
+        self._idles_pool: deque[tuple[_Worker, float]] = deque()
+
+        # 空きプロセスを待つ要求のキュー
+        # 「要求を処理しているイベントループ」と「プロセスを受け取る Future」のペアのキュー（到着順）
+        self._waiters: deque[
+            tuple[asyncio.AbstractEventLoop, asyncio.Future[_Worker]]
+        ] = deque()
+
+        # 予備プール
+        # 終了したプロセスを置き換えるために初期化済みの状態で待機するプロセスのキュー
+        self._spares_pool: Queue[_Worker] = Queue()
+
+        # NOTE: 空きプロセスの確保時に、ロックを保持したままプロセスを追加するため再入可能にする
+        self._lock = threading.RLock()
+        self._num_processes = 0  # 予備を除く、待機中・実行中・起動中のプロセス数
+        self._num_pending = (
+            0  # 起動中で、初期化を終え次第待機中プールへ加わるプロセス数
+        )
+        self._num_starting = 0  # 起動中（初期化中）のプロセス数
+        self._num_replaced = 0  # 終了したプロセスを置き換えた回数
 
-        # 指定された数のプロセスを起動し待機中プールへ移動する
+        # 指定された数のプロセスを起動し、初期化を終え次第それぞれのプールへ移動する
         for _ in range(init_processes):
-            self._idles_pool.put(self._start_new_process())
-
-    def _start_new_process(self) -> tuple[Process, ConnectionType]:
-        """音声合成可能な新しいプロセスを開始し、そのプロセスと、プロセスへのコネクションを返す。"""
-        connection_outer, connection_inner = Pipe(True)
-        new_process = Process(
-            target=start_synthesis_subprocess,
-            kwargs={
-                "use_gpu": self.use_gpu,
-                "voicelib_dirs": self.voicelib_dirs,
-                "voicevox_dir": self.voicevox_dir,
-                "runtime_dirs": self.runtime_dirs,
-                "cpu_num_threads": self.cpu_num_threads,
-                "enable_mock": self.enable_mock,
-                "connection": connection_inner,
-            },
-            daemon=True,
-        )
-        new_process.start()
-        return new_process, connection_outer
+            self._start_process()
+        for _ in range(spare_processes):
+            self._start_process(spare=True)
+
+        if idle_timeout_sec is not None:
+            threading.Thread(
+                target=self._shrink_idle_processes,
+                args=(idle_timeout_sec,),
+                daemon=True,
+            ).start()
+
+    @property
+    def num_processes(self) -> int:
+        """予備を除く、待機中・実行中・起動中のプロセス数を取得する。"""
+        with self._lock:
+            return self._num_processes
+
+    @property
+    def num_active_processes(self) -> int:
+        """音声合成を実行中のプロセス数を取得する。"""
+        return len(self._actives_pool)
+
+    @property
+    def num_idle_processes(self) -> int:
+        """待機中のプロセス数を取得する。"""
+        with self._lock:
+            return len(self._idles_pool)
+
+    @property
+    def num_spare_processes(self) -> int:
+        """初期化済みの予備のプロセス数を取得する。"""
+        return self._spares_pool.qsize()
+
+    @property
+    def num_starting_processes(self) -> int:
+        """起動中（初期化中）のプロセス数を取得する。"""
+        with self._lock:
+            return self._num_starting
+
+    @property
+    def num_replaced_processes(self) -> int:
+        """終了したプロセスを置き換えた回数を取得する。"""
+        with self._lock:
+            return self._num_replaced
+
+    @property
+    def num_waiting_requests(self) -> int:
+        """空きプロセスを待っている要求の数を取得する。"""
+        with self._lock:
+            return len(self._waiters)
+
+    def _start_process(self, spare: bool = False) -> None:
+        """新しいプロセスをバックグラウンドで起動し、初期化を終え次第、待機中プールまたは予備プールへ移動する。"""
+        with self._lock:
+            self._num_starting += 1
+            if not spare:
+                self._num_processes += 1
+                self._num_pending += 1
+
+        def start() -> None:
+            try:
+                worker = self._start_new_process()
+                try:
+                    ready = worker.connection.recv()
+                except EOFError:
+                    ready = None
+                if ready != _READY:
+                    worker.process.join()
+                    worker.release()
+                    if not spare:
+                        with self._lock:
+                            self._num_processes -= 1
+                    msg = "キャンセル可能な音声合成のプロセスの初期化に失敗しました。"
+                    warnings.warn(msg, stacklevel=1)
+                    return
+                if spare:
+                    self._spares_pool.put(worker)
+                else:
+                    self._put_idle(worker)
+            finally:
+                with self._lock:
+                    self._num_starting -= 1
+                    if not spare:
+                        self._num_pending -= 1
+
+        threading.Thread(target=start, daemon=True).start()
+
+    def _put_idle(self, worker: _Worker) -> None:
+        """プロセスを空きプロセスとする。空きプロセスを待つ要求があれば、最も古い要求へ渡す。"""
+        with self._lock:
+            while len(self._waiters) != 0:
+                loop, waiter = self._waiters.popleft()
+                if waiter.done():
+                    continue
+                try:
+                    loop.call_soon_threadsafe(self._deliver, waiter, worker)
+                except RuntimeError:
+                    # イベントループが既に閉じている
+                    continue
+                return
+            self._idles_pool.append((worker, time.monotonic()))
+
+    def _deliver(self, waiter: asyncio.Future[_Worker], worker: _Worker) -> None:
+        """空きプロセスを待つ要求へプロセスを渡す。要求が既に待つのをやめていれば、空きプロセスへ戻す。"""
+        if waiter.done():
+            self._put_idle(worker)
+        else:
+            waiter.set_result(worker)
+
+    async def _acquire(self) -> _Worker:
+        """
+        空きプロセスを確保する。
 
-    def _finalize_con(
-        self, req: Request, proc: Process, sub_proc_con: ConnectionType | None
-    ) -> None:
+        空きプロセスが無い場合は、空きが出るまで待つ。待つ要求が多い場合はプロセスを追加する。
+        期限までに確保できない場合は `CancellableEngineBusyError` を送出する。
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if len(self._idles_pool) != 0:
+                # NOTE: 最後に待機を始めたプロセスから用いて、長く待機するプロセスを縮小の対象とする
+                worker, _ = self._idles_pool.pop()
+                return worker
+            waiter: asyncio.Future[_Worker] = loop.create_future()
+            self._waiters.append((loop, waiter))
+            while (
+                len(self._waiters) > self._num_pending + self._scale_up_waiters
+                and self._num_processes < self._max_processes
+            ):
+                self._start_process()
+        try:
+            return await asyncio.wait_for(waiter, self._acquire_timeout_sec)
+        except TimeoutError as e:
+            timeout_sec = self._acquire_timeout_sec or 0
+            raise CancellableEngineBusyError(
+                "キャンセル可能な音声合成の空きプロセスを期限内に確保できませんでした。",
+                max(math.ceil(timeout_sec), 1),
+            ) from e
+        finally:
+            with self._lock, contextlib.suppress(ValueError):
+                self._waiters.remove((loop, waiter))
+
+    def _shrink_idle_processes(self, idle_timeout_sec: float) -> None:
+        """一定時間を超えて待機したプロセスを、プロセス数が下限に達するまで終了するループを実行する。"""
+        while True:
+            time.sleep(min(idle_timeout_sec / 2, _MAX_SHRINK_INTERVAL_SEC))
+            expired: list[_Worker] = []
+            with self._lock:
+                now = time.monotonic()
+                while (
+                    len(self._idles_pool) != 0
+                    and self._num_processes > self._min_processes
+                    and now - self._idles_pool[0][1] >= idle_timeout_sec
+                ):
+                    worker, _ = self._idles_pool.popleft()
+                    self._num_processes -= 1
+                    expired.append(worker)
+            for worker in expired:
+                worker.process.terminate()
+                worker.process.join()
+                worker.process.close()
+                worker.release()
+
+    def _replace_process(self) -> None:
+        """終了したプロセスの代わりを待機中プールへ補充する。予備があれば直ちに補充し、予備を作り直す。"""
+        with self._lock:
+            self._num_replaced += 1
+        try:
+            spare = self._spares_pool.get_nowait()
+        except Empty:
+            self._start_process()
+            return
+        with self._lock:
+            self._num_processes += 1
+        self._put_idle(spare)
+        self._start_process(spare=True)
+
+    def _start_new_process(self) -> _Worker:
+        """音声合成可能な新しいプロセスを開始し、そのプロセスと通信手段を返す。"""
+        # NOTE: 子プロセス側の端点が同時に起動する他のプロセスへ引き継がれると、
+        #       プロセスが終了しても親プロセス側で EOFError を受け取れないため、起動を直列化する
+        with _process_start_lock:
+            wave_buffer = None
+            if self.wave_buffer_bytes > 0:
+                wave_buffer = SharedMemory(create=True, size=self.wave_buffer_bytes)
+            connection_outer, connection_inner = Pipe(True)
+            new_process = Process(
+                target=start_synthesis_subprocess,
+                kwargs={
+                    "use_gpu": self.use_gpu,
+                    "voicelib_dirs": self.voicelib_dirs,
+                    "voicevox_dir": self.voicevox_dir,
+                    "runtime_dirs": self.runtime_dirs,
+                    "cpu_num_threads": self.cpu_num_threads,
+                    "enable_mock": self.enable_mock,
+                    "connection": connection_inner,
+                    "wave_buffer": wave_buffer,
+                },
+                daemon=True,
+            )
+            new_process.start()
+            # NOTE: プロセスが終了した際に親プロセス側で EOFError を受け取れるよう、子プロセス側の端点を閉じる
+            connection_inner.close()
+        return _Worker(new_process, connection_outer, wave_buffer)
+
+    def _finalize_con(self, req: Request, worker: _Worker, reuse: bool) -> None:
         """
         プロセスを後処理する
 
@@ -90,39 +460,43 @@ class CancellableEngine:
         ----------
         req:
             HTTP 接続状態に関するオブジェクト
-        proc:
+        worker:
             音声合成を行っていたプロセス
-        sub_proc_con:
-            音声合成を行っていたプロセスとのコネクション
-            指定されていない場合、プロセスは再利用されず終了される
+        reuse:
+            プロセスを再利用するか否か。False の場合、プロセスは再利用されず終了される
         """
         # ペアを実行中プールから除外する
         try:
-            self._actives_pool.remove((req, proc))
+            self._actives_pool.remove((req, worker.process))
         except ValueError:
             pass
 
-        # ペアを待機中プールへ移動する
+        # プロセスを待機中プールへ移動する
         try:
-            if not proc.is_alive() or sub_proc_con is None:
-                proc.close()
+            if not worker.process.is_alive() or not reuse:
+                worker.process.close()
                 raise ValueError
             # プロセスが死んでいないので再利用する
-            self._idles_pool.put((proc, sub_proc_con))
+            self._put_idle(worker)
         except ValueError:
-            # プロセスが死んでいるので新しく作り直す
-            self._idles_pool.put(self._start_new_process())
+            # プロセスが死んでいるので、通信手段を解放して新しく作り直す
+            worker.release()
+            with self._lock:
+                self._num_processes -= 1
+            self._replace_process()
 
-    def synthesize_wave(
+    async def synthesize_wave(
         self,
         query: AudioQuery,
         style_id: StyleId,
         enable_interrogative_upspeak: bool,
         request: Request,
         version: str | LatestVersion,
-    ) -> str:
+    ) -> bytes | None:
         """
-        サブプロセスで音声合成用のクエリ・スタイルIDから音声を生成し、音声ファイル名を返す。
+        サブプロセスで音声合成用のクエリ・スタイルIDから音声を生成し、WAV バイト列を返す。
+
+        指定されたバージョンの TTSEngine が存在しない場合は None を返す。送出するエラーは `run_job` を参照。
 
         Parameters
         ----------
@@ -131,47 +505,157 @@ class CancellableEngine:
         version:
             合成に用いる TTSEngine のバージョン
         """
-        # 待機中プールのペアを実行中プールへ移動する
-        synth_process, synth_connection = self._idles_pool.get()
-        self._actives_pool.append((request, synth_process))
+        job = TalkJob(query, style_id, enable_interrogative_upspeak, version)
+        wavs = await self.run_job(job, request)
+        return None if wavs is None else wavs[0]
 
-        # プロセスへ入力を渡して音声を合成する
+    async def run_job(self, job: SynthesisJob, request: Request) -> list[bytes] | None:
+        """
+        サブプロセスで音声合成ジョブを実行し、生成した音声の WAV バイト列のリストを返す。
+
+        ジョブに指定されたバージョンのエンジンが存在しない場合は None を返す。
+        合成中に要求元が切断した場合、その時点でプロセスを終了して新しいプロセスに置き換え、`CancellableEngineCancelledError` を送出する。
+        空きプロセスを期限内に確保できない場合は `CancellableEngineBusyError` を送出する。
+        歌唱音声合成の入力が不正な場合は `SongInvalidInputError` を送出する。
+
+        Parameters
+        ----------
+        job:
+            音声合成ジョブ
+        request:
+            HTTP 接続状態に関するオブジェクト
+        """
+        # 空きプロセスを確保して実行中プールへ移動する
+        with time_stage("cancellable_process_wait"):
+            worker = await self._acquire()
+        self._actives_pool.append((request, worker.process))
+
+        # プロセスへジョブを渡して音声を合成しつつ、要求元の切断を待ち受ける
+        synthesis = asyncio.ensure_future(run_in_threadpool(_communicate, worker, job))
+        disconnection = asyncio.ensure_future(wait_for_disconnect(request))
         try:
-            synth_connection.send(
-                (query, style_id, enable_interrogative_upspeak, version)
+            await asyncio.wait(
+                [synthesis, disconnection], return_when=asyncio.FIRST_COMPLETED
             )
-            audio_file_name = synth_connection.recv()
-
-            if not isinstance(audio_file_name, str):
-                # ここには来ないはず
-                raise CancellableEngineInternalError("不正な値が生成されました")
-        except EOFError as e:
-            raise CancellableEngineInternalError(
-                "既にサブプロセスは終了されています"
-            ) from e
-        except Exception:
-            self._finalize_con(request, synth_process, synth_connection)
-            raise
-        self._finalize_con(request, synth_process, synth_connection)
+        finally:
+            disconnection.cancel()
+
+        if not synthesis.done():
+            # 要求元が切断したため、合成中のプロセスを終了する
+            worker.process.terminate()
+            # NOTE: プロセスの終了によりコネクションが閉じ、合成を待つスレッドは EOFError で抜ける
+            with contextlib.suppress(Exception):
+                await synthesis
+            await run_in_threadpool(worker.process.join)
+            self._finalize_con(request, worker, reuse=False)
+            raise CancellableEngineCancelledError("要求元が切断しました")
 
-        return audio_file_name
+        try:
+            wavs = synthesis.result()
+        finally:
+            self._finalize_con(request, worker, reuse=True)
+        return wavs
 
-    async def catch_disconnection(self) -> None:
-        """接続監視を行うコルーチン。"""
-        while True:
-            await asyncio.sleep(1)
-            for con in self._actives_pool:
-                req, proc = con
-                if await req.is_disconnected():
-                    try:
-                        if proc.is_alive():
-                            proc.terminate()
-                            proc.join()
-                        proc.close()
-                    except ValueError:
-                        pass
-                    finally:
-                        self._finalize_con(req, proc, None)
+
+def _communicate(worker: _Worker, job: SynthesisJob) -> list[bytes] | None:
+    """
+    サブプロセスへ音声合成ジョブを送り、WAV バイト列のリストを受け取る。
+
+    サブプロセスは WAV を共有メモリへ先頭から順に書き込んでそれぞれの長さを返すか、
+    共有メモリに収まらない場合は WAV バイト列そのものを返す。
+    """
+    try:
+        worker.connection.send(job)
+        result = worker.connection.recv()
+    except EOFError as e:
+        raise CancellableEngineInternalError(
+            "既にサブプロセスは終了されています"
+        ) from e
+    if result is None:
+        return None
+    if isinstance(result, SongInvalidInputError):
+        raise result
+    if not isinstance(result, list):
+        # ここには来ないはず
+        raise CancellableEngineInternalError("不正な値が生成されました")
+    wave_view = None if worker.wave_buffer is None else worker.wave_buffer.buf
+    if all(isinstance(size, int) for size in result) and wave_view is not None:
+        # NOTE: 共有メモリは次の合成で上書きされるため複製する
+        wavs = []
+        offset = 0
+        for size in result:
+            wavs.append(bytes(wave_view[offset : offset + size]))
+            offset += size
+        return wavs
+    if not all(isinstance(wav, bytes) for wav in result):
+        # ここには来ないはず
+        raise CancellableEngineInternalError("不正な値が生成されました")
+    return result
+
+
+def _run_job(
+    job: SynthesisJob,
+    tts_engines: TTSEngineManager,
+    song_engines: SongEngineManager,
+) -> list[tuple[NDArray[np.float32], int]]:
+    """音声合成ジョブを実行し、生成した音声波形とそのサンプリングレートの組のリストを返す。"""
+    if isinstance(job, TalkJob):
+        engine = tts_engines.get_tts_engine(job.version)
+        wave = engine.synthesize_wave(
+            job.query,
+            job.style_id,
+            enable_interrogative_upspeak=job.enable_interrogative_upspeak,
+        )
+        return [(wave, job.query.outputSamplingRate)]
+    if isinstance(job, FrameJob):
+        song_engine = song_engines.get_song_engine(job.version)
+        wave = song_engine.frame_synthesize_wave(job.query, job.style_id)
+        return [(wave, job.query.outputSamplingRate)]
+    if isinstance(job, MorphJob):
+        engine = tts_engines.get_tts_engine(job.version)
+        morph_param = _synthesis_morphing_parameter(
+            engine=engine,
+            query=job.query,
+            base_style_id=job.base_style_id,
+            target_style_id=job.target_style_id,
+            enable_interrogative_upspeak=job.enable_interrogative_upspeak,
+        )
+        wave = synthesize_morphed_wave(
+            morph_param=morph_param,
+            morph_rate=job.morph_rate,
+            output_fs=job.query.outputSamplingRate,
+            output_stereo=job.query.outputStereo,
+        )
+        return [(wave, job.query.outputSamplingRate)]
+    engine = tts_engines.get_tts_engine(job.version)
+    return [
+        (
+            engine.synthesize_wave(
+                query,
+                job.style_id,
+                enable_interrogative_upspeak=job.enable_interrogative_upspeak,
+            ),
+            query.outputSamplingRate,
+        )
+        for query in job.queries
+    ]
+
+
+def _encode_waves(
+    waves: list[tuple[NDArray[np.float32], int]], wave_view: memoryview | None
+) -> list[int] | list[bytes]:
+    """
+    音声波形を WAV 形式へエンコードする。
+
+    全ての WAV が共有メモリに収まる場合は先頭から順に書き込んでそれぞれの長さを返し、収まらない場合は WAV バイト列を返す。
+    """
+    sizes = [wav_size(wave) for wave, _ in waves]
+    if wave_view is None or sum(sizes) > len(wave_view):
+        return [wave_to_wav_bytes(wave, sampling_rate) for wave, sampling_rate in waves]
+    offset = 0
+    for wave, sampling_rate in waves:
+        offset += write_wav(wave, sampling_rate, wave_view[offset:])
+    return sizes
 
 
 # NOTE: pickle化の関係でグローバルに書いている
@@ -183,6 +667,7 @@ def start_synthesis_subprocess(
     cpu_num_threads: int | None,
     enable_mock: bool,
     connection: ConnectionType,
+    wave_buffer: SharedMemory | None = None,
 ) -> None:
     """
     コネクションへの入力に応答して音声合成するループを実行する
@@ -194,7 +679,12 @@ def start_synthesis_subprocess(
     ----------
     connection:
         メインプロセスと通信するためのコネクション
+    wave_buffer:
+        WAV を書き込む共有メモリ。指定されていない場合、WAV バイト列をコネクションを介して送る
+        共有メモリの破棄はメインプロセスが担う
     """
+    wave_view = None if wave_buffer is None else wave_buffer.buf
+
     # 音声合成エンジンを用意する
     core_manager = initialize_cores(
         use_gpu=use_gpu,
@@ -206,31 +696,28 @@ def start_synthesis_subprocess(
     )
     tts_engines = make_tts_engines_from_cores(core_manager)
     assert len(tts_engines.versions()) != 0, "音声合成エンジンがありません。"
+    song_engines = make_song_engines_from_cores(core_manager)
+    connection.send(_READY)
 
     while True:
         try:
             # キューの入力を受け取る
-            query, style_id, enable_interrogative_upspeak, version = connection.recv()
+            job = connection.recv()
 
-            # 音声を合成しファイルへ保存する
+            # ジョブを実行して音声を合成する
             try:
-                _engine = tts_engines.get_tts_engine(version)
-            except Exception:
+                waves = _run_job(job, tts_engines, song_engines)
+            except _VERSION_NOT_FOUND_ERRORS:
                 # コネクションを介して「バージョンが見つからないエラー」を送信する
-                connection.send("")  # `""` をエラーして扱う
+                connection.send(None)  # `None` をエラーとして扱う
+                continue
+            except SongInvalidInputError as e:
+                # 不正な入力によるエラーはメインプロセスで送出し直す
+                connection.send(e)
                 continue
-            wave = _engine.synthesize_wave(
-                query,
-                style_id,
-                enable_interrogative_upspeak=enable_interrogative_upspeak,
-            )
-            with NamedTemporaryFile(delete=False) as f:
-                soundfile.write(
-                    file=f, data=wave, samplerate=query.outputSamplingRate, format="WAV"
-                )
 
-            # コネクションを介してファイル名を送信する
-            connection.send(f.name)
+            # 共有メモリへ WAV を書き込みそれぞれの長さを送信する。収まらない場合はコネクションを介して WAV バイト列を送信する
+            connection.send(_encode_waves(waves, wave_view))
 
         except Exception:
             connection.close()
@@ -2,15 +2,23 @@
 
 import json
 import threading
+import time
+import warnings
+import weakref
+from collections.abc import Callable, Sequence
 from dataclasses import dataclass
-from typing import Any, Literal, NewType
+from typing import Any, Literal, NewType, TypeVar
 
 import numpy as np
 from numpy.typing import NDArray
 from pydantic import TypeAdapter
 
 from ..metas.metas import StyleId
+from ..metrics import observe_stage
 from .core_wrapper import CoreWrapper, OldCoreError
+from .model_residency import ModelResidency, ModelResidencyPolicy, ModelResidencyStats
+
+T = TypeVar("T")
 
 CoreStyleId = NewType("CoreStyleId", int)
 CoreStyleType = Literal["talk", "singing_teacher", "frame_decode", "sing"]
@@ -47,17 +55,199 @@ class DeviceSupport:
     dml: bool  # DirectML (Nvidia GPU/Radeon GPU等)
 
 
+class _SharedCore:
+    """同じ `CoreWrapper` を扱う全ての `CoreAdapter` で共有する、コアの排他制御と読み込み済みスタイルの記録と常駐管理"""
+
+    def __init__(self) -> None:
+        self.mutex = threading.Lock()
+        # NOTE: サブプロセスのコアへの問い合わせを推論ごとに行わないよう、読み込み済みのスタイルを親プロセスで記録する
+        self.loaded_style_ids: set[StyleId] = set()
+        # NOTE: トーク・ソングのモデルをまとめて上限内に収め、一方のリサイクルで他方のモデルの解放を見落とさないよう共有する
+        self.residency: ModelResidency | None = None
+
+
+# NOTE: TTSEngine・SongEngine・CoreManager はそれぞれ同じコアを別の CoreAdapter で扱うため、コアごとに状態を共有する
+_shared_cores: weakref.WeakKeyDictionary[CoreWrapper, _SharedCore] = (
+    weakref.WeakKeyDictionary()
+)
+_shared_cores_lock = threading.Lock()
+
+
+def _get_shared_core(core: CoreWrapper) -> _SharedCore:
+    """コアに対応する共有状態を取得する。無ければ生成する。"""
+    with _shared_cores_lock:
+        shared_core = _shared_cores.get(core)
+        if shared_core is None:
+            shared_core = _SharedCore()
+            _shared_cores[core] = shared_core
+        return shared_core
+
+
+class _CoreInstance:
+    """推論を排他的に実行するコアのインスタンス"""
+
+    def __init__(
+        self,
+        core: CoreWrapper,
+        residency: ModelResidency | None = None,
+    ):
+        self.core = core
+        self._shared_core = _get_shared_core(core)
+        self.mutex = self._shared_core.mutex
+        self.num_calls = 0  # 実行中および実行待ちの推論呼び出し数
+        with self.mutex:
+            if residency is not None and self._shared_core.residency is None:
+                self._shared_core.residency = residency
+
+    @property
+    def residency(self) -> ModelResidency | None:
+        """このインスタンスのコアを扱う全ての CoreAdapter で共有する常駐管理。"""
+        return self._shared_core.residency
+
+    def initialize_style_id_synthesis(
+        self, style_id: StyleId, skip_reinit: bool
+    ) -> None:
+        """指定したスタイルでの音声合成をこのインスタンスで初期化する。常駐管理がある場合はスタイルの利用を記録する。"""
+        with self.mutex:
+            self._prepare_style(style_id, skip_reinit)
+
+    def is_model_loaded(self, style_id: StyleId) -> bool:
+        """指定スタイルのモデルがこのインスタンスで読み込み済みか否かを、リサイクルと排他的に問い合わせる。"""
+        with self.mutex:
+            return self.core.is_model_loaded(style_id)
+
+    def _prepare_style(self, style_id: StyleId, skip_reinit: bool) -> None:
+        """排他区間内で、必要に応じてリサイクルした上で指定スタイルのモデルを読み込む。"""
+        if self.residency is not None and self.residency.needs_recycle(style_id):
+            self._recycle(self.residency)
+        loaded_style_ids = self._shared_core.loaded_style_ids
+        # 以下の条件のいずれかを満たす場合, 初期化を実行する
+        # 1. 引数 skip_reinit が False の場合
+        # 2. キャラクターが初期化されていない場合
+        if not skip_reinit:
+            self.core.load_model(style_id)
+        elif style_id not in loaded_style_ids:
+            if not self.core.is_model_loaded(style_id):
+                self.core.load_model(style_id)
+        loaded_style_ids.add(style_id)
+        if self.residency is not None:
+            self.residency.record_use(style_id)
+
+    def _recycle(self, residency: ModelResidency) -> None:
+        """コアを初期化し直して全てのモデルを解放し、最近使われたスタイルのモデルを読み込み直す。"""
+        kept_style_ids = residency.styles_to_keep()
+        # NOTE: 途中で失敗してもコアの実際の状態より多くのモデルを読み込み済みとみなさないよう、
+        #       全てのモデルの解放を先に記録し、読み込み直せたスタイルだけを記録し直す
+        self._shared_core.loaded_style_ids.clear()
+        residency.record_recycle([])
+        try:
+            self.core.unload_all_models()
+        except OldCoreError:
+            msg = "コアが初期化し直しに対応していないため、音声合成モデルの常駐管理を無効にします。"
+            warnings.warn(msg, stacklevel=1)
+            self._shared_core.residency = None
+            return
+        for style_id in kept_style_ids:
+            self.core.load_model(style_id)
+            self._shared_core.loaded_style_ids.add(style_id)
+            residency.record_use(style_id)
+
+    def run(self, call: Callable[[CoreWrapper], T], style_id: StyleId) -> T:
+        """
+        指定スタイルを初期化した上で、推論呼び出しを排他的に実行する。
+
+        スタイルの初期化と推論は同じ排他区間で行い、その間に他の要求のリサイクルでモデルが解放されないようにする。
+        排他区間に入るまでの待ち時間を記録する。
+        """
+        start = time.perf_counter()
+        with self.mutex:
+            observe_stage("core_lock_wait", time.perf_counter() - start, style_id)
+            try:
+                self._prepare_style(style_id, skip_reinit=True)
+            except OldCoreError:
+                pass  # コアが古い場合はどうしようもないので何もしない
+            return call(self.core)
+
+
+def _make_residency(
+    policy: ModelResidencyPolicy | None, num_instances: int
+) -> ModelResidency | None:
+    """常駐設定のメモリの上限をインスタンス間で等分し、インスタンス 1 つ分の常駐管理を生成する。"""
+    if policy is None:
+        return None
+    return ModelResidency(
+        policy.memory_budget_bytes // num_instances, policy.bytes_per_style
+    )
+
+
 class CoreAdapter:
     """
     コアのアダプター。
 
     ついでにコア内部で推論している処理をプロセスセーフにする。
+    同じコアの複製が与えられた場合、推論呼び出しを実行中の呼び出しが最も少ないインスタンスへ振り分け、並列に実行する。
+    常駐設定が与えられた場合、読み込んだモデルがメモリの上限を超えないよう、最近使われていないスタイルのモデルを解放する。
+    同じコアを扱う CoreAdapter 同士は排他制御と常駐管理を共有し、モデルの解放中に他の CoreAdapter が推論しないようにする。
+    常駐管理はいずれかの CoreAdapter に常駐設定が与えられた時点から、常駐設定の無い CoreAdapter の推論にも適用される。
     """
 
-    def __init__(self, core: CoreWrapper):
+    def __init__(
+        self,
+        core: CoreWrapper,
+        replicas: Sequence[CoreWrapper] = (),
+        model_residency_policy: ModelResidencyPolicy | None = None,
+    ):
         super().__init__()
         self.core = core
-        self.mutex = threading.Lock()
+        self.replicas = list(replicas)  # `core` と同じコアの独立したインスタンス
+        instance_cores = [core, *self.replicas]
+        self._instances = [
+            _CoreInstance(
+                instance_core,
+                _make_residency(model_residency_policy, len(instance_cores)),
+            )
+            for instance_core in instance_cores
+        ]
+        self.mutex = self._instances[0].mutex
+        self._dispatch_lock = threading.Lock()
+
+    @property
+    def num_instances(self) -> int:
+        """推論を並列に実行できるコアのインスタンス数。"""
+        return len(self._instances)
+
+    def _run_exclusive(
+        self, call: Callable[[CoreWrapper], T], style_id: StyleId, stage: str
+    ) -> T:
+        """
+        推論呼び出しを、実行中の呼び出しが最も少ないインスタンスで排他的に実行する。
+
+        指定スタイルがそのインスタンスで未初期化であれば、同じ排他区間で呼び出しの前に初期化する。
+        呼び出し全体の所要時間を処理段階 `stage` として、排他区間に入るまでの待ち時間を `core_lock_wait` として記録する。
+        """
+        start = time.perf_counter()
+        with self._dispatch_lock:
+            instance = min(self._instances, key=lambda instance: instance.num_calls)
+            instance.num_calls += 1
+        try:
+            return instance.run(call, style_id)
+        finally:
+            with self._dispatch_lock:
+                instance.num_calls -= 1
+            observe_stage(stage, time.perf_counter() - start, style_id)
+
+    def pending_calls(self) -> list[int]:
+        """インスタンスごとの実行中および実行待ちの推論呼び出し数を取得する。"""
+        with self._dispatch_lock:
+            return [instance.num_calls for instance in self._instances]
+
+    def residency_stats(self) -> list[ModelResidencyStats]:
+        """インスタンスごとのモデル常駐状況を取得する。常駐管理の無いインスタンスは含まない。"""
+        return [
+            instance.residency.stats()
+            for instance in self._instances
+            if instance.residency is not None
+        ]
 
     @property
     def default_sampling_rate(self) -> int:
@@ -101,19 +291,17 @@ class CoreAdapter:
             True の場合, 既に初期化済みのキャラクターの再初期化をスキップします
         """
         try:
-            with self.mutex:
-                # 以下の条件のいずれかを満たす場合, 初期化を実行する
-                # 1. 引数 skip_reinit が False の場合
-                # 2. キャラクターが初期化されていない場合
-                if (not skip_reinit) or (not self.core.is_model_loaded(style_id)):
-                    self.core.load_model(style_id)
+            for instance in self._instances:
+                instance.initialize_style_id_synthesis(style_id, skip_reinit)
         except OldCoreError:
             pass  # コアが古い場合はどうしようもないので何もしない
 
     def is_initialized_style_id_synthesis(self, style_id: StyleId) -> bool:
         """指定したスタイルでの音声合成が初期化されているかどうかを返す"""
         try:
-            return self.core.is_model_loaded(style_id)
+            return all(
+                instance.is_model_loaded(style_id) for instance in self._instances
+            )
         except OldCoreError:
             return True  # コアが古い場合はどうしようもないのでTrueを返す
 
@@ -122,17 +310,18 @@ class CoreAdapter:
     ) -> NDArray[np.float32]:
         """音素列から音素ごとの長さを求める。"""
         # 「指定スタイルを初期化」「mutexによる安全性」「コア仕様に従う無音付加」「系列長・データ型に関するアダプター」を提供する
-        self.initialize_style_id_synthesis(style_id, skip_reinit=True)
-
         # 前後無音を付加する（詳細: voicevox_engine#924）
         phoneme_list_s = np.r_[0, phoneme_list_s, 0]
 
-        with self.mutex:
-            phoneme_length = self.core.yukarin_s_forward(
+        phoneme_length = self._run_exclusive(
+            lambda core: core.yukarin_s_forward(
                 length=len(phoneme_list_s),
                 phoneme_list=phoneme_list_s,
                 style_id=np.array(style_id, dtype=np.int64).reshape(-1),
-            )
+            ),
+            style_id,
+            "safe_yukarin_s_forward",
+        )
 
         # 前後無音に相当する領域を破棄する
         phoneme_length = phoneme_length[1:-1]
@@ -151,8 +340,6 @@ class CoreAdapter:
     ) -> NDArray[np.float32]:
         """モーラごとの音素列とアクセント情報からモーラごとの音高を求める。"""
         # 「指定スタイルを初期化」「mutexによる安全性」「コア仕様に従う無音付加」「系列長・データ型に関するアダプター」を提供する
-        self.initialize_style_id_synthesis(style_id, skip_reinit=True)
-
         # 前後無音を付加する（詳細: voicevox_engine#924）
         vowel_phoneme_list = np.r_[0, vowel_phoneme_list, 0]
         consonant_phoneme_list = np.r_[-1, consonant_phoneme_list, -1]
@@ -161,8 +348,8 @@ class CoreAdapter:
         start_accent_phrase_list = np.r_[0, start_accent_phrase_list, 0]
         end_accent_phrase_list = np.r_[0, end_accent_phrase_list, 0]
 
-        with self.mutex:
-            f0_list: NDArray[np.float32] = self.core.yukarin_sa_forward(
+        f0_list: NDArray[np.float32] = self._run_exclusive(
+            lambda core: core.yukarin_sa_forward(
                 length=vowel_phoneme_list.shape[0],
                 vowel_phoneme_list=vowel_phoneme_list[np.newaxis],
                 consonant_phoneme_list=consonant_phoneme_list[np.newaxis],
@@ -171,7 +358,10 @@ class CoreAdapter:
                 start_accent_phrase_list=start_accent_phrase_list[np.newaxis],
                 end_accent_phrase_list=end_accent_phrase_list[np.newaxis],
                 style_id=np.array(style_id, dtype=np.int64).reshape(-1),
-            )[0]
+            ),
+            style_id,
+            "safe_yukarin_sa_forward",
+        )[0]
 
         # 前後無音に相当する領域を破棄する
         f0_list = f0_list[1:-1]
@@ -186,15 +376,17 @@ class CoreAdapter:
     ) -> tuple[NDArray[np.float32], int]:
         """フレームごとの音素・音高とスタイル ID から波形を求める。"""
         # 「指定スタイルを初期化」「mutexによる安全性」「系列長・データ型に関するアダプター」を提供する
-        self.initialize_style_id_synthesis(style_id, skip_reinit=True)
-        with self.mutex:
-            wave = self.core.decode_forward(
+        wave = self._run_exclusive(
+            lambda core: core.decode_forward(
                 length=phoneme.shape[0],
                 phoneme_size=phoneme.shape[1],
                 f0=f0[:, np.newaxis],
                 phoneme=phoneme,
                 style_id=np.array(style_id, dtype=np.int64).reshape(-1),
-            )
+            ),
+            style_id,
+            "safe_decode_forward",
+        )
         sr_wave = self.default_sampling_rate
         return wave, sr_wave
 
@@ -207,16 +399,17 @@ class CoreAdapter:
     ) -> NDArray[np.int64]:
         """子音列・母音列・ノート長・スタイル ID から音素ごとの長さを求める。"""
         # 「指定スタイルを初期化」「mutexによる安全性」「コア仕様に従う無音付加」「系列長・データ型に関するアダプター」を提供する
-        self.initialize_style_id_synthesis(style_id, skip_reinit=True)
-
-        with self.mutex:
-            consonant_length = self.core.predict_sing_consonant_length_forward(
+        consonant_length = self._run_exclusive(
+            lambda core: core.predict_sing_consonant_length_forward(
                 length=consonant.shape[0],
                 consonant=consonant[np.newaxis],
                 vowel=vowel[np.newaxis],
                 note_duration=note_duration[np.newaxis],
                 style_id=np.array(style_id, dtype=np.int64).reshape(-1),
-            )
+            ),
+            style_id,
+            "safe_predict_sing_consonant_length_forward",
+        )
 
         return consonant_length
 
@@ -228,15 +421,16 @@ class CoreAdapter:
     ) -> NDArray[np.float32]:
         """フレームごとの音素・ノートとスタイル ID からフレームごとの音高を求める。"""
         # 「指定スタイルを初期化」「mutexによる安全性」「コア仕様に従う無音付加」「系列長・データ型に関するアダプター」を提供する
-        self.initialize_style_id_synthesis(style_id, skip_reinit=True)
-
-        with self.mutex:
-            f0 = self.core.predict_sing_f0_forward(
+        f0 = self._run_exclusive(
+            lambda core: core.predict_sing_f0_forward(
                 length=phoneme.shape[0],
                 phoneme=phoneme[np.newaxis],
                 note=note[np.newaxis],
                 style_id=np.array(style_id, dtype=np.int64).reshape(-1),
-            )
+            ),
+            style_id,
+            "safe_predict_sing_f0_forward",
+        )
 
         return f0
 
@@ -249,16 +443,17 @@ class CoreAdapter:
     ) -> NDArray[np.float32]:
         """フレームごとの音素・ノート・音高とスタイル ID からフレームごとの音量を求める。"""
         # 「指定スタイルを初期化」「mutexによる安全性」「コア仕様に従う無音付加」「系列長・データ型に関するアダプター」を提供する
-        self.initialize_style_id_synthesis(style_id, skip_reinit=True)
-
-        with self.mutex:
-            volume = self.core.predict_sing_volume_forward(
+        volume = self._run_exclusive(
+            lambda core: core.predict_sing_volume_forward(
                 length=phoneme.shape[0],
                 phoneme=phoneme[np.newaxis],
                 note=note[np.newaxis],
                 f0=f0[np.newaxis],
                 style_id=np.array(style_id, dtype=np.int64).reshape(-1),
-            )
+            ),
+            style_id,
+            "safe_predict_sing_volume_forward",
+        )
 
         return volume
 
@@ -271,14 +466,16 @@ class CoreAdapter:
     ) -> tuple[NDArray[np.float32], int]:
         """フレームごとの音素・音高・音量とスタイル ID から音声波形を求める。"""
         # 「指定スタイルを初期化」「mutexによる安全性」「系列長・データ型に関するアダプター」を提供する
-        self.initialize_style_id_synthesis(style_id, skip_reinit=True)
-        with self.mutex:
-            wave = self.core.sf_decode_forward(
+        wave = self._run_exclusive(
+            lambda core: core.sf_decode_forward(
                 length=phoneme.shape[0],
                 phoneme=phoneme[np.newaxis],
                 f0=f0[np.newaxis],
                 volume=volume[np.newaxis],
                 style_id=np.array(style_id, dtype=np.int64).reshape(-1),
-            )
+            ),
+            style_id,
+            "safe_sf_decode_forward",
+        )
         sr_wave = self.default_sampling_rate
         return wave, sr_wave
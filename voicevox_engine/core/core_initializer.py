@@ -8,6 +8,7 @@ from pathlib import Path
 from ..utility.core_version_utility import MOCK_CORE_VERSION, get_latest_version
 from ..utility.path_utility import engine_root, get_save_dir
 from .core_adapter import CoreAdapter
+from .core_process import CoreProcessWrapper
 from .core_wrapper import CoreWrapper, load_runtime_lib
 
 
@@ -65,6 +66,7 @@ def initialize_cores(
     cpu_num_threads: int | None = None,
     enable_mock: bool = True,
     load_all_models: bool = False,
+    core_instances: int = 1,
 ) -> CoreManager:
     """
     音声ライブラリを読み込んでコアを生成する。
@@ -87,11 +89,20 @@ def initialize_cores(
         コア読み込みに失敗したとき、代わりにmockを使用するかどうか
     load_all_models:
         起動時に全てのモデルを読み込むかどうか
+    core_instances:
+        バージョンごとに読み込むコアのインスタンス数。推論は各インスタンスで並列に実行される。
+        2 以上のとき、2 つ目以降のインスタンスはサブプロセスへ読み込まれ、CPUスレッドはインスタンス間で等分される。
     """
+    if core_instances < 1:
+        raise ValueError("core_instances は 1 以上である必要があります")
+
     if cpu_num_threads == 0 or cpu_num_threads is None:
         msg = "cpu_num_threads is set to 0. Setting it to half of the logical cores."
         warnings.warn(msg, stacklevel=1)
         cpu_num_threads = _get_half_logical_cores()
+    # 各インスタンスへ CPU スレッドを等分する。0 はコアの既定値を表すため分割しない。
+    if cpu_num_threads != 0:
+        cpu_num_threads = max(cpu_num_threads // core_instances, 1)
 
     root_dir = engine_root()
 
@@ -136,7 +147,20 @@ def initialize_cores(
                     msg = "Core loading is skipped because of version duplication."
                     warnings.warn(msg, stacklevel=1)
                 else:
-                    core_manager.register_core(CoreAdapter(core), core_version)
+                    # 同一プロセスへ同じコアを複数読み込めないため、複製はサブプロセスへ読み込む
+                    replicas = [
+                        CoreProcessWrapper(
+                            use_gpu,
+                            core_dir,
+                            cpu_num_threads,
+                            load_all_models,
+                            runtime_dirs,
+                        )
+                        for _ in range(core_instances - 1)
+                    ]
+                    core_manager.register_core(
+                        CoreAdapter(core, replicas=replicas), core_version
+                    )
             except Exception:
                 # コアでなかった場合のエラーを抑制する
                 if not suppress_error:
@@ -165,7 +189,11 @@ def initialize_cores(
         from ..dev.core.mock import MockCoreWrapper
 
         if not core_manager.has_core(MOCK_CORE_VERSION):
+            # モックは状態を共有しないため、複製も同一プロセス内に生成する
             core = MockCoreWrapper()
-            core_manager.register_core(CoreAdapter(core), MOCK_CORE_VERSION)
+            replicas = [MockCoreWrapper() for _ in range(core_instances - 1)]
+            core_manager.register_core(
+                CoreAdapter(core, replicas=replicas), MOCK_CORE_VERSION
+            )
 
     return core_manager
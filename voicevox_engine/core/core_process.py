@@ -0,0 +1,281 @@
+"""サブプロセスで動作するコア"""
+
+import multiprocessing
+import sys
+import threading
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+if sys.platform == "win32":
+    from multiprocessing.connection import PipeConnection as ConnectionType
+else:
+    from multiprocessing.connection import Connection as ConnectionType
+
+from .core_wrapper import CoreError, CoreWrapper, load_runtime_lib
+
+
+class CoreProcessWrapper(CoreWrapper):
+    """
+    コアを専用のサブプロセスへ読み込み、呼び出しをプロセス間通信で中継する `CoreWrapper`。
+
+    コアの共有ライブラリは読み込んだプロセス内で状態を共有するため、同一プロセスへ同じコアを複数読み込めない。
+    サブプロセスごとにコアを読み込むことで、同じコアの独立したインスタンスを並列に実行できる。
+    親プロセスで初期化済みのコアや ONNX Runtime の状態を引き継がないよう、サブプロセスは spawn で起動する。
+    """
+
+    def __init__(
+        self,
+        use_gpu: bool,
+        core_dir: Path,
+        cpu_num_threads: int = 0,
+        load_all_models: bool = False,
+        runtime_dirs: list[Path] | None = None,
+    ) -> None:
+        """サブプロセスを起動してコアを読み込む。読み込みに失敗した場合はそのエラーを再送出する。"""
+        # NOTE: `CoreWrapper.__init__` はコアの共有ライブラリを自プロセスへ読み込むため呼ばない。
+        #       コアの読み込みと初期化はサブプロセス内の `CoreWrapper` が行い、全てのメソッドはそれへ中継する。
+        self._lock = threading.Lock()
+        # NOTE: fork では親プロセスで読み込み済みのコアと、停止したスレッドプールを含む推論ランタイムの状態を引き継いでしまう
+        context = multiprocessing.get_context("spawn")
+        self._connection, child_connection = context.Pipe()
+        self._process = context.Process(
+            target=_run_core_process,
+            args=(
+                use_gpu,
+                core_dir,
+                cpu_num_threads,
+                load_all_models,
+                runtime_dirs or [],
+                child_connection,
+            ),
+            daemon=True,
+        )
+        self._process.start()
+        # NOTE: 子プロセス側の端を閉じ、サブプロセスの終了時に EOF を検知できるようにする
+        child_connection.close()
+        self.default_sampling_rate: int = self._receive()
+
+    def _receive(self) -> Any:
+        """サブプロセスからの応答を受け取る。サブプロセスで送出された例外は再送出する。"""
+        try:
+            is_success, value = self._connection.recv()
+        except EOFError as e:
+            raise CoreError("コアのサブプロセスが終了しています") from e
+        if not is_success:
+            raise value
+        return value
+
+    def _call(self, method_name: str, **kwargs: Any) -> Any:
+        """サブプロセスのコアのメソッドを呼び出し、その結果を返す。"""
+        with self._lock:
+            try:
+                self._connection.send((method_name, kwargs))
+            except (BrokenPipeError, OSError) as e:
+                raise CoreError("コアのサブプロセスが終了しています") from e
+            return self._receive()
+
+    def metas(self) -> str:
+        """キャラクターメタ情報を文字列として取得する。"""
+        metas: str = self._call("metas")
+        return metas
+
+    def yukarin_s_forward(
+        self,
+        length: int,
+        phoneme_list: NDArray[np.int64],
+        style_id: NDArray[np.int64],
+    ) -> NDArray[np.float32]:
+        """音素列から音素ごとの長さを求める。"""
+        output: NDArray[np.float32] = self._call(
+            "yukarin_s_forward",
+            length=length,
+            phoneme_list=phoneme_list,
+            style_id=style_id,
+        )
+        return output
+
+    def yukarin_sa_forward(
+        self,
+        length: int,
+        vowel_phoneme_list: NDArray[np.int64],
+        consonant_phoneme_list: NDArray[np.int64],
+        start_accent_list: NDArray[np.int64],
+        end_accent_list: NDArray[np.int64],
+        start_accent_phrase_list: NDArray[np.int64],
+        end_accent_phrase_list: NDArray[np.int64],
+        style_id: NDArray[np.int64],
+    ) -> NDArray[np.float32]:
+        """モーラごとの音素列とアクセント情報から、モーラごとの音高を求める。"""
+        output: NDArray[np.float32] = self._call(
+            "yukarin_sa_forward",
+            length=length,
+            vowel_phoneme_list=vowel_phoneme_list,
+            consonant_phoneme_list=consonant_phoneme_list,
+            start_accent_list=start_accent_list,
+            end_accent_list=end_accent_list,
+            start_accent_phrase_list=start_accent_phrase_list,
+            end_accent_phrase_list=end_accent_phrase_list,
+            style_id=style_id,
+        )
+        return output
+
+    def decode_forward(
+        self,
+        length: int,
+        phoneme_size: int,
+        f0: NDArray[np.float32],
+        phoneme: NDArray[np.float32],
+        style_id: NDArray[np.int64],
+    ) -> NDArray[np.float32]:
+        """フレームごとの音素と音高から波形を求める。"""
+        output: NDArray[np.float32] = self._call(
+            "decode_forward",
+            length=length,
+            phoneme_size=phoneme_size,
+            f0=f0,
+            phoneme=phoneme,
+            style_id=style_id,
+        )
+        return output
+
+    def predict_sing_consonant_length_forward(
+        self,
+        length: int,
+        consonant: NDArray[np.int64],
+        vowel: NDArray[np.int64],
+        note_duration: NDArray[np.int64],
+        style_id: NDArray[np.int64],
+    ) -> NDArray[np.int64]:
+        """子音・母音列から、音素ごとの長さを求める。"""
+        output: NDArray[np.int64] = self._call(
+            "predict_sing_consonant_length_forward",
+            length=length,
+            consonant=consonant,
+            vowel=vowel,
+            note_duration=note_duration,
+            style_id=style_id,
+        )
+        return output
+
+    def predict_sing_f0_forward(
+        self,
+        length: int,
+        phoneme: NDArray[np.int64],
+        note: NDArray[np.int64],
+        style_id: NDArray[np.int64],
+    ) -> NDArray[np.float32]:
+        """フレームごとの音素列とノート列から、フレームごとのF0を求める。"""
+        output: NDArray[np.float32] = self._call(
+            "predict_sing_f0_forward",
+            length=length,
+            phoneme=phoneme,
+            note=note,
+            style_id=style_id,
+        )
+        return output
+
+    def predict_sing_volume_forward(
+        self,
+        length: int,
+        phoneme: NDArray[np.int64],
+        note: NDArray[np.int64],
+        f0: NDArray[np.float32],
+        style_id: NDArray[np.int64],
+    ) -> NDArray[np.float32]:
+        """フレームごとの音素列とノート列と F0 から、フレームごとの音量を求める。"""
+        output: NDArray[np.float32] = self._call(
+            "predict_sing_volume_forward",
+            length=length,
+            phoneme=phoneme,
+            note=note,
+            f0=f0,
+            style_id=style_id,
+        )
+        return output
+
+    def sf_decode_forward(
+        self,
+        length: int,
+        phoneme: NDArray[np.int64],
+        f0: NDArray[np.float32],
+        volume: NDArray[np.float32],
+        style_id: NDArray[np.int64],
+    ) -> NDArray[np.float32]:
+        """フレームごとの音素・音高・音量から波形を求める。"""
+        output: NDArray[np.float32] = self._call(
+            "sf_decode_forward",
+            length=length,
+            phoneme=phoneme,
+            f0=f0,
+            volume=volume,
+            style_id=style_id,
+        )
+        return output
+
+    def supported_devices(self) -> str:
+        """コアが対応するデバイスの情報をJSON文字列として取得する。"""
+        supported_devices: str = self._call("supported_devices")
+        return supported_devices
+
+    def finalize(self) -> None:
+        """コアをファイナライズし、サブプロセスを終了する。"""
+        try:
+            self._call("finalize")
+        finally:
+            self._connection.close()
+            self._process.join()
+
+    def unload_all_models(self) -> None:
+        """サブプロセスのコアを初期化し直し、読み込まれた全てのモデルを解放する。"""
+        self._call("unload_all_models")
+
+    def load_model(self, style_id: int) -> None:
+        """コアにモデルを読み込む。"""
+        self._call("load_model", style_id=style_id)
+
+    def is_model_loaded(self, style_id: int) -> bool:
+        """コアに指定されたモデルが読み込まれているか確認する。"""
+        loaded: bool = self._call("is_model_loaded", style_id=style_id)
+        return loaded
+
+
+# NOTE: pickle化の関係でグローバルに書いている
+def _run_core_process(
+    use_gpu: bool,
+    core_dir: Path,
+    cpu_num_threads: int,
+    load_all_models: bool,
+    runtime_dirs: list[Path],
+    connection: ConnectionType,
+) -> None:
+    """
+    コアを読み込み、コネクションを介して受け取った呼び出しを実行し続ける。
+
+    応答は `(成功したか否か, 戻り値または例外)` の組として送信する。
+    """
+    try:
+        load_runtime_lib(runtime_dirs)
+        core = CoreWrapper(use_gpu, core_dir, cpu_num_threads, load_all_models)
+    except Exception as e:
+        connection.send((False, e))
+        connection.close()
+        return
+    connection.send((True, core.default_sampling_rate))
+
+    while True:
+        try:
+            method_name, kwargs = connection.recv()
+        except EOFError:
+            break
+        try:
+            result = getattr(core, method_name)(**kwargs)
+        except Exception as e:
+            connection.send((False, e))
+        else:
+            connection.send((True, result))
+        if method_name == "finalize":
+            break
+    connection.close()
@@ -626,19 +626,30 @@ class CoreWrapper:
         if model_type == "onnxruntime":
             exist_cpu_num_threads = True
 
+        self._use_gpu = use_gpu
+        self._core_dir = core_dir
+        self._cpu_num_threads = cpu_num_threads
+        self._is_version_0_12_core_or_later = is_version_0_12_core_or_later
+        self._exist_cpu_num_threads = exist_cpu_num_threads
+        self._initialize(load_all_models)
+
+    def _initialize(self, load_all_models: bool) -> None:
+        """コアを初期化する。"""
         cwd = os.getcwd()
-        os.chdir(core_dir)
+        os.chdir(self._core_dir)
         try:
-            if is_version_0_12_core_or_later:
+            if self._is_version_0_12_core_or_later:
                 self.assert_core_success(
-                    self.core.initialize(use_gpu, cpu_num_threads, load_all_models)
+                    self.core.initialize(
+                        self._use_gpu, self._cpu_num_threads, load_all_models
+                    )
                 )
-            elif exist_cpu_num_threads:
+            elif self._exist_cpu_num_threads:
                 self.assert_core_success(
-                    self.core.initialize(".", use_gpu, cpu_num_threads)
+                    self.core.initialize(".", self._use_gpu, self._cpu_num_threads)
                 )
             else:
-                self.assert_core_success(self.core.initialize(".", use_gpu))
+                self.assert_core_success(self.core.initialize(".", self._use_gpu))
         finally:
             os.chdir(cwd)
 
@@ -969,10 +980,16 @@ class CoreWrapper:
             return
         raise OldCoreError
 
+    def unload_all_models(self) -> None:
+        """コアを初期化し直し、読み込まれた全てのモデルを解放する。"""
+        self.finalize()
+        self._initialize(load_all_models=False)
+
     def load_model(self, style_id: int) -> None:
         """コアにモデルを読み込む。"""
         if self.api_exists["load_model"]:
             self.assert_core_success(self.core.load_model(c_long(style_id)))
+            return
         raise OldCoreError
 
     def is_model_loaded(self, style_id: int) -> bool:
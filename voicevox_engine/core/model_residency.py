@@ -0,0 +1,105 @@
+"""音声合成モデルの常駐管理"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from ..metas.metas import StyleId
+
+
+@dataclass(frozen=True)
+class ModelResidencyPolicy:
+    """音声合成モデルの常駐設定"""
+
+    memory_budget_bytes: int  # モデルが占めるメモリの上限（コアのバージョンごと）
+    bytes_per_style: int  # スタイル 1 つ分のモデルが占めるメモリの見積もり
+
+
+@dataclass(frozen=True)
+class ModelResidencyStats:
+    """コアのインスタンス 1 つのモデル常駐状況"""
+
+    resident_style_ids: list[StyleId]  # 常駐中のスタイル（最後の利用が古い順）
+    resident_bytes: int  # 常駐中のモデルが占めるメモリの見積もり
+    budget_bytes: int  # メモリの上限
+    capacity: int  # リサイクルせずに常駐できるスタイル数
+    idle_seconds: dict[StyleId, float]  # 常駐中のスタイルごとの最後の利用からの経過時間
+    loads: int  # モデルを読み込んだ回数
+    recycles: int  # メモリの上限を超えるためにコアを初期化し直した回数
+
+
+class ModelResidency:
+    """
+    コアのインスタンス 1 つに常駐するスタイルを最後の利用時刻とともに追跡する。
+
+    コアはモデルを個別に解放する API を持たないため、常駐数が上限に達した状態で新しいスタイルを読み込む際は、
+    コアを初期化し直して全てのモデルを解放し、最近使われたスタイルだけを読み込み直す（リサイクル）。
+    リサイクルは重い処理であるため、読み込み直すのは上限の半分までとし、続けて新しいスタイルが来ても毎回リサイクルしないようにする。
+    """
+
+    def __init__(self, budget_bytes: int, bytes_per_style: int) -> None:
+        if budget_bytes < 0:
+            raise ValueError("budget_bytes は 0 以上である必要があります")
+        if bytes_per_style < 1:
+            raise ValueError("bytes_per_style は 1 以上である必要があります")
+        self._budget_bytes = budget_bytes
+        self._bytes_per_style = bytes_per_style
+        # NOTE: 推論中のスタイルを解放しないよう、上限が小さくても 1 つは常駐させる
+        self._capacity = max(budget_bytes // bytes_per_style, 1)
+        self._lock = threading.Lock()
+        # スタイルごとの最後の利用時刻（最後の利用が古い順）
+        self._last_used: OrderedDict[StyleId, float] = OrderedDict()
+        self._loads = 0
+        self._recycles = 0
+
+    def needs_recycle(self, style_id: StyleId) -> bool:
+        """指定スタイルを常駐させるためにリサイクルが必要か否かを返す。"""
+        with self._lock:
+            return (
+                style_id not in self._last_used
+                and len(self._last_used) >= self._capacity
+            )
+
+    def styles_to_keep(self) -> list[StyleId]:
+        """リサイクル時に読み込み直すスタイルを、最後の利用が古い順に返す。"""
+        with self._lock:
+            num_keep = self._capacity // 2
+            if num_keep == 0:
+                return []
+            return list(self._last_used)[-num_keep:]
+
+    def record_use(self, style_id: StyleId) -> None:
+        """スタイルの利用を記録する。常駐していなかったスタイルは読み込まれたものとして扱う。"""
+        with self._lock:
+            if style_id not in self._last_used:
+                self._loads += 1
+            self._last_used[style_id] = time.monotonic()
+            self._last_used.move_to_end(style_id)
+
+    def record_recycle(self, kept_style_ids: list[StyleId]) -> None:
+        """リサイクルを記録する。読み込み直したスタイル以外は解放されたものとして扱う。"""
+        with self._lock:
+            self._recycles += 1
+            self._loads += len(kept_style_ids)
+            kept = set(kept_style_ids)
+            for style_id in list(self._last_used):
+                if style_id not in kept:
+                    del self._last_used[style_id]
+
+    def stats(self) -> ModelResidencyStats:
+        """常駐状況を取得する。"""
+        with self._lock:
+            now = time.monotonic()
+            return ModelResidencyStats(
+                resident_style_ids=list(self._last_used),
+                resident_bytes=len(self._last_used) * self._bytes_per_style,
+                budget_bytes=self._budget_bytes,
+                capacity=self._capacity,
+                idle_seconds={
+                    style_id: now - last_used
+                    for style_id, last_used in self._last_used.items()
+                },
+                loads=self._loads,
+                recycles=self._recycles,
+            )
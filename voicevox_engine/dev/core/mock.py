@@ -241,6 +241,11 @@ class MockCoreWrapper(CoreWrapper):
         # 「コアのファイナライズが常に成功する」として扱う
         pass
 
+    def unload_all_models(self) -> None:
+        """コアを初期化し直し、読み込まれた全てのモデルを解放する。"""
+        # 「モデルの解放が常に成功する」として扱う
+        pass
+
     def load_model(self, style_id: int) -> None:
         """コアにモデルを読み込む。"""
         # 「モデルの読み込みが常に成功する」として扱う
@@ -1,5 +1,6 @@
 """SongEngine のモック"""
 
+from ...core.model_residency import ModelResidencyPolicy
 from ...tts_pipeline.song_engine import (
     SongEngine,
 )
@@ -9,5 +10,9 @@ from ..core.mock import MockCoreWrapper
 class MockSongEngine(SongEngine):
     """製品版コア無しに歌声音声合成可能なモック版SongEngine"""
 
-    def __init__(self) -> None:
-        super().__init__(MockCoreWrapper())
+    def __init__(
+        self, model_residency_policy: ModelResidencyPolicy | None = None
+    ) -> None:
+        super().__init__(
+            MockCoreWrapper(), model_residency_policy=model_residency_policy
+        )
@@ -1,12 +1,14 @@
 """TTSEngine のモック"""
 
 import copy
+from collections.abc import Iterator
 from typing import Final
 
 import numpy as np
 from numpy.typing import NDArray
 from pyopenjtalk import tts
 
+from ...core.model_residency import ModelResidencyPolicy
 from ...metas.metas import StyleId
 from ...model import AudioQuery
 from ...tts_pipeline.audio_postprocessing import raw_wave_to_output_wave
@@ -20,8 +22,14 @@ from ..core.mock import MockCoreWrapper
 class MockTTSEngine(TTSEngine):
     """製品版コア無しに音声合成が可能なモック版TTSEngine"""
 
-    def __init__(self) -> None:
-        super().__init__(MockCoreWrapper())
+    def __init__(
+        self,
+        model_residency_policy: ModelResidencyPolicy | None = None,
+    ) -> None:
+        super().__init__(
+            MockCoreWrapper(),
+            model_residency_policy=model_residency_policy,
+        )
 
     def synthesize_wave(
         self,
@@ -41,6 +49,31 @@ class MockTTSEngine(TTSEngine):
         wave = raw_wave_to_output_wave(query, raw_wave, sr_raw_wave)
         return wave
 
+    def synthesize_wave_stream(
+        self,
+        query: AudioQuery,
+        style_id: StyleId,
+        enable_interrogative_upspeak: bool,
+    ) -> Iterator[NDArray[np.float32]]:
+        """音声合成用のクエリを無音モーラをもつアクセント句の後で分割し、区間ごとに OpenJTalk で生成した音声波形を逐次出力するイテレーターを返す。"""
+        sub_queries: list[AudioQuery] = []
+        accent_phrases = []
+        for accent_phrase in query.accent_phrases:
+            accent_phrases.append(accent_phrase)
+            if accent_phrase.pause_mora is not None:
+                sub_queries.append(
+                    query.model_copy(update={"accent_phrases": accent_phrases})
+                )
+                accent_phrases = []
+        if accent_phrases or not sub_queries:
+            sub_queries.append(
+                query.model_copy(update={"accent_phrases": accent_phrases})
+            )
+        return (
+            self.synthesize_wave(sub_query, style_id, enable_interrogative_upspeak)
+            for sub_query in sub_queries
+        )
+
     def forward(self, text: str) -> tuple[NDArray[np.float32], int]:
         """文字列から pyopenjtalk を用いて音声を合成する。"""
         OJT_SAMPLING_RATE: Final = 48000
@@ -5,6 +5,7 @@ import json
 import os
 import shutil
 import zipfile
+from collections.abc import Callable
 from pathlib import Path
 from typing import BinaryIO
 
@@ -63,6 +64,15 @@ class LibraryManager:
         self.engine_brand_name = brand_name
         self.engine_name = engine_name
         self.engine_uuid = engine_uuid
+        self._change_listeners: list[Callable[[], None]] = []
+
+    def add_change_listener(self, listener: Callable[[], None]) -> None:
+        """音声ライブラリのインストール・アンインストール後に呼び出される関数を登録する。"""
+        self._change_listeners.append(listener)
+
+    def _notify_change(self) -> None:
+        for listener in self._change_listeners:
+            listener()
 
     def downloadable_libraries(self) -> list[DownloadableLibraryInfo]:
         """ダウンロード可能音声ライブラリ情報の一覧を取得する。"""
@@ -208,6 +218,7 @@ class LibraryManager:
             # NOTE: 当該ライブラリ用のディレクトリ下へ展開してインストールする
             zf.extractall(library_dir)
 
+        self._notify_change()
         return library_dir
 
     def uninstall_library(self, library_id: str) -> None:
@@ -229,3 +240,6 @@ class LibraryManager:
         except Exception as e:
             msg = f"音声ライブラリ {library_id} の削除に失敗しました。"
             raise LibraryInternalError(msg) from e
+        finally:
+            # 削除に失敗した場合も一部のファイルが削除されている可能性がある
+            self._notify_change()
@@ -1,14 +1,18 @@
 """キャラクター情報とキャラクターメタ情報の管理"""
 
+import hashlib
+import threading
+from collections import OrderedDict
 from collections.abc import Callable
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from pathlib import Path
 from typing import Final, Literal, TypeAlias, assert_never
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 
 from voicevox_engine.core.core_adapter import CoreCharacter, CoreCharacterStyle
 from voicevox_engine.metas.metas import (
+    Speaker,
     SpeakerInfo,
     SpeakerStyle,
     SpeakerSupportedFeatures,
@@ -39,6 +43,40 @@ class Character:
     supported_features: SpeakerSupportedFeatures
 
 
+def characters_to_speakers(characters: list[Character]) -> list[Speaker]:
+    """キャラクターのリストを `Speaker` のリストへキャストする。"""
+    return list(
+        map(
+            lambda character: Speaker(
+                name=character.name,
+                speaker_uuid=character.uuid,
+                styles=character.talk_styles + character.sing_styles,
+                version=character.version,
+                supported_features=character.supported_features,
+            ),
+            characters,
+        )
+    )
+
+
+@dataclass(frozen=True)
+class SerializedJson:
+    """シリアライズ済みの JSON"""
+
+    body: bytes
+    etag: str  # 内容から求めた ETag。内容が同じであれば同じ値になる。
+
+    @classmethod
+    def from_body(cls, body: bytes) -> "SerializedJson":
+        """シリアライズ済みの JSON から ETag を求めて生成する。"""
+        return cls(body=body, etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"')
+
+
+_SPEAKERS_ADAPTER: Final = TypeAdapter(list[Speaker])
+
+# キャラクター情報キャッシュの容量上限の既定値（バイト）
+DEFAULT_INFO_CACHE_MAX_BYTES: Final = 256 * 1024 * 1024
+
 _TALK_STYLE_TYPES: Final = ["talk"]
 _SING_STYLE_TYPES: Final = ["singing_teacher", "frame_decode", "sing"]
 
@@ -51,6 +89,11 @@ class _EngineCharacter(BaseModel):
     )
 
 
+# (キャラクター UUID, 喋る/歌う, コアのバージョン, リソース形式, リソースのベース URL)
+_InfoCacheKey: TypeAlias = tuple[
+    str, Literal["talk", "sing"], str | None, ResourceFormat, str
+]
+
 GetCoreCharacters: TypeAlias = Callable[[str | None], list[CoreCharacter]]
 
 
@@ -70,6 +113,7 @@ class MetasStore:
         engine_characters_path: Path,
         get_core_characters: GetCoreCharacters,
         resource_manager: ResourceManager,
+        info_cache_max_bytes: int = DEFAULT_INFO_CACHE_MAX_BYTES,
     ) -> None:
         """
         インスタンスを生成する。
@@ -80,10 +124,24 @@ class MetasStore:
             エンジンに含まれるキャラクターメタ情報ディレクトリのパス。
         get_core_characters:
             コアに含まれるキャラクター情報を返す関数
+        info_cache_max_bytes:
+            シリアライズ済みキャラクター情報のキャッシュの容量上限（バイト）
         """
         self._characters_path = engine_characters_path
         self._get_core_characters = get_core_characters
         self._resource_manager = resource_manager
+
+        # コアのバージョンごとのキャラクター一覧とシリアライズ済み応答のキャッシュ。
+        # キャラクター情報は画像や音声を含み大きいため、容量上限つきの LRU とする。
+        self._cache_lock = threading.Lock()
+        self._cache_generation = 0  # キャッシュを破棄するたびに増える世代番号
+        self._characters_cache: dict[str | None, list[Character]] = {}
+        self._speakers_cache: dict[
+            tuple[str | None, Literal["talk", "sing"]], SerializedJson
+        ] = {}
+        self._info_cache: OrderedDict[_InfoCacheKey, SerializedJson] = OrderedDict()
+        self._info_cache_bytes = 0
+        self._info_cache_max_bytes = info_cache_max_bytes
         # エンジンに含まれる各キャラクターのメタ情報
         self._loaded_metas: dict[str, _EngineCharacter] = {
             folder.name: _EngineCharacter.model_validate_json(
@@ -93,9 +151,30 @@ class MetasStore:
             if folder.is_dir()
         }
 
+    def invalidate_cache(self) -> None:
+        """キャッシュを破棄する。音声ライブラリのインストール・アンインストール時に呼び出す。"""
+        with self._cache_lock:
+            self._cache_generation += 1
+            self._characters_cache.clear()
+            self._speakers_cache.clear()
+            self._info_cache.clear()
+            self._info_cache_bytes = 0
+
     def characters(self, core_version: str | None) -> list[Character]:
         """キャラクターの情報の一覧を取得する。"""
-        # エンジンとコアのキャラクター情報を統合する
+        with self._cache_lock:
+            characters = self._characters_cache.get(core_version)
+            generation = self._cache_generation
+        if characters is None:
+            characters = self._load_characters(core_version)
+            with self._cache_lock:
+                if generation == self._cache_generation:
+                    self._characters_cache[core_version] = characters
+        # NOTE: 呼び出し側によるスタイルの絞り込みがキャッシュへ波及しないよう複製して返す
+        return [replace(character) for character in characters]
+
+    def _load_characters(self, core_version: str | None) -> list[Character]:
+        """コアとエンジンのキャラクター情報を統合したキャラクターの一覧を生成する。"""
         characters: list[Character] = []
         for core_character in self._get_core_characters(core_version):
             character_uuid = core_character.speaker_uuid
@@ -237,6 +316,76 @@ class MetasStore:
         )
         return character_info
 
+    def speakers_json(
+        self, talk_or_sing: Literal["talk", "sing"], core_version: str | None
+    ) -> SerializedJson:
+        """「喋れる」または「歌える」キャラクターの一覧を `Speaker` のリストとしてシリアライズしたものを取得する。"""
+        key = (core_version, talk_or_sing)
+        with self._cache_lock:
+            serialized = self._speakers_cache.get(key)
+            generation = self._cache_generation
+        if serialized is not None:
+            return serialized
+
+        characters = filter_characters_and_styles(
+            self.characters(core_version), talk_or_sing
+        )
+        speakers = characters_to_speakers(characters)
+        serialized = SerializedJson.from_body(_SPEAKERS_ADAPTER.dump_json(speakers))
+        with self._cache_lock:
+            if generation == self._cache_generation:
+                self._speakers_cache[key] = serialized
+        return serialized
+
+    def character_info_json(
+        self,
+        character_uuid: str,
+        talk_or_sing: Literal["talk", "sing"],
+        core_version: str | None,
+        resource_baseurl: str,
+        resource_format: ResourceFormat,
+    ) -> SerializedJson:
+        """
+        指定されたキャラクターの情報をシリアライズしたものを取得する。
+
+        引数と送出する例外は `character_info` と同じ。
+        """
+        # NOTE: base64 形式はリソースのベース URL に依存しない
+        baseurl = resource_baseurl if resource_format == "url" else ""
+        key = (character_uuid, talk_or_sing, core_version, resource_format, baseurl)
+        with self._cache_lock:
+            serialized = self._info_cache.get(key)
+            if serialized is not None:
+                self._info_cache.move_to_end(key)
+                return serialized
+            generation = self._cache_generation
+
+        character_info = self.character_info(
+            character_uuid, talk_or_sing, core_version, baseurl, resource_format
+        )
+        body = character_info.model_dump_json().encode("utf-8")
+        serialized = SerializedJson.from_body(body)
+        with self._cache_lock:
+            if generation == self._cache_generation:
+                self._store_info_cache(key, serialized)
+        return serialized
+
+    def _store_info_cache(
+        self,
+        key: _InfoCacheKey,
+        serialized: SerializedJson,
+    ) -> None:
+        size = len(serialized.body)
+        if size > self._info_cache_max_bytes:
+            return
+        if key in self._info_cache:
+            self._info_cache_bytes -= len(self._info_cache.pop(key).body)
+        self._info_cache[key] = serialized
+        self._info_cache_bytes += size
+        while self._info_cache_bytes > self._info_cache_max_bytes:
+            _, evicted = self._info_cache.popitem(last=False)
+            self._info_cache_bytes -= len(evicted.body)
+
     def talk_characters(self, core_version: str | None) -> list[Character]:
         """話せるキャラクターの情報の一覧を取得する。"""
         return filter_characters_and_styles(self.characters(core_version), "talk")
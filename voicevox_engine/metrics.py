@@ -0,0 +1,276 @@
+"""Prometheus のテキスト形式で公開するメトリクス"""
+
+import math
+import threading
+import time
+from collections.abc import Callable, Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Any, Final, Literal
+
+# Prometheus のテキスト形式のメディアタイプ
+CONTENT_TYPE: Final = "text/plain; version=0.0.4; charset=utf-8"
+
+# 所要時間のヒストグラムの既定のバケット上限（秒）
+DEFAULT_BUCKETS: Final = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+# ラベルの値とメトリクスの値の組
+Sample = tuple[tuple[str, ...], float]
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if len(names) == 0:
+        return ""
+    pairs = []
+    for name, value in zip(names, values, strict=True):
+        escaped = value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        pairs.append(f'{name}="{escaped}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+class Histogram:
+    """ラベルの組ごとに観測値の分布を集計するヒストグラム"""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str],
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.name = name
+        self._documentation = documentation
+        self._label_names = tuple(label_names)
+        self._buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        # ラベルの値の組ごとの (バケットごとの観測数, 観測値の合計)
+        self._series: dict[tuple[str, ...], tuple[list[int], float]] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        """観測値を記録する。"""
+        if len(label_values) != len(self._label_names):
+            raise ValueError(f"{self.name} のラベルの数が一致しません")
+        with self._lock:
+            counts, total = self._series.get(
+                label_values, ([0] * (len(self._buckets) + 1), 0.0)
+            )
+            for i, upper_bound in enumerate(self._buckets):
+                if value <= upper_bound:
+                    counts[i] += 1
+                    break
+            else:
+                counts[-1] += 1
+            self._series[label_values] = (counts, total + value)
+
+    def render(self) -> list[str]:
+        """テキスト形式の行を生成する。"""
+        lines = [
+            f"# HELP {self.name} {self._documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self._lock:
+            series = [
+                (key, list(counts), total)
+                for key, (counts, total) in self._series.items()
+            ]
+        bucket_label_names = (*self._label_names, "le")
+        for label_values, counts, total in sorted(series):
+            cumulative = 0
+            upper_bounds = (*self._buckets, math.inf)
+            for upper_bound, count in zip(upper_bounds, counts, strict=True):
+                cumulative += count
+                labels = _format_labels(
+                    bucket_label_names, (*label_values, _format_value(upper_bound))
+                )
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self._label_names, label_values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class CallbackMetric:
+    """収集のたびに関数から値を取得するゲージまたはカウンター"""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        metric_type: Literal["gauge", "counter"],
+        label_names: Sequence[str],
+        collect: Callable[[], list[Sample]],
+    ) -> None:
+        self.name = name
+        self._documentation = documentation
+        self._metric_type = metric_type
+        self._label_names = tuple(label_names)
+        self._collect = collect
+
+    def render(self) -> list[str]:
+        """テキスト形式の行を生成する。"""
+        lines = [
+            f"# HELP {self.name} {self._documentation}",
+            f"# TYPE {self.name} {self._metric_type}",
+        ]
+        for label_values, value in self._collect():
+            labels = _format_labels(self._label_names, label_values)
+            lines.append(f"{self.name}{labels} {_format_value(value)}")
+        return lines
+
+
+class MetricsRegistry:
+    """公開するメトリクスの一覧"""
+
+    def __init__(self) -> None:
+        self._metrics: list[Histogram | CallbackMetric] = []
+
+    def register(self, metric: Histogram | CallbackMetric) -> None:
+        """メトリクスを登録する。"""
+        if any(registered.name == metric.name for registered in self._metrics):
+            raise ValueError(f"メトリクス {metric.name} は既に登録されています")
+        self._metrics.append(metric)
+
+    def render(self) -> str:
+        """登録された全てのメトリクスをテキスト形式で出力する。"""
+        lines = [line for metric in self._metrics for line in metric.render()]
+        return "\n".join(lines) + "\n"
+
+
+def route_label(scope: Mapping[str, Any]) -> str:
+    """ASGI の scope から、ラベルに用いるルートのパステンプレートを取得する。ルーティング前や不一致の場合は unmatched を返す。"""
+    # NOTE: 時系列の数が際限なく増えないよう、パスそのものではなくルートのパステンプレートを用いる
+    path = getattr(scope.get("route"), "path", None)
+    return path if isinstance(path, str) else "unmatched"
+
+
+class RequestTrace:
+    """処理中の HTTP 要求 1 つに結び付いた計測情報"""
+
+    def __init__(self, scope: Mapping[str, Any], record_stages: bool = False) -> None:
+        """
+        計測情報を生成する。
+
+        Parameters
+        ----------
+        scope : Mapping[str, Any]
+            ASGI の scope。ルーティング後はマッチしたルートを含む。
+        record_stages : bool
+            処理段階ごとの所要時間の合計と、入力の規模を表す属性を要求単位で記録するか否か
+        """
+        self.scope = scope
+        self.core_version = ""
+        self._record_stages = record_stages
+        self._lock = threading.Lock()
+        self._stage_seconds: dict[str, float] = {}
+        self._attributes: dict[str, int] = {}
+
+    def add_stage(self, stage: str, seconds: float) -> None:
+        """処理段階の所要時間を加算する。"""
+        if not self._record_stages:
+            return
+        with self._lock:
+            self._stage_seconds[stage] = self._stage_seconds.get(stage, 0.0) + seconds
+
+    def annotate(self, attributes: Mapping[str, int]) -> None:
+        """入力の規模を表す属性を記録する。"""
+        if not self._record_stages:
+            return
+        with self._lock:
+            self._attributes.update(attributes)
+
+    def stage_seconds(self) -> dict[str, float]:
+        """処理段階ごとの所要時間の合計（秒）を記録順に取得する。"""
+        with self._lock:
+            return dict(self._stage_seconds)
+
+    def attributes(self) -> dict[str, int]:
+        """記録された属性を取得する。"""
+        with self._lock:
+            return dict(self._attributes)
+
+
+# NOTE: スレッドプールへ投入された処理にもコンテキストが引き継がれるよう contextvars を用いる
+_request_trace: ContextVar[RequestTrace | None] = ContextVar(
+    "request_trace", default=None
+)
+
+STAGE_DURATION: Final = Histogram(
+    "voicevox_stage_duration_seconds",
+    "音声合成の処理段階ごとの所要時間（秒）",
+    ["stage", "route", "style_id", "core_version"],
+)
+
+
+def bind_request(trace: RequestTrace) -> Token[RequestTrace | None]:
+    """以降の処理段階の計測を HTTP 要求に結び付ける。戻り値は `unbind_request` に渡す。"""
+    return _request_trace.set(trace)
+
+
+def unbind_request(token: Token[RequestTrace | None]) -> None:
+    """処理段階の計測と HTTP 要求の結び付けを解除する。"""
+    _request_trace.reset(token)
+
+
+def set_core_version(core_version: str) -> None:
+    """処理中の HTTP 要求で用いるコアのバージョンを記録する。"""
+    trace = _request_trace.get()
+    if trace is not None:
+        trace.core_version = core_version
+
+
+def annotate_request(**attributes: int) -> None:
+    """処理中の HTTP 要求に、入力の規模を表す属性を記録する。"""
+    trace = _request_trace.get()
+    if trace is not None:
+        trace.annotate(attributes)
+
+
+def observe_stage(stage: str, seconds: float, style_id: int | None = None) -> None:
+    """処理段階の所要時間を記録する。"""
+    trace = _request_trace.get()
+    route = ""
+    core_version = ""
+    if trace is not None:
+        trace.add_stage(stage, seconds)
+        route = route_label(trace.scope)
+        core_version = trace.core_version
+    STAGE_DURATION.observe(
+        seconds,
+        stage,
+        route,
+        "" if style_id is None else str(style_id),
+        core_version,
+    )
+
+
+@contextmanager
+def time_stage(stage: str, style_id: int | None = None) -> Iterator[None]:
+    """ブロックの実行を 1 つの処理段階として所要時間を記録する。"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(stage, time.perf_counter() - start, style_id)
@@ -9,9 +9,7 @@ from dataclasses import dataclass
 from itertools import chain
 
 import numpy as np
-import pyworld as pw
 from numpy.typing import NDArray
-from soxr import resample
 
 from voicevox_engine.metas.metas_store import Character
 from voicevox_engine.morphing.model import MorphableTargetInfo
@@ -113,6 +111,9 @@ def synthesis_morphing_parameter(
     enable_interrogative_upspeak: bool,
 ) -> _MorphingParameter:
     """音声を合成しモーフィング用パラメータへ変換する。"""
+    # NOTE: 起動を速めるため、読み込みに時間のかかるライブラリは初回の利用時に import する
+    import pyworld as pw
+
     query = deepcopy(query)
 
     # 不具合回避のためデフォルトのサンプリングレートでWORLDに掛けた後に指定のサンプリングレートに変換する
@@ -181,6 +182,10 @@ def synthesize_morphed_wave(
     if morph_rate < 0.0 or morph_rate > 1.0:
         raise ValueError("morph_rateは0.0から1.0の範囲で指定してください")
 
+    # NOTE: 起動を速めるため、読み込みに時間のかかるライブラリは初回の利用時に import する
+    import pyworld as pw
+    from soxr import resample
+
     morph_spectrogram = (
         morph_param.base_spectrogram * (1.0 - morph_rate)
         + morph_param.target_spectrogram * morph_rate
@@ -1,11 +1,18 @@
 """リソースファイルを管理する。"""
 
 import base64
+import hashlib
 import json
-from hashlib import sha256
-from pathlib import Path
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path, PurePosixPath
+from stat import S_ISREG
 from typing import Literal
 
+from pydantic import TypeAdapter, ValidationError
+
 
 class ResourceManagerError(Exception):
     """リソースマネージャー関連で問題が起きた。"""
@@ -18,6 +25,68 @@ def _b64encode_str(s: bytes) -> str:
     return base64.b64encode(s).decode("utf-8")
 
 
+def _hash_file(path: Path) -> str:
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+# ハッシュ索引。ディレクトリからの相対パスを POSIX 形式で表したものから (サイズ, 更新時刻 ns, ハッシュ値) を引く。
+_HashIndex = dict[str, tuple[int, int, str]]
+_hash_index_adapter = TypeAdapter(_HashIndex)
+
+
+def _load_hash_index(index_path: Path) -> _HashIndex:
+    """ハッシュ索引を読み込む。存在しないか壊れている場合は空の索引を返す。"""
+    try:
+        return _hash_index_adapter.validate_json(index_path.read_bytes())
+    except (OSError, ValidationError):
+        return {}
+
+
+def _save_hash_index(index_path: Path, index: _HashIndex) -> None:
+    """ハッシュ索引を書き出す。書き出せなくても次回の起動時に再計算されるだけなので無視する。"""
+    tmp_path = index_path.with_suffix(".tmp")
+    try:
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_bytes(_hash_index_adapter.dump_json(index))
+        os.replace(tmp_path, index_path)
+    except OSError:
+        pass
+
+
+def _build_hash_index(
+    resource_dir: Path, previous_index: _HashIndex, max_workers: int | None
+) -> _HashIndex:
+    """
+    ディレクトリ内の全ファイルのハッシュ索引を生成する。
+
+    サイズと更新時刻が以前の索引と一致するファイルは以前のハッシュ値を再利用し、それ以外のファイルをスレッドプールで並列にハッシュ化する。
+    """
+    index: _HashIndex = {}
+    stale: list[tuple[str, Path, os.stat_result]] = []
+    for path in resource_dir.rglob("*"):
+        try:
+            stat = path.stat()
+        except OSError:
+            # リンク切れのシンボリックリンクなど、情報を取得できないパスは通常ファイルでないものとして扱う
+            continue
+        if not S_ISREG(stat.st_mode):
+            continue
+        key = str(PurePosixPath(path.relative_to(resource_dir)))
+        entry = previous_index.get(key)
+        if entry is not None and entry[:2] == (stat.st_size, stat.st_mtime_ns):
+            index[key] = entry
+        else:
+            stale.append((key, path, stat))
+
+    if stale:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            filehashes = executor.map(_hash_file, [path for _, path, _ in stale])
+            for (key, _, stat), filehash in zip(stale, filehashes, strict=True):
+                index[key] = (stat.st_size, stat.st_mtime_ns, filehash)
+    return index
+
+
 class ResourceManager:
     """
     リソースファイルのパスと、一意なハッシュ値の対応(filemap)を管理する。
@@ -26,7 +95,12 @@ class ResourceManager:
     ついでにファイルをbase64文字列に変換することもできる。
     """
 
-    def __init__(self, create_filemap_if_not_exist: bool) -> None:
+    def __init__(
+        self,
+        create_filemap_if_not_exist: bool,
+        hash_index_dir: Path | None = None,
+        hash_workers: int | None = None,
+    ) -> None:
         """
         リソースマネージャーインスタンスを作る。
 
@@ -34,8 +108,15 @@ class ResourceManager:
         ----------
         create_filemap_if_not_exist : bool
             `filemap.json`がない場合でも登録時にfilemapを生成するか(開発時を想定)
+        hash_index_dir : Path | None
+            filemapを生成する際に、ファイルのハッシュ値をサイズと更新時刻とともに保存しておくディレクトリ。
+            指定した場合、次回以降の生成では変更されたファイルだけをハッシュ化する。
+        hash_workers : int | None
+            ファイルのハッシュ化を並列に行うスレッド数。None の場合は CPU 数に応じて決める。
         """
         self._create_filemap_if_not_exist = create_filemap_if_not_exist
+        self._hash_index_dir = hash_index_dir
+        self._hash_workers = hash_workers
         self._path_to_hash: dict[Path, str] = {}
         self._hash_to_path: dict[str, Path] = {}
 
@@ -46,16 +127,28 @@ class ResourceManager:
             data: dict[str, str] = json.loads(filemap_json.read_bytes())
             self._path_to_hash |= {resource_dir / k: v for k, v in data.items()}
         elif self._create_filemap_if_not_exist:
-            self._path_to_hash |= {
-                i: sha256(i.read_bytes()).digest().hex()
-                for i in resource_dir.rglob("*")
-                if i.is_file()
-            }
+            self._path_to_hash |= self._create_filemap(resource_dir)
         else:
             raise ResourceManagerError(f"{filemap_json}が見つかりません")
 
         self._hash_to_path |= {v: k for k, v in self._path_to_hash.items()}
 
+    def _create_filemap(self, resource_dir: Path) -> dict[Path, str]:
+        """ディレクトリ内の全ファイルをハッシュ化してfilemapを生成する。"""
+        index_path = None
+        previous_index: _HashIndex = {}
+        if self._hash_index_dir is not None:
+            # NOTE: 登録されるディレクトリごとに索引ファイルを分ける
+            dir_key = str(resource_dir.resolve()).encode("utf-8")
+            index_name = hashlib.sha256(dir_key).hexdigest()[:32]
+            index_path = self._hash_index_dir / f"{index_name}.json"
+            previous_index = _load_hash_index(index_path)
+
+        index = _build_hash_index(resource_dir, previous_index, self._hash_workers)
+        if index_path is not None and index != previous_index:
+            _save_hash_index(index_path, index)
+        return {resource_dir / key: entry[2] for key, entry in index.items()}
+
     def resource_str(
         self,
         resource_path: Path,
@@ -78,3 +171,50 @@ class ResourceManager:
         if resource_path is None:
             raise ResourceManagerError(f"'{filehash}'に対応するリソースがありません")
         return resource_path
+
+
+class ResourceFileCache:
+    """
+    リソースファイルの内容をハッシュ値で引く LRU キャッシュ。
+
+    リソースファイルは内容のハッシュ値で一意に識別されるため、キャッシュした内容が古くなることはない。
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        """
+        キャッシュを生成する。
+
+        Parameters
+        ----------
+        max_bytes : int
+            キャッシュの容量上限（バイト）
+        """
+        self._lock = threading.Lock()
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        self._total_bytes = 0
+
+    def read(self, filehash: str, resource_path: Path) -> bytes | None:
+        """
+        リソースファイルの内容を取得する。キャッシュに無い場合はファイルから読み込んで登録する。
+
+        容量上限を超える大きなファイルは読み込まずに None を返す。
+        """
+        with self._lock:
+            content = self._entries.get(filehash)
+            if content is not None:
+                self._entries.move_to_end(filehash)
+                return content
+
+        if resource_path.stat().st_size > self._max_bytes:
+            return None
+        content = resource_path.read_bytes()
+
+        with self._lock:
+            if filehash not in self._entries:
+                self._entries[filehash] = content
+                self._total_bytes += len(content)
+            while self._total_bytes > self._max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._total_bytes -= len(evicted)
+        return content
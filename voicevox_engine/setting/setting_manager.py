@@ -18,6 +18,12 @@ class Setting:
 
     cors_policy_mode: CorsPolicyMode  # リソース共有ポリシー
     allow_origin: str | None = None  # 許可するオリジン
+    wave_cache_size_mb: int = (
+        0  # 合成済み音声キャッシュのメモリ容量上限（MB）。0 で無効
+    )
+    wave_cache_disk_size_mb: int = (
+        0  # 合成済み音声キャッシュのディスク容量上限（MB）。0 で無効
+    )
 
 
 _setting_adapter = TypeAdapter(Setting)
@@ -0,0 +1,188 @@
+"""音声合成ジョブのスケジューラー"""
+
+import asyncio
+import contextvars
+import math
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Final, TypeVar
+
+T = TypeVar("T")
+
+# 所要時間の指数移動平均の平滑化係数
+_DURATION_EMA_ALPHA: Final = 0.2
+
+
+class SynthesisSchedulerError(Exception):
+    """スケジューラーが音声合成ジョブを実行できなかったエラー"""
+
+    def __init__(self, message: str, retry_after_sec: int):
+        super().__init__(message)
+        self.retry_after_sec = retry_after_sec  # 再試行までに待つべき秒数の目安
+
+
+class SynthesisQueueFullError(SynthesisSchedulerError):
+    """待機中のジョブ数が上限に達しているため、ジョブを受け付けられないエラー"""
+
+
+class SynthesisDeadlineExceededError(SynthesisSchedulerError):
+    """ジョブの実行開始前に期限を過ぎたため、ジョブを破棄したエラー"""
+
+
+class SynthesisCancelledError(Exception):
+    """要求元が切断したため、音声合成ジョブの完了を待たずに中断したエラー"""
+
+
+class SynthesisScheduler:
+    """
+    音声合成ジョブを専用のワーカースレッドで実行する非同期スケジューラー。
+
+    ワーカー数をコアの処理能力に合わせて制限し、待機中のジョブ数が上限に達した場合は即座にジョブを拒否する。
+    期限つきのジョブが実行開始前に期限を過ぎた場合、そのジョブはコアに到達する前に破棄される。
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        max_queue_size: int | None = None,
+        default_timeout_sec: float | None = None,
+    ):
+        """
+        スケジューラーを生成する。
+
+        Parameters
+        ----------
+        max_workers : int
+            同時に実行するジョブの最大数
+        max_queue_size : int | None
+            実行待ちのジョブの最大数。None の場合は制限しない。
+        default_timeout_sec : float | None
+            ジョブの受付から実行開始までの期限（秒）の既定値。None の場合は期限を設けない。
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers は 1 以上である必要があります")
+        if max_queue_size is not None and max_queue_size < 0:
+            raise ValueError("max_queue_size は 0 以上である必要があります")
+        self._max_workers = max_workers
+        self._max_queue_size = max_queue_size
+        self._default_timeout_sec = default_timeout_sec
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="synthesis"
+        )
+        self._lock = threading.Lock()
+        self._num_jobs = 0  # 実行中および実行待ちのジョブ数
+        self._mean_duration_sec = 0.0  # ジョブ所要時間の指数移動平均
+
+    @property
+    def num_jobs(self) -> int:
+        """実行中および実行待ちのジョブ数を取得する。"""
+        with self._lock:
+            return self._num_jobs
+
+    def _retry_after_sec(self) -> int:
+        """現在のジョブを捌き切るまでの見込み秒数を、再試行までの待ち時間の目安として算出する。"""
+        with self._lock:
+            backlog_sec = self._mean_duration_sec * self._num_jobs / self._max_workers
+        return max(math.ceil(backlog_sec), 1)
+
+    def _reserve(self) -> None:
+        """ジョブ 1 つ分の枠を確保する。待機中のジョブ数が上限に達している場合は拒否する。"""
+        with self._lock:
+            max_jobs = (
+                None
+                if self._max_queue_size is None
+                else self._max_workers + self._max_queue_size
+            )
+            full = max_jobs is not None and self._num_jobs >= max_jobs
+            if not full:
+                self._num_jobs += 1
+        if full:
+            raise SynthesisQueueFullError(
+                "音声合成の待ちジョブ数が上限に達しています。",
+                self._retry_after_sec(),
+            )
+
+    def _release(self, duration_sec: float | None) -> None:
+        """ジョブの枠を解放し、実行された場合は所要時間を記録する。"""
+        with self._lock:
+            self._num_jobs -= 1
+            if duration_sec is not None:
+                self._mean_duration_sec += _DURATION_EMA_ALPHA * (
+                    duration_sec - self._mean_duration_sec
+                )
+
+    def _cancel_pending(self, future: Future[T]) -> bool:
+        """実行開始前のジョブを取り消し、その枠を解放する。取り消せた場合は True を返す。"""
+        if future.cancel():
+            self._release(None)
+            return True
+        return False
+
+    async def run(self, call: Callable[[], T], timeout_sec: float | None = None) -> T:
+        """
+        ジョブをワーカースレッドで実行し、その結果を返す。ジョブが送出した例外は再送出する。
+
+        Parameters
+        ----------
+        call : Callable[[], T]
+            実行するジョブ
+        timeout_sec : float | None
+            ジョブの受付から実行開始までの期限（秒）。None の場合は既定値を用いる。
+
+        Raises
+        ------
+        SynthesisQueueFullError
+            待機中のジョブ数が上限に達している
+        SynthesisDeadlineExceededError
+            ジョブの実行開始前に期限を過ぎた
+        """
+        if timeout_sec is None:
+            timeout_sec = self._default_timeout_sec
+        deadline = None if timeout_sec is None else time.monotonic() + timeout_sec
+
+        self._reserve()
+
+        def job() -> T:
+            if deadline is not None and time.monotonic() > deadline:
+                self._release(None)
+                raise SynthesisDeadlineExceededError(
+                    "音声合成ジョブが実行開始前に期限を過ぎました。",
+                    self._retry_after_sec(),
+                )
+            start = time.monotonic()
+            try:
+                return call()
+            finally:
+                self._release(time.monotonic() - start)
+
+        try:
+            # NOTE: メトリクスなどが参照するコンテキスト変数をワーカースレッドへ引き継ぐ
+            future = self._executor.submit(contextvars.copy_context().run, job)
+        except BaseException:
+            self._release(None)
+            raise
+        wrapped = asyncio.wrap_future(future)
+        try:
+            if deadline is None:
+                return await wrapped
+            try:
+                remaining = max(deadline - time.monotonic(), 0.0)
+                return await asyncio.wait_for(asyncio.shield(wrapped), remaining)
+            except TimeoutError:
+                # 実行開始前であれば破棄する。実行中であれば完了を待つ。
+                if self._cancel_pending(future):
+                    raise SynthesisDeadlineExceededError(
+                        "音声合成ジョブが実行開始前に期限を過ぎました。",
+                        self._retry_after_sec(),
+                    ) from None
+                return await wrapped
+        except asyncio.CancelledError:
+            # 要求元が待つのをやめた場合、実行開始前のジョブを破棄する
+            self._cancel_pending(future)
+            raise
+
+    def shutdown(self) -> None:
+        """実行待ちのジョブを破棄し、ワーカースレッドを停止する。"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
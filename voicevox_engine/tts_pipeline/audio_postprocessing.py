@@ -1,14 +1,18 @@
 """音声波形を加工する。"""
 
+from typing import TYPE_CHECKING
+
 import numpy as np
 from numpy.typing import NDArray
-from soxr import resample
 
 from ..model import AudioQuery
 from .model import (
     FrameAudioQuery,
 )
 
+if TYPE_CHECKING:
+    from soxr import ResampleStream
+
 
 def raw_wave_to_output_wave(
     query: AudioQuery | FrameAudioQuery, wave: NDArray[np.float32], sr_wave: int
@@ -34,6 +38,9 @@ def _apply_output_sampling_rate(
     # サンプリングレート一致のときはスルー
     if sr_wave == query.outputSamplingRate:
         return wave
+    # NOTE: 起動を速めるため、読み込みに時間のかかるライブラリは初回の利用時に import する
+    from soxr import resample
+
     wave = resample(wave, sr_wave, query.outputSamplingRate)
     return wave
 
@@ -45,3 +52,26 @@ def _apply_output_stereo(
     if query.outputStereo:
         wave = np.array([wave, wave]).T
     return wave
+
+
+class OutputWaveStream:
+    """生音声波形のチャンク系列へ音声合成用のクエリを逐次適用する"""
+
+    def __init__(self, query: AudioQuery | FrameAudioQuery, sr_wave: int):
+        self._query = query
+        # チャンク境界での不連続を避けるため、リサンプラーの状態をチャンク間で引き継ぐ
+        self._resampler: ResampleStream | None = None
+        if sr_wave != query.outputSamplingRate:
+            import soxr
+
+            self._resampler = soxr.ResampleStream(
+                sr_wave, query.outputSamplingRate, 1, dtype="float32"
+            )
+
+    def process(self, wave: NDArray[np.float32], last: bool) -> NDArray[np.float32]:
+        """生音声波形チャンクから出力音声波形チャンクを生成する。最終チャンクではリサンプラーの残りを出力する。"""
+        wave = _apply_volume_scale(wave, self._query)
+        if self._resampler is not None:
+            wave = self._resampler.resample_chunk(wave.astype(np.float32), last=last)
+        wave = _apply_output_stereo(wave, self._query)
+        return wave
@@ -6,7 +6,6 @@ import io
 import numpy as np
 import soundfile
 from numpy.typing import NDArray
-from soxr import resample
 
 
 class ConnectBase64WavesException(Exception):
@@ -52,6 +51,9 @@ def decode_base64_waves(waves: list[str]) -> list[tuple[NDArray[np.float64], int
 
 def connect_base64_waves(waves: list[str]) -> tuple[NDArray[np.float64], int]:
     """複数の base64 エンコードされた音声波形を1つに結合する。"""
+    # NOTE: 起動を速めるため、読み込みに時間のかかるライブラリは初回の利用時に import する
+    from soxr import resample
+
     waves_nparray_sr = decode_base64_waves(waves)
 
     max_sampling_rate = max([sr for _, sr in waves_nparray_sr])
@@ -3,8 +3,6 @@
 import re
 from typing import NewType, TypeGuard
 
-import kanalizer
-
 # 半角アルファベット文字列を示す型
 HankakuAlphabet = NewType("HankakuAlphabet", str)
 
@@ -90,6 +88,9 @@ def _convert_as_char_wise_katakana(alphabets: HankakuAlphabet) -> str:
 
 def convert_english_to_katakana(string: HankakuAlphabet) -> str:
     """英単語をカタカナ読みに変換する。"""
+    # NOTE: 起動を速めるため、読み込みに時間のかかるライブラリは初回の利用時に import する
+    import kanalizer
+
     kana = ""
     for word in _split_into_words(string):
         if _should_convert_english_to_katakana(word):
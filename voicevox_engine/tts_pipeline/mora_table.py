@@ -0,0 +1,89 @@
+"""モーラ系列の列指向表現"""
+
+from dataclasses import dataclass, fields
+from typing import Self, TypeVar
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .model import Mora
+from .phoneme import Phoneme
+
+T = TypeVar("T", bound=np.generic)
+
+
+@dataclass(frozen=True)
+class MoraTable:
+    """
+    モーラ系列の列指向表現。各フィールドはモーラ数を長さとする配列である。
+
+    音声合成の内部処理で用いる。モーラごとの pydantic モデルの複製や属性更新を避け、設定の適用をベクトル演算で行う。
+    """
+
+    consonant_ids: NDArray[np.int64]  # 子音の音素 ID。子音をもたないモーラは -1
+    vowel_ids: NDArray[np.int64]  # 母音の音素 ID
+    consonant_lengths: NDArray[np.float64]  # 子音の長さ。子音長をもたないモーラは 0
+    vowel_lengths: NDArray[np.float64]  # 母音の長さ
+    pitches: NDArray[np.float64]  # 音高
+    is_pause: NDArray[np.bool_]  # 母音が無音 `pau` である
+    is_unvoiced: NDArray[np.bool_]  # 母音が無声（無声母音・促音・無音）である
+
+    @classmethod
+    def from_moras(cls, moras: list[Mora]) -> Self:
+        """モーラ系列から列指向表現を生成する。"""
+        consonant_ids: list[int] = []
+        vowel_ids: list[int] = []
+        consonant_lengths: list[float] = []
+        vowel_lengths: list[float] = []
+        pitches: list[float] = []
+        is_pause: list[bool] = []
+        is_unvoiced: list[bool] = []
+        for mora in moras:
+            vowel = Phoneme(mora.vowel)
+            consonant_ids += [Phoneme(mora.consonant).id if mora.consonant else -1]
+            vowel_ids += [vowel.id]
+            consonant_length = mora.consonant_length
+            consonant_lengths += [consonant_length if consonant_length else 0.0]
+            vowel_lengths += [mora.vowel_length]
+            pitches += [mora.pitch]
+            is_pause += [mora.vowel == "pau"]
+            is_unvoiced += [vowel.is_unvoiced_mora_tail()]
+        return cls(
+            consonant_ids=np.array(consonant_ids, dtype=np.int64),
+            vowel_ids=np.array(vowel_ids, dtype=np.int64),
+            consonant_lengths=np.array(consonant_lengths, dtype=np.float64),
+            vowel_lengths=np.array(vowel_lengths, dtype=np.float64),
+            pitches=np.array(pitches, dtype=np.float64),
+            is_pause=np.array(is_pause, dtype=np.bool_),
+            is_unvoiced=np.array(is_unvoiced, dtype=np.bool_),
+        )
+
+    def __len__(self) -> int:
+        """モーラ数を取得する。"""
+        return len(self.vowel_ids)
+
+    @property
+    def has_consonant(self) -> NDArray[np.bool_]:
+        """各モーラが子音をもつか否かを取得する。"""
+        return self.consonant_ids >= 0
+
+    def phoneme_ids(self) -> NDArray[np.int64]:
+        """(子音, 母音) の順に並べた音素 ID 系列を取得する。shape = (Phoneme,)"""
+        return self.to_phoneme_values(self.consonant_ids, self.vowel_ids)
+
+    def to_phoneme_values(
+        self, consonant_values: NDArray[T], vowel_values: NDArray[T]
+    ) -> NDArray[T]:
+        """モーラごとの子音・母音の値を (子音, 母音) の順に並べ、子音をもたないモーラの子音を除いた音素ごとの値を得る。"""
+        has_consonant = self.has_consonant
+        is_phoneme = np.stack([has_consonant, np.ones_like(has_consonant)], axis=1)
+        return np.stack([consonant_values, vowel_values], axis=1)[is_phoneme]
+
+
+def concat_mora_tables(tables: list[MoraTable]) -> MoraTable:
+    """モーラ系列の列指向表現を連結する。"""
+    columns = {
+        field.name: np.concatenate([getattr(table, field.name) for table in tables])
+        for field in fields(MoraTable)
+    }
+    return MoraTable(**columns)
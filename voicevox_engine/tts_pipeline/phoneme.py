@@ -1,6 +1,6 @@
 """音素"""
 
-from typing import Literal
+from typing import Final, Literal
 
 import numpy as np
 from numpy.typing import NDArray
@@ -56,7 +56,11 @@ _PHONEME_LIST += ("o", "p", "py", "r", "ry", "s", "sh", "t", "ts", "ty")
 _PHONEME_LIST += ("u", "v", "w", "y", "z")
 
 # 音素リストの要素数
-_NUM_PHONEME = len(_PHONEME_LIST)
+NUM_PHONEME: Final = len(_PHONEME_LIST)
+_NUM_PHONEME = NUM_PHONEME
+
+# 音素から音素ID (音素リスト内でのindex) への対応
+_PHONEME_ID: dict[str, int] = {p: i for i, p in enumerate(_PHONEME_LIST)}
 
 _UNVOICED_MORA_TAIL_PHONEMES = ["A", "I", "U", "E", "O", "cl", "pau"]
 _MORA_TAIL_PHONEMES = ["a", "i", "u", "e", "o", "N"] + _UNVOICED_MORA_TAIL_PHONEMES
@@ -80,7 +84,10 @@ class Phoneme:
     @property
     def id(self) -> int:
         """音素ID (音素リスト内でのindex) を取得する"""
-        return self._PHONEME_LIST.index(self._phoneme)
+        phoneme_id = _PHONEME_ID.get(self._phoneme)
+        if phoneme_id is None:
+            raise ValueError(f"{self._phoneme!r} は音素リストに存在しない音素です")
+        return phoneme_id
 
     @property
     def onehot(self) -> NDArray[np.float32]:
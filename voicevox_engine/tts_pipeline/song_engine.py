@@ -1,5 +1,6 @@
 """歌声音声合成エンジン"""
 
+from collections.abc import Sequence
 from typing import Any, Final, Literal, TypeAlias
 
 import numpy as np
@@ -8,7 +9,9 @@ from numpy.typing import NDArray
 from ..core.core_adapter import CoreAdapter, DeviceSupport
 from ..core.core_initializer import CoreManager
 from ..core.core_wrapper import CoreWrapper
+from ..core.model_residency import ModelResidencyPolicy
 from ..metas.metas import StyleId
+from ..metrics import set_core_version
 from ..utility.core_version_utility import MOCK_CORE_VERSION, get_latest_version
 from .audio_postprocessing import raw_wave_to_output_wave
 from .model import (
@@ -206,9 +209,14 @@ def _calc_phoneme_lengths(
 class SongEngine:
     """音声合成器（core）の管理/実行/プロキシと音声合成フロー"""
 
-    def __init__(self, core: CoreWrapper):
+    def __init__(
+        self,
+        core: CoreWrapper,
+        replicas: Sequence[CoreWrapper] = (),
+        model_residency_policy: ModelResidencyPolicy | None = None,
+    ):
         super().__init__()
-        self._core = CoreAdapter(core)
+        self._core = CoreAdapter(core, replicas, model_residency_policy)
 
     @property
     def default_sampling_rate(self) -> int:
@@ -428,10 +436,11 @@ class SongEngineManager:
         self._engines[version] = engine
 
     def get_song_engine(self, version: str | LatestVersion) -> SongEngine:
-        """指定バージョンのエンジンを取得する。"""
+        """指定バージョンのエンジンを取得する。処理中の要求のメトリクスにはそのバージョンを記録する。"""
         if version == LATEST_VERSION:
-            return self._engines[self._latest_version()]
-        elif version in self._engines:
+            version = self._latest_version()
+        if version in self._engines:
+            set_core_version(version)
             return self._engines[version]
         elif version == MOCK_CORE_VERSION:
             raise MockSongEngineNotFound()
@@ -439,14 +448,23 @@ class SongEngineManager:
             raise SongEngineNotFound(version=version)
 
 
-def make_song_engines_from_cores(core_manager: CoreManager) -> SongEngineManager:
-    """コア一覧からSongエンジン一覧を生成する"""
+def make_song_engines_from_cores(
+    core_manager: CoreManager,
+    model_residency_policy: ModelResidencyPolicy | None = None,
+) -> SongEngineManager:
+    """
+    コア一覧からSongエンジン一覧を生成する。
+
+    常駐設定がある場合は、同じコアの TTS エンジンと共有する上限の内で各エンジンのモデルの常駐数を制限する。
+    """
     song_engines = SongEngineManager()
     for ver, core in core_manager.items():
         if ver == MOCK_CORE_VERSION:
             from ..dev.song_engine.mock import MockSongEngine
 
-            song_engines.register_engine(MockSongEngine(), ver)
+            song_engines.register_engine(MockSongEngine(model_residency_policy), ver)
         else:
-            song_engines.register_engine(SongEngine(core.core), ver)
+            song_engines.register_engine(
+                SongEngine(core.core, core.replicas, model_residency_policy), ver
+            )
     return song_engines
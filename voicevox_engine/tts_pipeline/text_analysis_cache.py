@@ -0,0 +1,84 @@
+"""テキスト解析結果のキャッシュ"""
+
+import copy
+import threading
+from collections import OrderedDict
+from typing import Final
+
+from ..metrics import time_stage
+from .model import AccentPhrase
+from .njd_feature_processor import text_to_full_context_labels
+from .text_analyzer import full_context_labels_to_accent_phrases
+
+_MAX_ENTRIES: Final = 1024
+
+
+class _TextAnalysisCache:
+    """
+    テキストからアクセント句系列への解析結果を保持する LRU キャッシュ。
+
+    解析結果は OpenJTalk の辞書に依存するため、辞書の差し替え時に世代を進めて全て破棄する。
+    解析中に世代が進んだ場合、その解析結果は古い辞書に基づく可能性があるため登録しない。
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self._lock = threading.Lock()
+        self._max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, bool], list[AccentPhrase]] = OrderedDict()
+        self._generation = 0
+
+    def get(self, key: tuple[str, bool]) -> tuple[list[AccentPhrase] | None, int]:
+        """キャッシュされた解析結果の複製と現在の世代を取得する。"""
+        with self._lock:
+            accent_phrases = self._entries.get(key)
+            if accent_phrases is not None:
+                self._entries.move_to_end(key)
+            generation = self._generation
+        if accent_phrases is None:
+            return None, generation
+        return copy.deepcopy(accent_phrases), generation
+
+    def put(
+        self, key: tuple[str, bool], accent_phrases: list[AccentPhrase], generation: int
+    ) -> None:
+        """解析開始時の世代が現在の世代と一致する場合に限り、解析結果の複製を登録する。"""
+        accent_phrases = copy.deepcopy(accent_phrases)
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[key] = accent_phrases
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """全ての解析結果を破棄し、世代を進める。"""
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+
+_cache = _TextAnalysisCache(_MAX_ENTRIES)
+
+
+def text_to_accent_phrases(
+    text: str, enable_katakana_english: bool
+) -> list[AccentPhrase]:
+    """テキストからアクセント句系列を生成する。同一の入力に対しては前回の解析結果を再利用する。"""
+    key = (text, enable_katakana_english)
+    accent_phrases, generation = _cache.get(key)
+    if accent_phrases is not None:
+        return accent_phrases
+
+    with time_stage("text_to_full_context_labels"):
+        full_context_labels = text_to_full_context_labels(
+            text, enable_katakana_english=enable_katakana_english
+        )
+    accent_phrases = full_context_labels_to_accent_phrases(full_context_labels)
+    _cache.put(key, accent_phrases, generation)
+    return accent_phrases
+
+
+def clear_text_analysis_cache() -> None:
+    """テキスト解析結果のキャッシュを破棄する。OpenJTalk の辞書を差し替えた際に呼び出す。"""
+    _cache.clear()
@@ -87,6 +87,26 @@ def _is_ojt_phoneme(
     return p in _OJT_PHONEMES
 
 
+# フルコンテキストラベルのうち VOICEVOX ENGINE で利用する属性のみを捕捉するパターン
+# フルコンテキストラベルの仕様は、http://hts.sp.nitech.ac.jp/?Download の HTS-2.3のJapanese tar.bz2 (126 MB)をダウンロードして、data/lab_format.pdfを見るとリストが見つかります。
+# VOICEVOX ENGINE で利用されている属性: p3 phoneme / a2 moraIdx / f1 n_mora / f2 pos_accent / f3 疑問形 / f5 アクセント句Idx / i3 BreathGroupIdx
+# NOTE: 各属性を区切り文字以外の文字の連続として照合し、バックトラックを避ける。捕捉グループは上記の順に並ぶ。
+_LABEL_PATTERN: Final = re.compile(
+    r"^[^^]+\^[^-]+-([^+]+)\+[^=]+=[^/]+"
+    r"/A:[^+]+\+([^+]+)\+[^/]+"
+    r"/B:[^-]+-[^_]+_[^/]+"
+    r"/C:[^_]+_[^+]+\+[^/]+"
+    r"/D:[^+]+\+[^_]+_[^/]+"
+    r"/E:[^_]+_[^!]+![^_]+_[^-]+-[^/]+"
+    r"/F:([^_]+)_([^#]+)#([^_]+)_[^@]+@([^_]+)_[^|]+\|[^_]+_[^/]+"
+    r"/G:[^_]+_[^%]+%[^_]+_[^_]+_[^/]+"
+    r"/H:[^_]+_[^/]+"
+    r"/I:[^-]+-[^@]+@([^+]+)\+[^&]+&[^-]+-[^|]+\|[^+]+\+[^/]+"
+    r"/J:[^_]+_[^/]+"
+    r"/K:[^+]+\+[^-]+-[^/]+$"
+)
+
+
 @dataclass(frozen=True)
 class _Label:
     """フルコンテキストラベルのサブセット。"""
@@ -103,58 +123,39 @@ class _Label:
     @classmethod
     def from_feature(cls, feature: str) -> Self:
         """OpenJTalk feature から _Label インスタンスを生成する"""
-        # フルコンテキストラベルの仕様は、http://hts.sp.nitech.ac.jp/?Download の HTS-2.3のJapanese tar.bz2 (126 MB)をダウンロードして、data/lab_format.pdfを見るとリストが見つかります。
-        # VOICEVOX ENGINE で利用されている属性: p3 phoneme / a2 moraIdx / f1 n_mora / f2 pos_accent / f3 疑問形 / f5 アクセント句Idx / i3 BreathGroupIdx
-        result = re.search(
-            r"^(?P<p1>.+?)\^(?P<p2>.+?)\-(?P<p3>.+?)\+(?P<p4>.+?)\=(?P<p5>.+?)"
-            r"/A\:(?P<a1>.+?)\+(?P<a2>.+?)\+(?P<a3>.+?)"
-            r"/B\:(?P<b1>.+?)\-(?P<b2>.+?)\_(?P<b3>.+?)"
-            r"/C\:(?P<c1>.+?)\_(?P<c2>.+?)\+(?P<c3>.+?)"
-            r"/D\:(?P<d1>.+?)\+(?P<d2>.+?)\_(?P<d3>.+?)"
-            r"/E\:(?P<e1>.+?)\_(?P<e2>.+?)\!(?P<e3>.+?)\_(?P<e4>.+?)\-(?P<e5>.+?)"
-            r"/F\:(?P<f1>.+?)\_(?P<f2>.+?)\#(?P<f3>.+?)\_(?P<f4>.+?)\@(?P<f5>.+?)\_(?P<f6>.+?)\|(?P<f7>.+?)\_(?P<f8>.+?)"
-            r"/G\:(?P<g1>.+?)\_(?P<g2>.+?)\%(?P<g3>.+?)\_(?P<g4>.+?)\_(?P<g5>.+?)"
-            r"/H\:(?P<h1>.+?)\_(?P<h2>.+?)"
-            r"/I\:(?P<i1>.+?)\-(?P<i2>.+?)\@(?P<i3>.+?)\+(?P<i4>.+?)\&(?P<i5>.+?)\-(?P<i6>.+?)\|(?P<i7>.+?)\+(?P<i8>.+?)"
-            r"/J\:(?P<j1>.+?)\_(?P<j2>.+?)"
-            r"/K\:(?P<k1>.+?)\+(?P<k2>.+?)\-(?P<k3>.+?)$",
-            feature,
-        )
-        if result is None:
-            raise ValueError(feature)
-        contexts = result.groupdict()
-
-        # 音素をバリデーションする
-        p = contexts["p3"]
-        if _is_ojt_phoneme(p):
-            if p == "xx":
-                raise OjtUnknownPhonemeError()
-        else:
-            raise NonOjtPhonemeError()
-
-        # NOTE: pau と sil はアクセント句に属さないため、モーラインデックスが無い
-        _mora_index = contexts["a2"]
-        if _mora_index == "xx":
-            mora_index = None
-        else:
-            mora_index = int(_mora_index)
-
-        # NOTE: pau と sil はアクセント句に属さないため、アクセント位置が無い
-        _accent_position = contexts["f2"]
-        if _accent_position == "xx":
-            accent_position = None
-        else:
-            accent_position = int(_accent_position)
-
-        return cls(
-            phoneme=p,
-            is_pause=contexts["f1"] == "xx",
-            mora_index=mora_index,
-            accent_position=accent_position,
-            is_interrogative=contexts["f3"] == "1",
-            accent_phrase_index=contexts["f5"],
-            breath_group_index=contexts["i3"],
-        )
+        return cls.from_features([feature])[0]
+
+    @classmethod
+    def from_features(cls, features: list[str]) -> list[Self]:
+        """OpenJTalk feature 系列から _Label インスタンス系列を生成する"""
+        match_label = _LABEL_PATTERN.match
+        labels: list[Self] = []
+        for feature in features:
+            result = match_label(feature)
+            if result is None:
+                raise ValueError(feature)
+            p, a2, f1, f2, f3, f5, i3 = result.groups()
+
+            # 音素をバリデーションする
+            if _is_ojt_phoneme(p):
+                if p == "xx":
+                    raise OjtUnknownPhonemeError()
+            else:
+                raise NonOjtPhonemeError()
+
+            labels.append(
+                cls(
+                    phoneme=p,
+                    is_pause=f1 == "xx",
+                    # NOTE: pau と sil はアクセント句に属さないため、モーラインデックスとアクセント位置が無い
+                    mora_index=None if a2 == "xx" else int(a2),
+                    accent_position=None if f2 == "xx" else int(f2),
+                    is_interrogative=f3 == "1",
+                    accent_phrase_index=f5,
+                    breath_group_index=i3,
+                )
+            )
+        return labels
 
 
 def _generate_mora(consonant: _Label | None, vowel: _Label) -> Mora:
@@ -240,7 +241,7 @@ def full_context_labels_to_accent_phrases(
     full_context_labels: list[str],
 ) -> list[AccentPhrase]:
     """フルコンテキストラベルからアクセント句系列を生成する"""
-    all_labels = map(_Label.from_feature, full_context_labels)
+    all_labels = _Label.from_features(full_context_labels)
 
     pause_group_labels_list = [
         list(labels)
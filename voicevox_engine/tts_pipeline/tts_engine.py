@@ -1,7 +1,8 @@
 """テキスト音声合成エンジン"""
 
 import copy
-import math
+from collections.abc import Iterator, Sequence
+from dataclasses import replace
 from typing import Any, Final, Literal, TypeAlias
 
 import numpy as np
@@ -10,25 +11,30 @@ from numpy.typing import NDArray
 from ..core.core_adapter import CoreAdapter, DeviceSupport
 from ..core.core_initializer import CoreManager
 from ..core.core_wrapper import CoreWrapper
+from ..core.model_residency import ModelResidencyPolicy, ModelResidencyStats
 from ..metas.metas import StyleId
+from ..metrics import annotate_request, set_core_version, time_stage
 from ..model import AudioQuery
 from ..utility.core_version_utility import MOCK_CORE_VERSION, get_latest_version
-from .audio_postprocessing import raw_wave_to_output_wave
+from .audio_postprocessing import OutputWaveStream, raw_wave_to_output_wave
 from .kana_converter import parse_kana
 from .model import (
     AccentPhrase,
     Mora,
 )
 from .mora_mapping import mora_phonemes_to_mora_kana
-from .njd_feature_processor import text_to_full_context_labels
-from .phoneme import Phoneme
-from .text_analyzer import full_context_labels_to_accent_phrases
+from .mora_table import MoraTable, concat_mora_tables
+from .phoneme import NUM_PHONEME, Phoneme
+from .text_analysis_cache import text_to_accent_phrases
 
 # 疑問文語尾定数
 UPSPEAK_LENGTH = 0.15
 UPSPEAK_PITCH_ADD = 0.3
 UPSPEAK_PITCH_MAX = 6.5
 
+# ストリーミング合成時に分割区間の前後へ付与する文脈フレーム長
+STREAMING_MARGIN_FRAMES = 14
+
 
 class TalkInvalidInputError(Exception):
     """Talk の不正な入力エラー"""
@@ -46,16 +52,6 @@ def to_flatten_moras(accent_phrases: list[AccentPhrase]) -> list[Mora]:
     return moras
 
 
-def _to_flatten_phonemes(moras: list[Mora]) -> list[Phoneme]:
-    """モーラ系列から音素系列を抽出する"""
-    phonemes: list[Phoneme] = []
-    for mora in moras:
-        if mora.consonant:
-            phonemes += [Phoneme(mora.consonant)]
-        phonemes += [Phoneme(mora.vowel)]
-    return phonemes
-
-
 def _create_one_hot(accent_phrase: AccentPhrase, index: int) -> NDArray[np.int64]:
     """
     アクセント句から指定インデックスのみが 1 の配列 (onehot) を生成する。
@@ -73,6 +69,25 @@ def _generate_silence_mora(length: float) -> Mora:
     return Mora(text="　", vowel="sil", vowel_length=length, pitch=0.0)
 
 
+def _generate_upspeak_mora(accent_phrase: AccentPhrase) -> Mora | None:
+    """アクセント句の末尾へ付与すべき疑問形モーラ（同一母音・継続長 0.15秒・音高↑）を生成する。付与不要な場合は None を返す。"""
+    moras = accent_phrase.moras
+    if len(moras) == 0:
+        return None
+    # 疑問形補正条件: 疑問形アクセント句 & 末尾有声モーラ
+    if not (accent_phrase.is_interrogative and moras[-1].pitch > 0):
+        return None
+    last_mora = moras[-1]
+    return Mora(
+        text=mora_phonemes_to_mora_kana[last_mora.vowel],
+        consonant=None,
+        consonant_length=None,
+        vowel=last_mora.vowel,
+        vowel_length=UPSPEAK_LENGTH,
+        pitch=min(last_mora.pitch + UPSPEAK_PITCH_ADD, UPSPEAK_PITCH_MAX),
+    )
+
+
 def _apply_interrogative_upspeak(
     accent_phrases: list[AccentPhrase], enable_interrogative_upspeak: bool
 ) -> list[AccentPhrase]:
@@ -82,50 +97,69 @@ def _apply_interrogative_upspeak(
         return accent_phrases
 
     for accent_phrase in accent_phrases:
-        moras = accent_phrase.moras
-        if len(moras) == 0:
-            continue
-        # 疑問形補正条件: 疑問形アクセント句 & 末尾有声モーラ
-        if accent_phrase.is_interrogative and moras[-1].pitch > 0:
-            last_mora = copy.deepcopy(moras[-1])
-            upspeak_mora = Mora(
-                text=mora_phonemes_to_mora_kana[last_mora.vowel],
-                consonant=None,
-                consonant_length=None,
-                vowel=last_mora.vowel,
-                vowel_length=UPSPEAK_LENGTH,
-                pitch=min(last_mora.pitch + UPSPEAK_PITCH_ADD, UPSPEAK_PITCH_MAX),
-            )
+        upspeak_mora = _generate_upspeak_mora(accent_phrase)
+        if upspeak_mora is not None:
             accent_phrase.moras += [upspeak_mora]
     return accent_phrases
 
 
-def _apply_prepost_silence(moras: list[Mora], query: AudioQuery) -> list[Mora]:
+def prepare_synthesis_query(
+    query: AudioQuery, enable_interrogative_upspeak: bool
+) -> AudioQuery:
+    """音声合成用のクエリへ疑問文語尾自動調整を適用し、合成される音声波形を一意に定めるクエリを生成する"""
+    # モーフィング時などに同一参照のqueryで複数回呼ばれる可能性があるので、元の引数のqueryに破壊的変更を行わない
+    query = copy.deepcopy(query)
+    query.accent_phrases = _apply_interrogative_upspeak(
+        query.accent_phrases, enable_interrogative_upspeak
+    )
+    return query
+
+
+def _query_to_mora_table(
+    query: AudioQuery, enable_interrogative_upspeak: bool
+) -> MoraTable:
+    """音声合成用のクエリから、必要に応じて疑問形モーラを付与したモーラ系列の列指向表現を生成する。クエリは変更しない。"""
+    moras: list[Mora] = []
+    for accent_phrase in query.accent_phrases:
+        moras += accent_phrase.moras
+        if enable_interrogative_upspeak:
+            upspeak_mora = _generate_upspeak_mora(accent_phrase)
+            if upspeak_mora is not None:
+                moras += [upspeak_mora]
+        if accent_phrase.pause_mora:
+            moras += [accent_phrase.pause_mora]
+    return MoraTable.from_moras(moras)
+
+
+def _apply_prepost_silence(moras: MoraTable, query: AudioQuery) -> MoraTable:
     """モーラ系列へ音声合成用のクエリがもつ前後無音（`prePhonemeLength` & `postPhonemeLength`）を付加する"""
-    pre_silence_moras = [_generate_silence_mora(query.prePhonemeLength)]
-    post_silence_moras = [_generate_silence_mora(query.postPhonemeLength)]
-    moras = pre_silence_moras + moras + post_silence_moras
-    return moras
+    pre_silence_moras = MoraTable.from_moras(
+        [_generate_silence_mora(query.prePhonemeLength)]
+    )
+    post_silence_moras = MoraTable.from_moras(
+        [_generate_silence_mora(query.postPhonemeLength)]
+    )
+    return concat_mora_tables([pre_silence_moras, moras, post_silence_moras])
 
 
-def _apply_speed_scale(moras: list[Mora], query: AudioQuery) -> list[Mora]:
+def _apply_speed_scale(moras: MoraTable, query: AudioQuery) -> MoraTable:
     """モーラ系列へ音声合成用のクエリがもつ話速スケール（`speedScale`）を適用する"""
-    for mora in moras:
-        mora.vowel_length /= query.speedScale
-        if mora.consonant_length:
-            mora.consonant_length /= query.speedScale
-    return moras
+    consonant_lengths = moras.consonant_lengths / np.float64(query.speedScale)
+    vowel_lengths = moras.vowel_lengths / np.float64(query.speedScale)
+    return replace(
+        moras, consonant_lengths=consonant_lengths, vowel_lengths=vowel_lengths
+    )
 
 
 def _count_frame_per_unit(
-    moras: list[Mora],
+    moras: MoraTable,
 ) -> tuple[NDArray[np.int64], NDArray[np.int64]]:
     """
     音素あたり・モーラあたりのフレーム長を算出する
 
     Parameters
     ----------
-    moras : list[Mora]
+    moras : MoraTable
         モーラ系列
 
     Returns
@@ -135,75 +169,60 @@ def _count_frame_per_unit(
     frame_per_mora : NDArray[np.int64]
         モーラあたりのフレーム長。端数丸め。shape = (Mora,)
     """
-    frame_per_phoneme: list[int] = []
-    frame_per_mora: list[int] = []
-    for mora in moras:
-        vowel_frames = _to_frame(mora.vowel_length)
-        consonant_frames = (
-            _to_frame(mora.consonant_length) if mora.consonant_length is not None else 0
-        )
-        mora_frames = (
-            vowel_frames + consonant_frames
-        )  # 音素ごとにフレーム長を算出し、和をモーラのフレーム長とする
-
-        if mora.consonant:
-            frame_per_phoneme += [consonant_frames]
-        frame_per_phoneme += [vowel_frames]
-        frame_per_mora += [mora_frames]
-
-    return (
-        np.array(frame_per_phoneme, dtype=np.int64),
-        np.array(frame_per_mora, dtype=np.int64),
-    )
+    consonant_frames = _to_frame(moras.consonant_lengths)
+    vowel_frames = _to_frame(moras.vowel_lengths)
+    # 音素ごとにフレーム長を算出し、和をモーラのフレーム長とする
+    frame_per_mora = consonant_frames + vowel_frames
+    frame_per_phoneme = moras.to_phoneme_values(consonant_frames, vowel_frames)
+    return frame_per_phoneme, frame_per_mora
 
 
-def _to_frame(sec: float) -> int:
+def _to_frame(sec: NDArray[np.float64]) -> NDArray[np.int64]:
     FRAMERATE = 93.75  # 24000 / 256 [frame/sec]
     # NOTE: `round` は偶数丸め。移植時に取扱い注意。詳細は voicevox_engine#552
     sec_rounded: NDArray[np.float64] = np.round(sec * FRAMERATE)
-    return sec_rounded.astype(np.int32).item()
+    return sec_rounded.astype(np.int32).astype(np.int64)
 
 
-def _apply_pitch_scale(moras: list[Mora], query: AudioQuery) -> list[Mora]:
+def _apply_pitch_scale(moras: MoraTable, query: AudioQuery) -> MoraTable:
     """モーラ系列へ音声合成用のクエリがもつ音高スケール（`pitchScale`）を適用する"""
-    for mora in moras:
-        mora.pitch *= 2**query.pitchScale
-    return moras
+    return replace(moras, pitches=moras.pitches * 2**query.pitchScale)
 
 
-def _apply_pause_length(moras: list[Mora], query: AudioQuery) -> list[Mora]:
+def _apply_pause_length(moras: MoraTable, query: AudioQuery) -> MoraTable:
     """モーラ系列へ音声合成用のクエリがもつ無音時間（`pauseLength`）を適用する"""
-    if query.pauseLength is not None:
-        for mora in moras:
-            if mora.vowel == "pau":
-                mora.vowel_length = query.pauseLength
-    return moras
+    if query.pauseLength is None:
+        return moras
+    vowel_lengths = np.where(moras.is_pause, query.pauseLength, moras.vowel_lengths)
+    return replace(moras, vowel_lengths=vowel_lengths)
 
 
-def _apply_pause_length_scale(moras: list[Mora], query: AudioQuery) -> list[Mora]:
+def _apply_pause_length_scale(moras: MoraTable, query: AudioQuery) -> MoraTable:
     """モーラ系列へ音声合成用のクエリがもつ無音時間スケール（`pauseLengthScale`）を適用する"""
-    for mora in moras:
-        if mora.vowel == "pau":
-            mora.vowel_length *= query.pauseLengthScale
-    return moras
+    vowel_lengths = np.where(
+        moras.is_pause,
+        moras.vowel_lengths * query.pauseLengthScale,
+        moras.vowel_lengths,
+    )
+    return replace(moras, vowel_lengths=vowel_lengths)
 
 
-def _apply_intonation_scale(moras: list[Mora], query: AudioQuery) -> list[Mora]:
+def _apply_intonation_scale(moras: MoraTable, query: AudioQuery) -> MoraTable:
     """モーラ系列へ音声合成用のクエリがもつ抑揚スケール（`intonationScale`）を適用する"""
     # 有声音素 (f0>0) の平均値に対する乖離度をスケール
-    voiced = list(filter(lambda mora: mora.pitch > 0, moras))
-    mean_f0 = np.mean(list(map(lambda mora: mora.pitch, voiced))).item()
-    if mean_f0 != math.nan:  # 空リスト -> NaN
-        for mora in voiced:
-            mora.pitch = (mora.pitch - mean_f0) * query.intonationScale + mean_f0
-    return moras
+    voiced = moras.pitches > 0
+    if not voiced.any():
+        return moras
+    mean_f0 = np.mean(moras.pitches[voiced])
+    scaled_pitches = (moras.pitches - mean_f0) * query.intonationScale + mean_f0
+    return replace(moras, pitches=np.where(voiced, scaled_pitches, moras.pitches))
 
 
 def _query_to_decoder_feature(
-    query: AudioQuery,
+    query: AudioQuery, enable_interrogative_upspeak: bool
 ) -> tuple[NDArray[np.float32], NDArray[np.float32]]:
     """音声合成用のクエリからフレームごとの音素 (shape=(フレーム長, 音素数)) と音高 (shape=(フレーム長,)) を得る"""
-    moras = to_flatten_moras(query.accent_phrases)
+    moras = _query_to_mora_table(query, enable_interrogative_upspeak)
 
     # 設定を適用する
     moras = _apply_prepost_silence(moras, query)
@@ -213,24 +232,75 @@ def _query_to_decoder_feature(
     moras = _apply_pitch_scale(moras, query)
     moras = _apply_intonation_scale(moras, query)
 
-    # 表現を変更する（音素クラス → 音素 onehot ベクトル、モーラクラス → 音高スカラ）
-    phoneme = np.stack([p.onehot for p in _to_flatten_phonemes(moras)])
-    f0 = np.array([mora.pitch for mora in moras], dtype=np.float32)
+    # 表現を変更する（音素 → 音素 ID、モーラ → 音高スカラ）
+    phoneme_ids = moras.phoneme_ids()
+    f0 = moras.pitches.astype(np.float32)
 
     # 時間スケールを変更する（音素・モーラ → フレーム）
     frame_per_phoneme, frame_per_mora = _count_frame_per_unit(moras)
-    phoneme = np.repeat(phoneme, frame_per_phoneme, axis=0)
+    frame_phoneme_ids = np.repeat(phoneme_ids, frame_per_phoneme)
     f0 = np.repeat(f0, frame_per_mora)
 
+    # 表現を変更する（音素 ID → 音素 onehot ベクトル）
+    n_frame = len(frame_phoneme_ids)
+    phoneme = np.zeros((n_frame, NUM_PHONEME), dtype=np.float32)
+    phoneme[np.arange(n_frame), frame_phoneme_ids] = 1.0
+
     return phoneme, f0
 
 
+def _split_frames_at_pauses(phoneme: NDArray[np.float32]) -> list[tuple[int, int]]:
+    """
+    フレームごとの音素を文中の無音区間の中央で分割し、分割区間の系列を得る
+
+    Parameters
+    ----------
+    phoneme : NDArray[np.float32]
+        フレームごとの音素 onehot。shape = (Frame, Phoneme)
+
+    Returns
+    -------
+    spans : list[tuple[int, int]]
+        分割区間 (開始フレーム, 終了フレーム) の系列。全区間を重複なく覆う。
+    """
+    n_frames = len(phoneme)
+    is_pause = np.zeros(n_frames + 2, dtype=np.int8)
+    is_pause[1:-1] = phoneme[:, Phoneme("pau").id] == 1
+    # 無音区間の開始・終了フレーム
+    edges = np.diff(is_pause)
+    run_starts = np.flatnonzero(edges == 1)
+    run_ends = np.flatnonzero(edges == -1)
+
+    # 前後無音を除く無音区間の中央を分割点とする
+    boundaries = [
+        int(start + end) // 2
+        for start, end in zip(run_starts, run_ends, strict=True)
+        if start > 0 and end < n_frames
+    ]
+    points = [0] + boundaries + [n_frames]
+    return list(zip(points[:-1], points[1:], strict=True))
+
+
+def _annotate_synthesis_request(query: AudioQuery, num_frames: int) -> None:
+    """処理中の要求に音声合成の入力の規模を記録する。"""
+    annotate_request(
+        mora_count=len(to_flatten_moras(query.accent_phrases)),
+        frame_count=num_frames,
+        sampling_rate=query.outputSamplingRate,
+    )
+
+
 class TTSEngine:
     """音声合成器（core）の管理/実行/プロキシと音声合成フロー"""
 
-    def __init__(self, core: CoreWrapper):
+    def __init__(
+        self,
+        core: CoreWrapper,
+        replicas: Sequence[CoreWrapper] = (),
+        model_residency_policy: ModelResidencyPolicy | None = None,
+    ):
         super().__init__()
-        self._core = CoreAdapter(core)
+        self._core = CoreAdapter(core, replicas, model_residency_policy)
 
     @property
     def default_sampling_rate(self) -> int:
@@ -248,24 +318,20 @@ class TTSEngine:
         """アクセント句系列に含まれる音素の長さをスタイルに合わせて更新する。"""
         # モーラ系列を抽出する
         moras = to_flatten_moras(accent_phrases)
-
-        # 音素系列を抽出する
-        phonemes = _to_flatten_phonemes(moras)
-
-        # 音素クラスから音素IDスカラへ表現を変換する
-        phoneme_ids = np.array([p.id for p in phonemes], dtype=np.int64)
+        mora_table = MoraTable.from_moras(moras)
 
         # 音素ごとの長さを生成する
+        phoneme_ids = mora_table.phoneme_ids()
         phoneme_lengths = self._core.safe_yukarin_s_forward(phoneme_ids, style_id)
 
         # 生成された音素長でモーラの音素長を更新する
-        vowel_indexes = [i for i, p in enumerate(phonemes) if p.is_mora_tail()]
-        for i, mora in enumerate(moras):
+        vowel_indexes = np.cumsum(mora_table.has_consonant + 1) - 1
+        for mora, vowel_index in zip(moras, vowel_indexes, strict=True):
             if mora.consonant is None:
                 mora.consonant_length = None
             else:
-                mora.consonant_length = phoneme_lengths[vowel_indexes[i] - 1]
-            mora.vowel_length = phoneme_lengths[vowel_indexes[i]]
+                mora.consonant_length = phoneme_lengths[vowel_index - 1]
+            mora.vowel_length = phoneme_lengths[vowel_index]
 
         return accent_phrases
 
@@ -303,21 +369,14 @@ class TTSEngine:
             [_create_one_hot(accent_phrase, -1) for accent_phrase in accent_phrases]
         )
 
-        # アクセント句系列からモーラ系列と音素系列を抽出する
+        # アクセント句系列からモーラ系列を抽出する
         moras = to_flatten_moras(accent_phrases)
-
-        # モーラ系列から子音ID系列・母音ID系列を抽出する
-        consonant_id_ints = [
-            Phoneme(mora.consonant).id if mora.consonant else -1 for mora in moras
-        ]
-        consonant_ids = np.array(consonant_id_ints, dtype=np.int64)
-        vowels = [Phoneme(mora.vowel) for mora in moras]
-        vowel_ids = np.array([p.id for p in vowels], dtype=np.int64)
+        mora_table = MoraTable.from_moras(moras)
 
         # コアを用いてモーラ音高を生成する
         f0 = self._core.safe_yukarin_sa_forward(
-            vowel_ids,
-            consonant_ids,
+            mora_table.vowel_ids,
+            mora_table.consonant_ids,
             start_accent_list,
             end_accent_list,
             start_accent_phrase_list,
@@ -326,13 +385,11 @@ class TTSEngine:
         )
 
         # 母音が無声であるモーラは音高を 0 とする
-        for i, p in enumerate(vowels):
-            if p.is_unvoiced_mora_tail():
-                f0[i] = 0
+        f0[mora_table.is_unvoiced] = 0
 
         # 更新する
-        for i, mora in enumerate(moras):
-            mora.pitch = f0[i]
+        for mora, pitch in zip(moras, f0, strict=True):
+            mora.pitch = pitch
 
         return accent_phrases
 
@@ -351,10 +408,7 @@ class TTSEngine:
         enable_katakana_english: bool,
     ) -> list[AccentPhrase]:
         """テキストからアクセント句系列を生成し、スタイルIDに基づいてその音素長・モーラ音高を更新する"""
-        full_context_labels = text_to_full_context_labels(
-            text, enable_katakana_english=enable_katakana_english
-        )
-        accent_phrases = full_context_labels_to_accent_phrases(full_context_labels)
+        accent_phrases = text_to_accent_phrases(text, enable_katakana_english)
         accent_phrases = self.update_length_and_pitch(accent_phrases, style_id)
         return accent_phrases
 
@@ -373,17 +427,57 @@ class TTSEngine:
         enable_interrogative_upspeak: bool,
     ) -> NDArray[np.float32]:
         """音声合成用のクエリ・スタイルID・疑問文語尾自動調整フラグに基づいて音声波形を生成する"""
-        # モーフィング時などに同一参照のqueryで複数回呼ばれる可能性があるので、元の引数のqueryに破壊的変更を行わない
-        query = copy.deepcopy(query)
-        query.accent_phrases = _apply_interrogative_upspeak(
-            query.accent_phrases, enable_interrogative_upspeak
-        )
-
-        phoneme, f0 = _query_to_decoder_feature(query)
+        phoneme, f0 = _query_to_decoder_feature(query, enable_interrogative_upspeak)
+        _annotate_synthesis_request(query, len(f0))
         raw_wave, sr_raw_wave = self._core.safe_decode_forward(phoneme, f0, style_id)
-        wave = raw_wave_to_output_wave(query, raw_wave, sr_raw_wave)
+        with time_stage("raw_wave_to_output_wave", style_id):
+            wave = raw_wave_to_output_wave(query, raw_wave, sr_raw_wave)
         return wave
 
+    def synthesize_wave_stream(
+        self,
+        query: AudioQuery,
+        style_id: StyleId,
+        enable_interrogative_upspeak: bool,
+    ) -> Iterator[NDArray[np.float32]]:
+        """
+        音声合成用のクエリを文中の無音区間で分割し、区間ごとに生成した音声波形を逐次出力するイテレーターを返す
+
+        クエリの検証・特徴量の生成・区間の分割はこの呼び出しの時点で行い、返されたイテレーターは区間ごとの波形生成のみを行う。
+        """
+        phoneme, f0 = _query_to_decoder_feature(query, enable_interrogative_upspeak)
+        _annotate_synthesis_request(query, len(f0))
+        spans = _split_frames_at_pauses(phoneme)
+        return self._decode_spans(query, style_id, phoneme, f0, spans)
+
+    def _decode_spans(
+        self,
+        query: AudioQuery,
+        style_id: StyleId,
+        phoneme: NDArray[np.float32],
+        f0: NDArray[np.float32],
+        spans: list[tuple[int, int]],
+    ) -> Iterator[NDArray[np.float32]]:
+        """フレーム区間ごとに音声波形を生成し、逐次出力する"""
+        stream: OutputWaveStream | None = None
+        for i, (start, end) in enumerate(spans):
+            # 区間の境界で音声が途切れないよう、前後の文脈を含めて生成したのちに切り出す
+            head = max(start - STREAMING_MARGIN_FRAMES, 0)
+            tail = min(end + STREAMING_MARGIN_FRAMES, len(f0))
+            raw_wave, sr_raw_wave = self._core.safe_decode_forward(
+                phoneme[head:tail], f0[head:tail], style_id
+            )
+            samples_per_frame = len(raw_wave) // max(tail - head, 1)
+            raw_wave = raw_wave[
+                (start - head) * samples_per_frame : (end - head) * samples_per_frame
+            ]
+
+            if stream is None:
+                stream = OutputWaveStream(query, sr_raw_wave)
+            with time_stage("raw_wave_to_output_wave", style_id):
+                wave = stream.process(raw_wave, last=i == len(spans) - 1)
+            yield wave
+
     def initialize_synthesis(self, style_id: StyleId, skip_reinit: bool) -> None:
         """指定されたスタイル ID に関する合成機能を初期化する。既に初期化されていた場合は引数に応じて再初期化する。"""
         self._core.initialize_style_id_synthesis(style_id, skip_reinit=skip_reinit)
@@ -392,6 +486,14 @@ class TTSEngine:
         """指定されたスタイル ID に関する合成機能が初期化済みか否かを取得する。"""
         return self._core.is_initialized_style_id_synthesis(style_id)
 
+    def residency_stats(self) -> list[ModelResidencyStats]:
+        """コアのインスタンスごとのモデル常駐状況を取得する。常駐設定が無い場合は空のリストを返す。"""
+        return self._core.residency_stats()
+
+    def pending_core_calls(self) -> list[int]:
+        """コアのインスタンスごとの実行中および実行待ちの推論呼び出し数を取得する。"""
+        return self._core.pending_calls()
+
 
 class TTSEngineNotFound(Exception):
     """TTSEngine が見つからないエラー"""
@@ -420,7 +522,8 @@ class TTSEngineManager:
         """登録されたエンジンのバージョン一覧を取得する。"""
         return list(self._engines.keys())
 
-    def _latest_version(self) -> str:
+    def latest_version(self) -> str:
+        """登録された最新版エンジンのバージョンを取得する。"""
         return get_latest_version(self.versions())
 
     def register_engine(self, engine: TTSEngine, version: str) -> None:
@@ -428,10 +531,11 @@ class TTSEngineManager:
         self._engines[version] = engine
 
     def get_tts_engine(self, version: str | LatestVersion) -> TTSEngine:
-        """指定バージョンのエンジンを取得する。"""
+        """指定バージョンのエンジンを取得する。処理中の要求のメトリクスにはそのバージョンを記録する。"""
         if version == LATEST_VERSION:
-            return self._engines[self._latest_version()]
-        elif version in self._engines:
+            version = self.latest_version()
+        if version in self._engines:
+            set_core_version(version)
             return self._engines[version]
         elif version == MOCK_CORE_VERSION:
             raise MockTTSEngineNotFound()
@@ -439,14 +543,28 @@ class TTSEngineManager:
             raise TTSEngineNotFound(version=version)
 
 
-def make_tts_engines_from_cores(core_manager: CoreManager) -> TTSEngineManager:
-    """コア一覧からTTSエンジン一覧を生成する"""
+def make_tts_engines_from_cores(
+    core_manager: CoreManager,
+    model_residency_policy: ModelResidencyPolicy | None = None,
+) -> TTSEngineManager:
+    """
+    コア一覧からTTSエンジン一覧を生成する。
+
+    常駐設定がある場合は各エンジンのモデルの常駐数を制限する。
+    """
     tts_engines = TTSEngineManager()
     for ver, core in core_manager.items():
         if ver == MOCK_CORE_VERSION:
             from ..dev.tts_engine.mock import MockTTSEngine
 
-            tts_engines.register_engine(MockTTSEngine(), ver)
+            tts_engines.register_engine(MockTTSEngine(model_residency_policy), ver)
         else:
-            tts_engines.register_engine(TTSEngine(core.core), ver)
+            tts_engines.register_engine(
+                TTSEngine(
+                    core.core,
+                    core.replicas,
+                    model_residency_policy,
+                ),
+                ver,
+            )
     return tts_engines
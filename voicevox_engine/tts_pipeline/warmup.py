@@ -0,0 +1,161 @@
+"""スタイルの事前読み込み（ウォームアップ）"""
+
+import threading
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from typing import Final, Literal, TypeAlias
+
+from pydantic import BaseModel, Field
+
+from ..core.core_adapter import CoreCharacter
+from ..metas.metas import StyleId
+from ..model import AudioQuery
+from .tts_engine import TTSEngine
+
+# 全てのスタイル、またはスタイル ID のリスト
+WarmupPlan: TypeAlias = Literal["all"] | list[StyleId]
+
+# 試し合成に用いるテキスト
+_WARMUP_TEXT: Final = "テスト"
+
+
+def parse_warmup_plan(text: str) -> WarmupPlan:
+    """
+    ウォームアップ対象の指定を解釈する。
+
+    `all` は全てのスタイルを、カンマ区切りの整数列はスタイル ID のリストを表す。
+    """
+    if text.strip() == "all":
+        return "all"
+    try:
+        return [StyleId(int(item)) for item in text.split(",") if item.strip()]
+    except ValueError as e:
+        msg = f"ウォームアップ対象の指定 '{text}' が不正です。all またはカンマ区切りのスタイル ID を指定してください。"
+        raise ValueError(msg) from e
+
+
+class WarmupProgress(BaseModel):
+    """スタイルのウォームアップの進捗"""
+
+    total: int = Field(description="ウォームアップ対象のスタイル数")
+    completed: int = Field(description="ウォームアップを完了したスタイル数")
+    failed_style_ids: list[StyleId] = Field(
+        description="ウォームアップに失敗したスタイルのID"
+    )
+    done: bool = Field(description="全てのスタイルのウォームアップを終えたか")
+
+
+class StyleWarmer:
+    """
+    指定されたスタイルのモデルを読み込み、試し合成で推論を一度実行しておく。
+
+    読み込みはスレッドプールで並列に行う。
+    喋れるスタイルは短い試し合成を行い、初回の推論にかかる初期化（セッションの準備やメモリ確保）を済ませる。
+    モデルの常駐数に上限がある場合、ウォームアップ自体がリサイクルを繰り返さないよう、対象を上限までのスタイルに絞る。
+    """
+
+    def __init__(
+        self,
+        engine: TTSEngine,
+        characters: list[CoreCharacter],
+        plan: WarmupPlan,
+        max_workers: int = 1,
+    ) -> None:
+        """
+        ウォームアップを準備する。ウォームアップは `start` の呼び出しで始まる。
+
+        Parameters
+        ----------
+        engine : TTSEngine
+            ウォームアップ対象のエンジン
+        characters : list[CoreCharacter]
+            エンジンのコアに含まれるキャラクター情報
+        plan : WarmupPlan
+            ウォームアップ対象のスタイル
+        max_workers : int
+            並列に読み込むスタイルの最大数
+        """
+        self._engine = engine
+        self._max_workers = max_workers
+
+        talk_style_ids: set[StyleId] = set()
+        all_style_ids: list[StyleId] = []
+        for character in characters:
+            for style in character.styles:
+                style_id = StyleId(style.id)
+                all_style_ids.append(style_id)
+                if style.type in (None, "talk"):
+                    talk_style_ids.add(style_id)
+        style_ids = all_style_ids if plan == "all" else plan
+        capacities = [stats.capacity for stats in engine.residency_stats()]
+        if capacities and len(style_ids) > min(capacities):
+            capacity = min(capacities)
+            msg = (
+                f"ウォームアップ対象の {len(style_ids)} スタイルはモデルの常駐数の上限 {capacity} を超えるため、"
+                f"先頭の {capacity} スタイルのみをウォームアップします。"
+            )
+            warnings.warn(msg, stacklevel=1)
+            style_ids = style_ids[:capacity]
+        self._style_ids = style_ids
+        self._talk_style_ids = talk_style_ids
+
+        self._lock = threading.Lock()
+        self._completed = 0
+        self._failed_style_ids: list[StyleId] = []
+
+    def start(self) -> None:
+        """ウォームアップをバックグラウンドで開始する。"""
+        threading.Thread(target=self.run, name="warmup", daemon=True).start()
+
+    def run(self) -> None:
+        """ウォームアップを実行し、全てのスタイルを終えるまで待つ。"""
+        with ThreadPoolExecutor(
+            max_workers=self._max_workers, thread_name_prefix="warmup"
+        ) as executor:
+            executor.map(self._warm_up, self._style_ids)
+
+    def _warm_up(self, style_id: StyleId) -> None:
+        try:
+            self._engine.initialize_synthesis(style_id, skip_reinit=True)
+            if style_id in self._talk_style_ids:
+                self._synthesize(style_id)
+        except Exception:
+            with self._lock:
+                self._failed_style_ids.append(style_id)
+        else:
+            with self._lock:
+                self._completed += 1
+
+    def _synthesize(self, style_id: StyleId) -> None:
+        accent_phrases = self._engine.create_accent_phrases(
+            _WARMUP_TEXT, style_id, enable_katakana_english=False
+        )
+        query = AudioQuery(
+            accent_phrases=accent_phrases,
+            speedScale=1,
+            pitchScale=0,
+            intonationScale=1,
+            volumeScale=1,
+            prePhonemeLength=0.1,
+            postPhonemeLength=0.1,
+            pauseLength=None,
+            pauseLengthScale=1,
+            outputSamplingRate=self._engine.default_sampling_rate,
+            outputStereo=False,
+            kana=None,
+        )
+        self._engine.synthesize_wave(
+            query, style_id, enable_interrogative_upspeak=False
+        )
+
+    def progress(self) -> WarmupProgress:
+        """ウォームアップの進捗を取得する。"""
+        with self._lock:
+            total = len(self._style_ids)
+            finished = self._completed + len(self._failed_style_ids)
+            return WarmupProgress(
+                total=total,
+                completed=self._completed,
+                failed_style_ids=list(self._failed_style_ids),
+                done=finished >= total,
+            )
@@ -0,0 +1,227 @@
+"""合成済み音声のキャッシュ"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+from .. import __version__
+from ..metas.metas import StyleId
+from ..model import AudioQuery
+
+_DISK_CACHE_SUFFIX = ".wav"
+
+
+@dataclass(frozen=True)
+class WaveCacheStats:
+    """音声キャッシュの利用状況"""
+
+    hits: int  # キャッシュから応答した回数（ディスク層からの応答を含む）
+    disk_hits: int  # ディスク層から応答した回数
+    misses: int  # キャッシュに無く音声合成が必要だった回数
+    evictions: int  # 容量超過によりメモリ層から追い出した回数
+    disk_evictions: int  # 容量超過によりディスク層から削除した回数
+    memory_entries: int  # メモリ層のエントリ数
+    memory_bytes: int  # メモリ層の合計バイト数
+    disk_entries: int  # ディスク層のエントリ数
+    disk_bytes: int  # ディスク層の合計バイト数
+
+
+def make_wave_cache_key(
+    query: AudioQuery,
+    style_id: StyleId,
+    enable_interrogative_upspeak: bool,
+    core_version: str,
+) -> str:
+    """音声合成結果を一意に定める入力からキャッシュキーを生成する。"""
+    # NOTE: 疑問文語尾自動調整はクエリと `enable_interrogative_upspeak` から一意に定まるため、
+    #       クエリを複製して適用せず、元のクエリとフラグをそのままキーに含める。
+    # 読み仮名 `kana` は音声合成に用いられないため除外する
+    query_json = query.model_dump_json(exclude={"kana"})
+    source = "\n".join(
+        [
+            __version__,
+            core_version,
+            str(style_id),
+            str(enable_interrogative_upspeak),
+            query_json,
+        ]
+    )
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+
+class WaveCache:
+    """
+    エンコード済み音声を合成条件のハッシュで引く LRU キャッシュ。
+
+    容量上限つきのメモリ層と、任意で容量上限つきのディスク層をもつ。
+    ディスク層のエントリは再起動後も利用され、最終利用時刻の古い順に削除される。
+    ディスクの読み書きはロックの外で行い、メモリ層の参照をファイル I/O で待たせない。
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        disk_dir: Path | None = None,
+        max_disk_bytes: int = 0,
+    ) -> None:
+        """
+        音声キャッシュを生成する。ディスク層を使う場合は既存のエントリを読み込む。
+
+        Parameters
+        ----------
+        max_bytes : int
+            メモリ層の容量上限（バイト）。0 の場合はメモリ層を使わない。
+        disk_dir : Path | None
+            ディスク層の保存先ディレクトリ。None の場合はディスク層を使わない。
+        max_disk_bytes : int
+            ディスク層の容量上限（バイト）。0 の場合はディスク層を使わない。
+        """
+        self._lock = threading.Lock()
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        self._memory_bytes = 0
+
+        self._disk_dir = disk_dir if max_disk_bytes > 0 else None
+        self._max_disk_bytes = max_disk_bytes
+        self._disk_entries: OrderedDict[str, int] = OrderedDict()
+        self._disk_bytes = 0
+        self._disk_writing: set[str] = set()  # ディスク層へ書き込み中のキー
+        if self._disk_dir is not None:
+            self._disk_dir.mkdir(parents=True, exist_ok=True)
+            self._load_disk_index(self._disk_dir)
+
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._disk_evictions = 0
+
+    def _load_disk_index(self, disk_dir: Path) -> None:
+        """ディスク層の既存エントリを最終利用時刻の古い順に登録する。"""
+        files = [
+            (path.stat(), path) for path in disk_dir.glob(f"*{_DISK_CACHE_SUFFIX}")
+        ]
+        for stat, path in sorted(files, key=lambda file: file[0].st_mtime):
+            self._disk_entries[path.stem] = stat.st_size
+            self._disk_bytes += stat.st_size
+        self._unlink(self._pop_disk_evictions())
+
+    def _disk_path(self, key: str) -> Path:
+        assert self._disk_dir is not None
+        return self._disk_dir / f"{key}{_DISK_CACHE_SUFFIX}"
+
+    def get(self, key: str) -> bytes | None:
+        """キーに対応するエンコード済み音声を取得する。存在しない場合は None を返す。"""
+        with self._lock:
+            wav = self._entries.get(key)
+            if wav is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return wav
+            if self._disk_dir is None or key not in self._disk_entries:
+                self._misses += 1
+                return None
+            path = self._disk_path(key)
+
+        try:
+            wav = path.read_bytes()
+            os.utime(path)
+        except OSError:
+            wav = None
+
+        with self._lock:
+            if wav is None:
+                # 外部から削除された場合はキャッシュミスとして扱う
+                if key in self._disk_entries:
+                    self._disk_bytes -= self._disk_entries.pop(key)
+                self._misses += 1
+                return None
+            if key in self._disk_entries:
+                self._disk_entries.move_to_end(key)
+            self._store_memory(key, wav)
+            self._hits += 1
+            self._disk_hits += 1
+            return wav
+
+    def put(self, key: str, wav: bytes) -> None:
+        """エンコード済み音声を登録し、容量上限を超えた分を古い順に追い出す。"""
+        with self._lock:
+            self._store_memory(key, wav)
+            store_disk = (
+                self._disk_dir is not None
+                and len(wav) <= self._max_disk_bytes
+                and key not in self._disk_entries
+                and key not in self._disk_writing
+            )
+            if store_disk:
+                self._disk_writing.add(key)
+        if store_disk:
+            self._store_disk(key, wav)
+
+    def _store_memory(self, key: str, wav: bytes) -> None:
+        if len(wav) > self._max_bytes:
+            return
+        if key in self._entries:
+            self._memory_bytes -= len(self._entries.pop(key))
+        self._entries[key] = wav
+        self._memory_bytes += len(wav)
+        while self._memory_bytes > self._max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+            self._evictions += 1
+
+    def _store_disk(self, key: str, wav: bytes) -> None:
+        """ロックの外でディスク層へ書き込み、書き込み後にロックを取って索引を更新する。"""
+        path = self._disk_path(key)
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            tmp_path.write_bytes(wav)
+            os.replace(tmp_path, path)
+        except OSError:
+            # ディスク層への保存失敗は応答に影響させない
+            tmp_path.unlink(missing_ok=True)
+            with self._lock:
+                self._disk_writing.discard(key)
+            return
+        with self._lock:
+            self._disk_writing.discard(key)
+            self._disk_entries[key] = len(wav)
+            self._disk_bytes += len(wav)
+            evicted_paths = self._pop_disk_evictions()
+        self._unlink(evicted_paths)
+
+    def _pop_disk_evictions(self) -> list[Path]:
+        """容量上限を超えた分のディスク層のエントリを索引から外し、削除すべきファイルを返す。"""
+        evicted_paths = []
+        while self._disk_bytes > self._max_disk_bytes and self._disk_entries:
+            key, size = self._disk_entries.popitem(last=False)
+            self._disk_bytes -= size
+            self._disk_evictions += 1
+            evicted_paths.append(self._disk_path(key))
+        return evicted_paths
+
+    @staticmethod
+    def _unlink(paths: list[Path]) -> None:
+        for path in paths:
+            try:
+                path.unlink(missing_ok=True)
+            except OSError:
+                pass
+
+    def stats(self) -> WaveCacheStats:
+        """キャッシュの利用状況を取得する。"""
+        with self._lock:
+            return WaveCacheStats(
+                hits=self._hits,
+                disk_hits=self._disk_hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                disk_evictions=self._disk_evictions,
+                memory_entries=len(self._entries),
+                memory_bytes=self._memory_bytes,
+                disk_entries=len(self._disk_entries),
+                disk_bytes=self._disk_bytes,
+            )
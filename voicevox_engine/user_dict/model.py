@@ -6,7 +6,7 @@
 
 from enum import Enum
 from re import fullmatch
-from typing import Annotated, Self
+from typing import Annotated, Literal, Self
 
 from pydantic import AfterValidator, BaseModel, ConfigDict, Field, model_validator
 from pydantic.json_schema import SkipJsonSchema
@@ -114,3 +114,53 @@ class UserDictWord(BaseModel):
             msg = f"誤ったアクセント型です({self.accent_type})。 expect: 0 <= accent_type <= {self.mora_count}"
             raise ValueError(msg)
         return self
+
+
+class UserDictWordProperty(BaseModel):
+    """ユーザー辞書へ登録する言葉の属性。"""
+
+    surface: str = Field(description="言葉の表層形")
+    pronunciation: str = Field(description="言葉の発音（カタカナ）")
+    accent_type: int = Field(description="アクセント型（音が下がる場所を指す）")
+    word_type: WordTypes | SkipJsonSchema[None] = Field(
+        default=None,
+        description="PROPER_NOUN（固有名詞）、COMMON_NOUN（普通名詞）、VERB（動詞）、ADJECTIVE（形容詞）、SUFFIX（語尾）のいずれか",
+    )
+    priority: int | SkipJsonSchema[None] = Field(
+        default=None,
+        description="単語の優先度（0から10までの整数）。数字が大きいほど優先度が高くなる。1から9までの値を指定することを推奨",
+    )
+
+
+class UserDictWordRewrite(UserDictWordProperty):
+    """ユーザー辞書に登録されている言葉と、その更新後の属性。"""
+
+    word_uuid: str = Field(description="更新する言葉のUUID")
+
+
+class UserDictWordOperations(BaseModel):
+    """ユーザー辞書の言葉に対する一括操作。"""
+
+    add: list[UserDictWordProperty] = Field(
+        default_factory=list, description="追加する言葉"
+    )
+    rewrite: list[UserDictWordRewrite] = Field(
+        default_factory=list, description="更新する言葉"
+    )
+    delete: list[str] = Field(default_factory=list, description="削除する言葉のUUID")
+
+
+class UserDictWordOperationsResult(BaseModel):
+    """ユーザー辞書の言葉に対する一括操作の結果。各項目は操作の一覧と同じ順に並ぶ。"""
+
+    added: list[str] = Field(description="追加した言葉に割り当てられたUUID")
+    rewritten: list[str] = Field(description="更新した言葉のUUID")
+    deleted: list[str] = Field(description="削除した言葉のUUID")
+
+
+class UserDictWordOperationError(BaseModel):
+    """ユーザー辞書の言葉に対する一括操作のうち、受け入れられなかった操作。"""
+
+    operation: Literal["add", "rewrite", "delete"] = Field(description="操作の種類")
+    index: int = Field(description="操作の一覧における位置")
+    message: str = Field(description="エラーメッセージ")
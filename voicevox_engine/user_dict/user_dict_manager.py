@@ -1,22 +1,31 @@
 """ユーザー辞書関連の処理"""
 
 import json
+import os
 import sys
 import threading
 import warnings
 from collections.abc import Callable
 from pathlib import Path
-from typing import Any, Final, TypeVar
+from typing import Any, Final, Literal, TypeVar
 from uuid import UUID, uuid4
 
 import pyopenjtalk
-from pydantic import TypeAdapter
+from pydantic import TypeAdapter, ValidationError
 
+from ..tts_pipeline.text_analysis_cache import clear_text_analysis_cache
 from ..utility.path_utility import get_save_dir, resource_root
-from .model import UserDictWord
+from .model import (
+    UserDictWord,
+    UserDictWordOperationError,
+    UserDictWordOperations,
+    UserDictWordOperationsResult,
+    UserDictWordProperty,
+)
 from .user_dict_word import (
     SaveFormatUserDictWord,
     UserDictInputError,
+    UserDictWordOperationsError,
     WordProperty,
     convert_from_save_format,
     convert_to_save_format,
@@ -117,6 +126,57 @@ def _delete_file_on_close(file_path: Path) -> None:
         file_path.unlink()
 
 
+def _word_to_csv_row(word: UserDictWord) -> str:
+    """単語を OpenJTalk 用辞書の CSV の 1 行へ変換する。"""
+    return (
+        f"{word.surface},{word.context_id},{word.context_id},"
+        f"{priority2cost(word.context_id, word.priority)},{word.part_of_speech},"
+        f"{word.part_of_speech_detail_1},{word.part_of_speech_detail_2},"
+        f"{word.part_of_speech_detail_3},{word.inflectional_type},"
+        f"{word.inflectional_form},{word.stem},{word.yomi},{word.pronunciation},"
+        f"{word.accent_type}/{word.mora_count},{word.accent_associative_rule}\n"
+    )
+
+
+def _compile_csv(csv_text: str, compiled_path: Path) -> None:
+    """CSV 形式の辞書データを OpenJTalk 用にコンパイルする。"""
+    tmp_csv_path = compiled_path.with_name(f"{compiled_path.name}.csv.tmp")
+    try:
+        tmp_csv_path.write_text(csv_text, encoding="utf-8")
+        pyopenjtalk.mecab_dict_index(str(tmp_csv_path), str(compiled_path))
+        if not compiled_path.is_file():
+            raise RuntimeError("辞書のコンパイル時にエラーが発生しました。")
+    finally:
+        if tmp_csv_path.exists():
+            tmp_csv_path.unlink()
+
+
+def _create_word_from_property(word_property: UserDictWordProperty) -> UserDictWord:
+    """言葉の属性から単語オブジェクトを生成する。"""
+    return create_word(
+        WordProperty(
+            surface=word_property.surface,
+            pronunciation=word_property.pronunciation,
+            accent_type=word_property.accent_type,
+            word_type=word_property.word_type,
+            priority=word_property.priority,
+        )
+    )
+
+
+def _error_message(error: UserDictInputError | ValidationError) -> str:
+    """単語の生成に失敗した理由を表すメッセージを得る。"""
+    if isinstance(error, ValidationError):
+        return "\n".join(detail["msg"] for detail in error.errors())
+    return str(error)
+
+
+def _operation_error(
+    operation: Literal["add", "rewrite", "delete"], index: int, message: str
+) -> UserDictWordOperationError:
+    return UserDictWordOperationError(operation=operation, index=index, message=message)
+
+
 class UserDictionary:
     """ユーザー辞書"""
 
@@ -148,7 +208,16 @@ class UserDictionary:
             save_format_word = convert_to_save_format(word)
             save_format_user_dict[word_uuid] = save_format_word
         user_dict_json = _save_format_dict_adapter.dump_json(save_format_user_dict)
-        self._user_dict_path.write_bytes(user_dict_json)
+        # 書き込み途中の状態が読まれないよう、一時ファイルへ書き込んでから置き換える
+        tmp_path = self._user_dict_path.with_name(
+            f"{self._user_dict_path.name}-{uuid4()}.tmp"
+        )
+        try:
+            tmp_path.write_bytes(user_dict_json)
+            os.replace(tmp_path, self._user_dict_path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
 
     @_mutex_wrapper(mutex_openjtalk_dict)
     def update_dict(self) -> None:
@@ -156,18 +225,11 @@ class UserDictionary:
         default_dict_path = self._default_dict_path
         user_dict_path = self._user_dict_path
 
-        random_string = uuid4()
-        tmp_csv_path = user_dict_path.with_name(
-            f"user.dict_csv-{random_string}.tmp"
-        )  # csv形式辞書データの一時保存ファイル
         tmp_compiled_path = user_dict_path.with_name(
-            f"user.dict_compiled-{random_string}.tmp"
+            f"user.dict_compiled-{uuid4()}.tmp"
         )  # コンパイル済み辞書データの一時保存ファイル
 
         try:
-            # 辞書.csvを作成
-            csv_text = ""
-
             # デフォルト辞書データの追加
             if not default_dict_path.is_file():
                 warnings.warn("Cannot find default dictionary.", stacklevel=1)
@@ -175,55 +237,23 @@ class UserDictionary:
             default_dict = default_dict_path.read_text(encoding="utf-8")
             if default_dict == default_dict.rstrip():
                 default_dict += "\n"
-            csv_text += default_dict
 
             # ユーザー辞書データの追加
             user_dict = self.read_dict()
-            for word_uuid in user_dict:
-                word = user_dict[word_uuid]
-                csv_text += (
-                    "{surface},{context_id},{context_id},{cost},{part_of_speech},"
-                    + "{part_of_speech_detail_1},{part_of_speech_detail_2},"
-                    + "{part_of_speech_detail_3},{inflectional_type},"
-                    + "{inflectional_form},{stem},{yomi},{pronunciation},"
-                    + "{accent_type}/{mora_count},{accent_associative_rule}\n"
-                ).format(
-                    surface=word.surface,
-                    context_id=word.context_id,
-                    cost=priority2cost(word.context_id, word.priority),
-                    part_of_speech=word.part_of_speech,
-                    part_of_speech_detail_1=word.part_of_speech_detail_1,
-                    part_of_speech_detail_2=word.part_of_speech_detail_2,
-                    part_of_speech_detail_3=word.part_of_speech_detail_3,
-                    inflectional_type=word.inflectional_type,
-                    inflectional_form=word.inflectional_form,
-                    stem=word.stem,
-                    yomi=word.yomi,
-                    pronunciation=word.pronunciation,
-                    accent_type=word.accent_type,
-                    mora_count=word.mora_count,
-                    accent_associative_rule=word.accent_associative_rule,
-                )
-            # 辞書データを辞書.csv へ一時保存
-            tmp_csv_path.write_text(csv_text, encoding="utf-8")
+            csv_text = default_dict + "".join(map(_word_to_csv_row, user_dict.values()))
 
-            # 辞書.csvをOpenJTalk用にコンパイル
-            pyopenjtalk.mecab_dict_index(str(tmp_csv_path), str(tmp_compiled_path))
-            if not tmp_compiled_path.is_file():
-                raise RuntimeError("辞書のコンパイル時にエラーが発生しました。")
+            # 辞書データをOpenJTalk用にコンパイル
+            _compile_csv(csv_text, tmp_compiled_path)
 
             # コンパイル済み辞書の読み込み
             pyopenjtalk.update_global_jtalk_with_user_dict(
                 str(tmp_compiled_path.resolve(strict=True))
             )  # NOTE: resolveによりコンパイル実行時でも相対パスを正しく認識できる
-
-        except Exception as e:
-            raise e
+            # 辞書の差し替えにより無効になったテキスト解析結果を破棄する
+            clear_text_analysis_cache()
 
         finally:
             # 後処理
-            if tmp_csv_path.exists():
-                tmp_csv_path.unlink()
             if tmp_compiled_path.exists():
                 _delete_file_on_close(tmp_compiled_path)
 
@@ -331,3 +361,78 @@ class UserDictionary:
         # 更新された辞書データの保存と適用
         self._write_to_json(user_dict)
         self.update_dict()
+
+    def apply_word_operations(
+        self, operations: UserDictWordOperations
+    ) -> UserDictWordOperationsResult:
+        """
+        言葉の追加・上書き更新・削除をまとめて適用する。
+
+        全ての操作を検証した上で、ユーザー辞書の保存と辞書の更新をそれぞれ一度だけ行う。
+        いずれかの操作が受け入れられない場合は何も変更せず、受け入れられない操作の一覧をもつエラーを送出する。
+
+        Raises
+        ------
+        UserDictWordOperationsError
+            受け入れられない操作が含まれる
+        """
+        user_dict = self.read_dict()
+        errors: list[UserDictWordOperationError] = []
+
+        # 追加・更新する言葉を検証する
+        added: dict[str, UserDictWord] = {}
+        for index, word_property in enumerate(operations.add):
+            try:
+                added[str(uuid4())] = _create_word_from_property(word_property)
+            except (UserDictInputError, ValidationError) as e:
+                errors += [_operation_error("add", index, _error_message(e))]
+        rewritten: dict[str, UserDictWord] = {}
+        rewrite_uuids: set[str] = set()
+        for index, word_rewrite in enumerate(operations.rewrite):
+            if word_rewrite.word_uuid not in user_dict:
+                msg = "UUIDに該当するワードが見つかりませんでした"
+                errors += [_operation_error("rewrite", index, msg)]
+                continue
+            if word_rewrite.word_uuid in rewrite_uuids:
+                msg = "同じワードが重複して指定されています"
+                errors += [_operation_error("rewrite", index, msg)]
+                continue
+            rewrite_uuids.add(word_rewrite.word_uuid)
+            try:
+                rewritten[word_rewrite.word_uuid] = _create_word_from_property(
+                    word_rewrite
+                )
+            except (UserDictInputError, ValidationError) as e:
+                errors += [_operation_error("rewrite", index, _error_message(e))]
+
+        # 削除する言葉を検証する
+        deleted: list[str] = []
+        for index, word_uuid in enumerate(operations.delete):
+            if word_uuid not in user_dict:
+                msg = "IDに該当するワードが見つかりませんでした"
+                errors += [_operation_error("delete", index, msg)]
+            elif word_uuid in deleted:
+                msg = "同じワードが重複して指定されています"
+                errors += [_operation_error("delete", index, msg)]
+            elif word_uuid in rewritten:
+                msg = "同じワードを更新と削除の両方の対象にはできません"
+                errors += [_operation_error("delete", index, msg)]
+            else:
+                deleted += [word_uuid]
+
+        if errors:
+            raise UserDictWordOperationsError(errors)
+
+        # 全ての操作を適用した辞書データを一度だけ保存・適用する
+        user_dict.update(rewritten)
+        for word_uuid in deleted:
+            del user_dict[word_uuid]
+        user_dict.update(added)
+        self._write_to_json(user_dict)
+        self.update_dict()
+
+        return UserDictWordOperationsResult(
+            added=list(added),
+            rewritten=list(rewritten),
+            deleted=deleted,
+        )
@@ -8,6 +8,7 @@ from voicevox_engine.user_dict.model import (
     USER_DICT_MAX_PRIORITY,
     USER_DICT_MIN_PRIORITY,
     UserDictWord,
+    UserDictWordOperationError,
     WordTypes,
 )
 
@@ -132,6 +133,14 @@ class UserDictInputError(Exception):
     pass
 
 
+class UserDictWordOperationsError(UserDictInputError):
+    """一括操作に受け入れ不可能な操作が含まれるエラー"""
+
+    def __init__(self, errors: list[UserDictWordOperationError]):
+        super().__init__("受け入れられない操作が含まれています")
+        self.errors = errors
+
+
 def _search_cost_candidates(context_id: int) -> list[int]:
     for value in part_of_speech_data.values():
         if value.context_id == context_id:
@@ -0,0 +1,116 @@
+"""音声データのエンコードに関するユーティリティ"""
+
+import struct
+from typing import Final
+
+import numpy as np
+from numpy.typing import NDArray
+
+from ..metrics import time_stage
+
+_WAV_HEADER_FORMAT: Final = "<4sI4s4sIHHIIHH4sI"
+_WAV_HEADER_SIZE: Final = struct.calcsize(_WAV_HEADER_FORMAT)
+# ストリーミング出力時のデータ長。長さ未確定を表す最大値を用いる。
+_UNKNOWN_DATA_SIZE: Final = 0xFFFFFFFF
+_PCM16_BYTES_PER_SAMPLE: Final = 2
+_PCM16_SCALE: Final = 32768.0
+
+
+def _pack_wav_header(
+    buffer: bytearray | memoryview,
+    sampling_rate: int,
+    num_channels: int,
+    riff_size: int,
+    data_size: int,
+) -> None:
+    """16 bit リニア PCM の WAV ヘッダーをバッファの先頭へ書き込む。"""
+    block_align = num_channels * _PCM16_BYTES_PER_SAMPLE
+    struct.pack_into(
+        _WAV_HEADER_FORMAT,
+        buffer,
+        0,
+        b"RIFF",
+        riff_size,
+        b"WAVE",
+        b"fmt ",
+        16,  # fmt チャンク長
+        1,  # リニア PCM
+        num_channels,
+        sampling_rate,
+        sampling_rate * block_align,
+        block_align,
+        _PCM16_BYTES_PER_SAMPLE * 8,
+        b"data",
+        data_size,
+    )
+
+
+def _write_pcm16(wave: NDArray[np.floating], buffer: memoryview) -> None:
+    """
+    音声波形を 16 bit リニア PCM へ量子化し、バッファへ書き込む。
+
+    量子化は libsndfile と同じく 32768 倍して切り捨て、16 bit の範囲へ丸める。
+    多チャンネルの波形はサンプルごとにチャンネルを並べる。
+    """
+    pcm = np.frombuffer(buffer, dtype="<i2")
+    scaled = np.floor(wave.reshape(-1) * _PCM16_SCALE)
+    np.clip(scaled, -_PCM16_SCALE, _PCM16_SCALE - 1, out=scaled)
+    pcm[:] = scaled
+
+
+def _num_channels(wave: NDArray[np.floating]) -> int:
+    """音声波形のチャンネル数を取得する。shape は (Sample,) または (Sample, Channel) である。"""
+    return 1 if wave.ndim == 1 else wave.shape[1]
+
+
+def generate_streaming_wav_header(sampling_rate: int, num_channels: int) -> bytes:
+    """データ長が未確定な 16 bit リニア PCM の WAV ヘッダーを生成する。"""
+    buffer = bytearray(_WAV_HEADER_SIZE)
+    _pack_wav_header(
+        buffer, sampling_rate, num_channels, _UNKNOWN_DATA_SIZE, _UNKNOWN_DATA_SIZE
+    )
+    return bytes(buffer)
+
+
+def wave_to_wav_bytes(wave: NDArray[np.floating], sampling_rate: int) -> bytes:
+    """
+    音声波形を 16 bit リニア PCM の WAV ファイルのバイト列へ変換する。
+
+    ヘッダーと PCM を 1 つのバッファへ直接書き込み、中間のファイルやバイト列を作らない。
+    """
+    with time_stage("wave_to_wav_bytes"):
+        buffer = bytearray(wav_size(wave))
+        write_wav(wave, sampling_rate, memoryview(buffer))
+        return bytes(buffer)
+
+
+def wav_size(wave: NDArray[np.floating]) -> int:
+    """音声波形を 16 bit リニア PCM の WAV ファイルへ変換した際のバイト数を求める。"""
+    return _WAV_HEADER_SIZE + wave.size * _PCM16_BYTES_PER_SAMPLE
+
+
+def write_wav(
+    wave: NDArray[np.floating], sampling_rate: int, buffer: memoryview
+) -> int:
+    """
+    音声波形を 16 bit リニア PCM の WAV ファイルとしてバッファの先頭へ書き込み、書き込んだバイト数を返す。
+
+    バッファは `wav_size` で求めた大きさ以上である必要がある。
+    """
+    data_size = wave.size * _PCM16_BYTES_PER_SAMPLE
+    _pack_wav_header(
+        buffer,
+        sampling_rate,
+        _num_channels(wave),
+        _WAV_HEADER_SIZE - 8 + data_size,  # RIFF チャンク長は先頭 8 バイトを除く
+        data_size,
+    )
+    _write_pcm16(wave, buffer[_WAV_HEADER_SIZE : _WAV_HEADER_SIZE + data_size])
+    return _WAV_HEADER_SIZE + data_size
+
+
+def wave_to_pcm16_bytes(wave: NDArray[np.floating]) -> bytes:
+    """音声波形をヘッダー無しの 16 bit リニア PCM バイト列へ変換する。"""
+    buffer = bytearray(wave.size * _PCM16_BYTES_PER_SAMPLE)
+    _write_pcm16(wave, memoryview(buffer))
+    return bytes(buffer)
@@ -0,0 +1,11 @@
+"""HTTP 接続に関する utility"""
+
+from fastapi import Request
+
+
+async def wait_for_disconnect(request: Request) -> None:
+    """要求元の切断を待つ。要求の本文は読み込み済みであるものとする。"""
+    while True:
+        message = await request.receive()
+        if message["type"] == "http.disconnect":
+            return
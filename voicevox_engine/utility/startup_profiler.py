@@ -0,0 +1,66 @@
+"""起動処理の計測"""
+
+import importlib
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+
+class StartupProfiler:
+    """起動処理を構成する各段階の所要時間（wall time）を記録する。"""
+
+    def __init__(self) -> None:
+        """計測を開始する。"""
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+        self._phases: list[tuple[str, float]] = []
+        self._current_phase: str | None = None
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """ブロックの実行を 1 つの段階として所要時間を記録する。"""
+        with self._lock:
+            self._current_phase = name
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self._phases.append((name, elapsed))
+                self._current_phase = None
+
+    def import_modules(self, module_names: list[str]) -> None:
+        """
+        モジュールを順に import し、それぞれを 1 つの段階として記録する。
+
+        既に読み込まれた依存先は再利用されるため、各段階の所要時間はそのモジュールで新たに増えた import のコストを表す。
+        """
+        for module_name in module_names:
+            with self.phase(f"import {module_name}"):
+                importlib.import_module(module_name)
+
+    @property
+    def current_phase(self) -> str | None:
+        """実行中の段階の名前を取得する。段階の外では None を返す。"""
+        with self._lock:
+            return self._current_phase
+
+    def phases(self) -> list[tuple[str, float]]:
+        """記録済みの段階の名前と所要時間（秒）を記録順に取得する。"""
+        with self._lock:
+            return list(self._phases)
+
+    def elapsed(self) -> float:
+        """計測開始からの経過時間（秒）を取得する。"""
+        return time.perf_counter() - self._start
+
+    def report(self) -> str:
+        """記録済みの段階の所要時間を表形式の文字列にする。"""
+        phases = self.phases()
+        width = max([len(name) for name, _ in phases], default=0)
+        lines = ["起動処理の所要時間:"]
+        lines += [f"  {name:<{width}}  {sec:8.3f} s" for name, sec in phases]
+        lines += [f"  計測開始からの経過時間: {self.elapsed():.3f} s"]
+        return "\n".join(lines)